@@ -1,13 +1,5 @@
-from dotenv import load_dotenv
-import os
-import google.generativeai as genai
 from llm import chatbot_property_search 
-
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
-
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel("gemini-2.0-flash")
+from crawlers.llm_gateway import generate
 
 
 def is_property_query(user_input):
@@ -88,8 +80,10 @@ def chatbot_response(user_input):
         Keep responses friendly and professional."""
         
         enhanced_prompt = f"{context}\n\nUser question: {user_input}"
-        response = model.generate_content(enhanced_prompt)
-        return response.text
+        return generate(enhanced_prompt, fallback=lambda: (
+            "🤖 I can't reach the AI assistant right now. I can still search properties for you: "
+            "try something like '2 bedroom apartment in Dubai Marina'."
+        ))
 
     except Exception as e:
         return f"❌ Error: {str(e)}\n\n💡 Please try again or rephrase your question."
@@ -1,16 +1,22 @@
-import re
+import os
+import sys
 import time
 import random
 import pandas as pd
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.action_chains import ActionChains
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawlers.batch_extract import BATCH_EXTRACT, extract_cards
+from crawlers.driver_binary import chrome_service
+from crawlers.driver_pool import lease_driver
+from crawlers.query_parser import parse_query
+from crawlers.readiness import first_match, wait_for_listings
+
 def process_property_query(user_query):
     """
     Main function to process natural language property queries and return scraped results.
@@ -72,155 +78,17 @@ def extract_query_parameters(query):
             'params': {}
         }
     
+    spec, _ = parse_query(query)
     params = {
-        'purpose': 'rent',  # default
-        'location': '',
-        'property_type': 'Apartment',  # default
-        'beds': '',
-        'baths': '',
-        'min_price': '',
-        'max_price': ''
-    }
-    
-    # Extract purpose (rent/buy)
-    if any(word in query_lower for word in ['buy', 'buying', 'purchase']):
-        params['purpose'] = 'buy'
-    elif any(word in query_lower for word in ['rent', 'rental', 'renting']):
-        params['purpose'] = 'rent'
-    
-    # Extract location with common Dubai areas
-    dubai_areas = {
-        'jvc': 'Jumeirah Village Circle',
-        'jumeirah village circle': 'Jumeirah Village Circle',
-        'marina': 'Dubai Marina',
-        'dubai marina': 'Dubai Marina',
-        'downtown': 'Downtown Dubai',
-        'downtown dubai': 'Downtown Dubai',
-        'jlt': 'Jumeirah Lake Towers',
-        'jumeirah lake towers': 'Jumeirah Lake Towers',
-        'business bay': 'Business Bay',
-        'deira': 'Deira',
-        'bur dubai': 'Bur Dubai',
-        'jumeirah': 'Jumeirah',
-        'al barsha': 'Al Barsha',
-        'dubai hills': 'Dubai Hills Estate',
-        'arabian ranches': 'Arabian Ranches',
-        'dubai investment park': 'Dubai Investment Park',
-        'dip': 'Dubai Investment Park',
-        'motor city': 'Motor City',
-        'sports city': 'Dubai Sports City',
-        'silicon oasis': 'Dubai Silicon Oasis',
-        'international city': 'International City',
-        'discovery gardens': 'Discovery Gardens',
-        'abu dhabi': 'Abu Dhabi',
-        'sharjah': 'Sharjah',
-        'ajman': 'Ajman'
-    }
-    
-    for area_key, area_full in dubai_areas.items():
-        if area_key in query_lower:
-            params['location'] = area_full
-            break
-    
-    if not params['location']:
-        # Try to extract any location mentioned
-        location_patterns = [
-            r'in\s+([a-zA-Z\s]+?)(?:\s|$|,|\.|under|over|with|for)',
-            r'at\s+([a-zA-Z\s]+?)(?:\s|$|,|\.|under|over|with|for)',
-            r'near\s+([a-zA-Z\s]+?)(?:\s|$|,|\.|under|over|with|for)'
-        ]
-        for pattern in location_patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                params['location'] = match.group(1).strip().title()
-                break
-    
-    # Extract property type
-    property_types = {
-        'apartment': 'Apartment',
-        'flat': 'Apartment', 
-        'studio': 'Apartment',
-        'villa': 'Villa',
-        'townhouse': 'Townhouse',
-        'penthouse': 'Penthouse',
-        'duplex': 'Apartment'
+        'purpose': 'buy' if spec.purpose == 'sale' else 'rent',
+        'location': spec.location.title(),
+        'property_type': 'Apartment' if spec.property_type in ('', 'studio') else spec.property_type.title(),
+        'beds': 'Studio' if spec.bedrooms == 0 else (str(spec.bedrooms) if spec.bedrooms else ''),
+        'baths': str(spec.bathrooms) if spec.bathrooms else '',
+        'min_price': str(spec.yearly_min_price) if spec.min_price else '',
+        'max_price': str(spec.yearly_max_price) if spec.max_price else ''
     }
     
-    for prop_key, prop_value in property_types.items():
-        if prop_key in query_lower:
-            params['property_type'] = prop_value
-            break
-    
-    # Extract bedrooms
-    bedroom_patterns = [
-        r'(\d+)\s*(?:br|bed|bedroom)',
-        r'(\d+)\s*(?:bed|bedroom)',
-        r'(studio)',
-        r'(one|two|three|four|five)\s*(?:bed|bedroom)',
-        r'(\d+)(?:\s*-|\s*to\s*|\s+)(?:bed|bedroom)'
-    ]
-    
-    for pattern in bedroom_patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            bed_text = match.group(1)
-            if bed_text == 'studio':
-                params['beds'] = 'Studio'
-            elif bed_text in ['one', '1']:
-                params['beds'] = '1'
-            elif bed_text in ['two', '2']:
-                params['beds'] = '2'
-            elif bed_text in ['three', '3']:
-                params['beds'] = '3'
-            elif bed_text in ['four', '4']:
-                params['beds'] = '4'
-            elif bed_text in ['five', '5']:
-                params['beds'] = '5'
-            else:
-                params['beds'] = bed_text
-            break
-    
-    # Extract bathrooms
-    bathroom_patterns = [r'(\d+)\s*(?:bath|bathroom)', r'(\d+)\s*(?:bath|bathroom)s?']
-    for pattern in bathroom_patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            params['baths'] = match.group(1)
-            break
-    
-    # Extract price range
-    price_patterns = [
-        r'under\s+(\d+)(?:k|000)?',
-        r'below\s+(\d+)(?:k|000)?',
-        r'max(?:imum)?\s+(\d+)(?:k|000)?',
-        r'up\s+to\s+(\d+)(?:k|000)?',
-        r'(\d+)(?:k|000)?\s*(?:to|-)?\s*(\d+)(?:k|000)?',
-        r'between\s+(\d+)(?:k|000)?\s*(?:and|to|-)\s*(\d+)(?:k|000)?'
-    ]
-    
-    for pattern in price_patterns:
-        match = re.search(pattern, query_lower)
-        if match:
-            if 'under' in pattern or 'below' in pattern or 'max' in pattern or 'up to' in pattern:
-                max_price = match.group(1)
-                if 'k' in query_lower and len(max_price) <= 3:
-                    params['max_price'] = str(int(max_price) * 1000)
-                else:
-                    params['max_price'] = max_price
-            elif match.group(2):  # Range pattern
-                min_price, max_price = match.group(1), match.group(2)
-                if 'k' in query_lower:
-                    params['min_price'] = str(int(min_price) * 1000) if len(min_price) <= 3 else min_price
-                    params['max_price'] = str(int(max_price) * 1000) if len(max_price) <= 3 else max_price
-                else:
-                    params['min_price'] = min_price
-                    params['max_price'] = max_price
-            break
-    
-    # Set default location if none found
-    if not params['location']:
-        params['location'] = 'Dubai'
-    
     return {
         'success': True,
         'message': f"Searching for {params['purpose']} properties in {params['location']}",
@@ -256,6 +124,10 @@ def get_chrome_options():
     
     return options
 
+def create_driver():
+    """Chrome factory for the Bayut V1 driver pool."""
+    return webdriver.Chrome(service=chrome_service(), options=get_chrome_options())
+
 def scrape_bayut_properties(params):
     """
     Scrape Bayut properties based on provided parameters.
@@ -266,31 +138,30 @@ def scrape_bayut_properties(params):
     Returns:
         dict: Scraping results with success status, message, and data
     """
-    driver = None
     try:
-        # Initialize Chrome driver
-        chrome_options = get_chrome_options()
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Navigate to Bayut
-        base_url = "https://www.bayut.com/to-rent/property/dubai/" if params['purpose'] == 'rent' else "https://www.bayut.com/to-buy/property/dubai/"
-        driver.get(base_url)
-        
-        wait = WebDriverWait(driver, 10)
-        time.sleep(3)
-        
-        # Close popups/modals
-        close_popups(driver, wait)
-        
-        # Apply filters based on parameters
-        apply_filters(driver, wait, params)
-        
-        # Wait for results to load
-        time.sleep(10)
-        
-        # Scrape property data
-        property_data = scrape_property_listings(driver, params)
+        with lease_driver("bayut_v1", create_driver) as driver:
+            if not driver:
+                raise RuntimeError("could not start Chrome")
+
+            # Navigate to Bayut
+            base_url = "https://www.bayut.com/to-rent/property/dubai/" if params['purpose'] == 'rent' else "https://www.bayut.com/to-buy/property/dubai/"
+            driver.get(base_url)
+            
+            wait = WebDriverWait(driver, 10)
+            wait_for_listings(driver, "bayut", baseline=3)
+            
+            # Close popups/modals
+            close_popups(driver, wait)
+            
+            # Apply filters based on parameters
+            unfiltered = first_match(driver, "bayut")
+            apply_filters(driver, wait, params)
+            
+            # Wait for the filtered results to replace the unfiltered ones
+            wait_for_listings(driver, "bayut", stale=unfiltered)
+            
+            # Scrape property data
+            property_data = scrape_property_listings(driver, params)
         
         if property_data:
             return {
@@ -314,9 +185,6 @@ def scrape_bayut_properties(params):
             'data': [],
             'query_info': params
         }
-    finally:
-        if driver:
-            driver.quit()
 
 def close_popups(driver, wait):
     """Close any popups or modals that might appear."""
@@ -486,22 +354,50 @@ def apply_filters(driver, wait, params):
         except Exception as e:
             print(f"❌ Failed to set price filter: {e}")
 
+LISTING_SELECTORS = [
+    'article[data-testid]',
+    'article',
+    'div[data-testid*="property"]',
+    'div[aria-label*="property"]',
+    '.property-card',
+    '[data-testid="property-card"]'
+]
+
+# Field spec for extract_cards, mirroring the per-element selector lists below
+LISTING_FIELDS = {
+    "Name": {"try": [[sel, None] for sel in ['h2[aria-label*="Title"]', 'h2', 'h3', '[data-testid="property-title"]', '.title']]},
+    "Price": {"try": [[sel, None] for sel in ['span[aria-label*="Price"]', 'span[data-testid="property-price"]', '.price']]},
+    "Location": {"try": [[sel, None] for sel in ['div[data-testid="property-location"]', '.location', '[aria-label*="location"]']]},
+    "Link": {"try": [["self", "href"], ["a", "href"]]},
+}
+
+def scrape_listings_batched(driver, params):
+    """scrape_property_listings in a single execute_script round-trip."""
+    selector, rows = extract_cards(driver, LISTING_SELECTORS + ['a[href*="/property/"]'], LISTING_FIELDS, limit=20)
+    if not rows:
+        print("❌ No property listings found")
+        return []
+    print(f"✅ Found {len(rows)} listings with selector: {selector}")
+    return [{
+        "PropertyNo": idx + 1,
+        "Name": row["Name"] or "Property Listing",
+        "Price": row["Price"] or "Price on Request",
+        "Location": row["Location"] or params.get('location', 'Dubai'),
+        "Link": row["Link"] or "N/A",
+        "Type": params.get('property_type', 'N/A'),
+        "Beds": params.get('beds', 'N/A'),
+        "Baths": params.get('baths', 'N/A'),
+    } for idx, row in enumerate(rows)]
+
 def scrape_property_listings(driver, params):
     """Extract property data from the current page."""
+    if BATCH_EXTRACT:
+        return scrape_listings_batched(driver, params)
     data = []
     
     # Try multiple selectors to find property listings
-    possible_selectors = [
-        'article[data-testid]',
-        'article',
-        'div[data-testid*="property"]',
-        'div[aria-label*="property"]',
-        '.property-card',
-        '[data-testid="property-card"]'
-    ]
-    
     listings = []
-    for selector in possible_selectors:
+    for selector in LISTING_SELECTORS:
         try:
             listings = driver.find_elements(By.CSS_SELECTOR, selector)
             if listings:
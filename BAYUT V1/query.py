@@ -1,11 +1,8 @@
-import google.generativeai as genai
-from dotenv import load_dotenv
 import os
+import sys
 
-# ------------------------- API KEY LOADED ----------------------------
-load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-2.0-flash")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crawlers.llm_gateway import generate
 
 # --------------------- GENERATE URL FUNCTION -----------------------------------------------
 # def generate_bayut_url(user_query):
@@ -382,8 +379,7 @@ def generate_bayut_url(user_query):
      """
 
     try:
-        response = model.generate_content(prompt)
-        raw_output = response.text.strip()
+        raw_output = generate(prompt) or ""  # Empty on timeout → rule fallback below
 
         # Extract URL from response (in case model adds extra text)
         if "https://" in raw_output:
@@ -1,13 +1,40 @@
 import streamlit as st
-import time
 from datetime import datetime
-import pandas as pd
 import json
+import threading
 
-from backend import search_all_properties
+from backend import browser_stats, iter_search, llm_stats, query_parse_stats, result_cache_stats
+from crawlers.driver_pool import warm_up
+from crawlers.listing import listings_csv
+from crawlers.query_spec import prime_query_cache
+
+QUICK_SEARCHES = [
+    "apartments for rent in dubai",
+    "villas in dubai marina",
+    "properties in downtown dubai",
+    "office spaces for rent",
+]
 
 st.set_page_config(page_title="Property Seek", page_icon="🏠", layout="wide")
 
+@st.cache_resource
+def warm_query_cache():
+    """Resolve the quick-search queries once per process, off the request path"""
+    thread = threading.Thread(target=prime_query_cache, args=(QUICK_SEARCHES,), daemon=True)
+    thread.start()
+    return thread
+
+warm_query_cache()
+
+@st.cache_resource
+def warm_browsers():
+    """Resolve chromedriver and pre-launch the browser pool once per process"""
+    thread = threading.Thread(target=warm_up, daemon=True)
+    thread.start()
+    return thread
+
+warm_browsers()
+
 if 'search_history' not in st.session_state:
     st.session_state.search_history = []
 if 'last_results' not in st.session_state:
@@ -225,199 +252,134 @@ col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     if st.button("🏢 Dubai Apartments", use_container_width=True):
-        st.session_state.current_query = "apartments for rent in dubai"
+        st.session_state.current_query = QUICK_SEARCHES[0]
         st.rerun()
 
 with col2:
     if st.button("🏖️ Marina Villas", use_container_width=True):
-        st.session_state.current_query = "villas in dubai marina"
+        st.session_state.current_query = QUICK_SEARCHES[1]
         st.rerun()
 
 with col3:
     if st.button("🏙️ Downtown Properties", use_container_width=True):
-        st.session_state.current_query = "properties in downtown dubai"
+        st.session_state.current_query = QUICK_SEARCHES[2]
         st.rerun()
 
 with col4:
     if st.button("💼 Office Spaces", use_container_width=True):
-        st.session_state.current_query = "office spaces for rent"
+        st.session_state.current_query = QUICK_SEARCHES[3]
         st.rerun()
 
-if 'current_query' in st.session_state:
-    query = st.session_state.current_query
-    del st.session_state.current_query
-    
+def record_search(query):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
     st.session_state.search_history.append((timestamp, query))
     
     if len(st.session_state.search_history) > 10:
         st.session_state.search_history = st.session_state.search_history[-10:]
 
-    with st.spinner("🔍 Searching properties..."):
-        time.sleep(1)
-        results = search_all_properties(query)
-        st.session_state.last_results = results
+def render_metrics(placeholder, results):
+    sources_count = {}
+    for prop in results:
+        sources_count[prop.source] = sources_count.get(prop.source, 0) + 1
+
+    with placeholder.container():
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+            st.metric("Total Properties", len(results))
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+            st.metric("Property Finder", sources_count.get("Property Finder", 0))
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+            st.metric("Find Properties", sources_count.get("Find Properties", 0))
+            st.markdown('</div>', unsafe_allow_html=True)
+
+def render_listing(prop):
+    st.markdown('<div class="property-card">', unsafe_allow_html=True)
     
+    st.markdown(f'<div class="property-title">{prop.title}</div>', unsafe_allow_html=True)
     
-    if not results:
-        st.error("❌ No properties found matching your criteria. Try adjusting your search terms.")
-    else:
-        first_result = results[0]
-        
-        if first_result.get("source") == "AI Assistant":
-            st.info(f"🤖 AI Assistant: {first_result['description']}")
-        else:
-            total_properties = len(results)
-            st.success(f"🎉 Found {total_properties} properties matching your search!")
-
-            sources_count = {}
-            for prop in results:
-                source = prop.get("source", "Unknown")
-                sources_count[source] = sources_count.get(source, 0) + 1
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Total Properties", total_properties)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Property Finder", sources_count.get("Property Finder", 0))
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Find Properties", sources_count.get("Find Properties", 0))
-                st.markdown('</div>', unsafe_allow_html=True)
-
-            if results:
-                df = pd.DataFrame(results)
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    "📋 Download Results as CSV",
-                    csv_data,
-                    "property_search_results.csv",
-                    "text/csv",
-                    use_container_width=True
-                )
-
-            st.markdown("---")
-            st.markdown("### 🏠 Property Listings")
-            
-            for prop in results:
-                #st.markdown('<div class="property-card">', unsafe_allow_html=True)
-                #st.markdown('<div class="property-card">')
-                st.markdown(f'<div class="property-title">{prop["title"]}</div>', unsafe_allow_html=True)
-                st.markdown(f'''
-                <div class="property-details">
-                    <span class="property-price">{prop["price"]}</span> • 
-                    <span class="property-location">{prop["location"]}</span>
-                </div>
-                ''', unsafe_allow_html=True)
-                
-                if prop.get('link') and prop['link'] != '#':
-                    st.markdown(f"🔗 [View Property Details]({prop['link']})")
-                
-                if prop.get('description'):
-                    description = prop['description']
-                    if len(description) > 200:
-                        description = description[:200] + "..."
-                    st.markdown(f"📝 **Description:** {description}")
-                
-                if prop.get('source'):
-                    st.markdown(f"🏷️ **Source:** {prop['source']}")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown(f'''
+    <div class="property-details">
+        <span class="property-price">{prop.price}</span> • 
+        <span class="property-location">{prop.location}</span>
+    </div>
+    ''', unsafe_allow_html=True)
+    
+    if prop.link and prop.link != '#':
+        st.markdown(f"🔗 [View Property Details]({prop.link})")
+    
+    if prop.description:
+        description = prop.description
+        if len(description) > 200:
+            description = description[:200] + "..."
+        st.markdown(f"📝 **Description:** {description}")
 
-if search_clicked and query:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    st.session_state.search_history.append((timestamp, query))
+    if prop.source:
+        st.markdown(f"🏷️ **Source:** {prop.source}")
     
-    if len(st.session_state.search_history) > 10:
-        st.session_state.search_history = st.session_state.search_history[-10:]
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+def run_search(query):
+    """Render listings as each source/page lands instead of after the slowest crawler"""
+    record_search(query)
+
+    status = st.empty()
+    metrics = st.empty()
+    download = st.empty()
+    listings = st.container()
+    status.info("🔍 Searching properties...")
 
-    with st.spinner("🔍 Searching properties..."):
-        time.sleep(1)  
-        results = search_all_properties(query)
-        st.session_state.last_results = results
+    def show_progress(pending):
+        if pending:
+            status.info(f"🔍 Still searching {len(pending)} source{'s' if len(pending) > 1 else ''}: "
+                        f"{', '.join(pending)}...")
+
+    results = []
+    for batch in iter_search(query, on_progress=show_progress):
+        if batch[0].source == "AI Assistant":
+            results = batch
+            status.info(f"🤖 AI Assistant: {batch[0].description}")
+            break
+
+        if not results:
+            with listings:
+                st.markdown("---")
+                st.markdown("### 🏠 Property Listings")
+        results.extend(batch)
+        render_metrics(metrics, results)
+        with listings:
+            for prop in batch:
+                render_listing(prop)
+
+    st.session_state.last_results = results
 
     if not results:
-        st.error("❌ No properties found matching your criteria. Try adjusting your search terms.")
-    else:
-        first_result = results[0]
-        
-        if first_result.get("source") == "AI Assistant":
-            
-            st.info(f"🤖 AI Assistant: {first_result['description']}")
-        else:
-        
-            total_properties = len(results)
-            st.success(f"🎉 Found {total_properties} properties matching your search!")
-
-            
-            sources_count = {}
-            for prop in results:
-                source = prop.get("source", "Unknown")
-                sources_count[source] = sources_count.get(source, 0) + 1
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Total Properties", total_properties)
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Property Finder", sources_count.get("Property Finder", 0))
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-                st.metric("Find Properties", sources_count.get("Find Properties", 0))
-                st.markdown('</div>', unsafe_allow_html=True)
-
-            if results:
-                df = pd.DataFrame(results)
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    "📋 Download Results as CSV",
-                    csv_data,
-                    "property_search_results.csv",
-                    "text/csv",
-                    use_container_width=True
-                )
-
-            st.markdown("---")
-            st.markdown("### 🏠 Property Listings")
-            
-            for prop in results:
-                st.markdown('<div class="property-card">', unsafe_allow_html=True)
-                
-                st.markdown(f'<div class="property-title">{prop["title"]}</div>', unsafe_allow_html=True)
-                
-                st.markdown(f'''
-                <div class="property-details">
-                    <span class="property-price">{prop["price"]}</span> • 
-                    <span class="property-location">{prop["location"]}</span>
-                </div>
-                ''', unsafe_allow_html=True)
-                
-                if prop.get('link') and prop['link'] != '#':
-                    st.markdown(f"🔗 [View Property Details]({prop['link']})")
-                
-                if prop.get('description'):
-                    description = prop['description']
-                    if len(description) > 200:
-                        description = description[:200] + "..."
-                    st.markdown(f"📝 **Description:** {description}")
-            
-                if prop.get('source'):
-                    st.markdown(f"🏷️ **Source:** {prop['source']}")
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
+        status.error("❌ No properties found matching your criteria. Try adjusting your search terms.")
+    elif results[0].source != "AI Assistant":
+        status.success(f"🎉 Found {len(results)} properties matching your search!")
+        csv_data = listings_csv(results)
+        download.download_button(
+            "📋 Download Results as CSV",
+            csv_data,
+            "property_search_results.csv",
+            "text/csv",
+            use_container_width=True
+        )
+
+if 'current_query' in st.session_state:
+    query = st.session_state.current_query
+    del st.session_state.current_query
+    run_search(query)
+
+if search_clicked and query:
+    run_search(query)
 
 elif search_clicked:
     st.warning("⚠️ Please enter a search query to find properties")
@@ -429,9 +391,28 @@ elif search_clicked:
 #             st.text(f"{timestamp} - {search_query}")
 
 
+cache = result_cache_stats()
+cache_line = (
+    f"Result cache: {cache['hit_rate']:.0%} hit rate • {cache['entries']} searches cached • "
+    f"avg age served {cache['avg_served_age']:.0f}s • {cache['refreshing']} refreshing"
+)
+browsers = browser_stats()
+browser_line = (
+    f"Browsers: {browsers['browsers']} running • {browsers['processes']} processes • "
+    f"{browsers['rss_mb']:.0f} MB RSS • {browsers['reaped']} orphans reaped"
+)
+llm, parsing = llm_stats(), query_parse_stats()
+llm_line = (
+    f"LLM: circuit {llm['breaker'].replace('_', '-')} • {llm['fallbacks']} fallbacks • "
+    f"{parsing['parse_failure_rate']:.0%} of query specs needed repair • {parsing['failed']} unrecovered"
+)
+
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
 <div style="text-align: center; color: #6b7280; padding: 1rem;">
     Property Seek Pro • Powered by AI • Find your perfect property
+    <div style="font-size: 0.8rem; margin-top: 0.25rem;">{cache_line}</div>
+    <div style="font-size: 0.8rem;">{browser_line}</div>
+    <div style="font-size: 0.8rem;">{llm_line}</div>
 </div>
 """, unsafe_allow_html=True)
\ No newline at end of file
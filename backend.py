@@ -1,21 +1,50 @@
+import asyncio
 import concurrent.futures
+import threading
 import time
-import re
 import logging
-from typing import List, Dict, Any
-import google.generativeai as genai
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Tuple
 from dotenv import load_dotenv
 import os
 from crawlers.property_finder import crawl_property_finder
 from crawlers.find_properties import crawl_find_properties
+from crawlers.browser_supervisor import browser_stats
+from crawlers.listing import Listing, normalize_listings
+from crawlers.listing_filter import filter_listings
+from crawlers.listing_store import LISTING_STORE_MAX_AGE, get_listing_store
+from crawlers.llm_gateway import generate, llm_stats
+from crawlers.query_spec import QuerySpec, extract_query_spec, parse_stats
+from crawlers.readiness import timings as readiness_timings
+from crawlers.result_cache import get_result_cache, spec_key
+from crawlers.singleflight import SingleFlight
+from crawlers.speculative import LinkedEvent, win_stats
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-2.0-flash")
+
+CRAWLERS = [
+    ("Property Finder", crawl_property_finder),
+    ("Find Properties", crawl_find_properties)
+]
+
+# Concurrent searches with the same QuerySpec share one crawl
+SINGLEFLIGHT = os.getenv("SINGLEFLIGHT", "1") not in ("0", "false", "no")
+SEARCH_WAIT_TIMEOUT = float(os.getenv("SEARCH_WAIT_TIMEOUT", 120))
+search_flights = SingleFlight("search")
+
+# Answer from the listing store when it has enough recent matches, before crawling
+STORE_FIRST = os.getenv("STORE_FIRST", "1") not in ("0", "false", "no")
+
+# Drop crawled listings whose area/beds/baths/price/type contradict the query (fallback pages aren't filtered)
+POST_FILTER = os.getenv("POST_FILTER", "1") not in ("0", "false", "no")
+
+# Latency budget for a whole search, and how long any one source may take within it
+SEARCH_BUDGET = float(os.getenv("SEARCH_BUDGET", 90))
+SOURCE_DEADLINE = float(os.getenv("SOURCE_DEADLINE", 75))
+SOURCE_DEADLINES: Dict[str, float] = {}
 
 def is_property_query(query: str) -> bool:
     """
@@ -37,15 +66,11 @@ def call_gemini_api(query: str) -> str:
     """
     Call Gemini API for general conversation
     """
-    try:
-        response = model.generate_content(
-            f"You are a helpful assistant for a UAE property finder app. "
-            f"Answer naturally in 1-2 sentences. Query: {query}"
-        )
-        return response.text.strip()
-    except Exception as e:
-        logger.error(f"❌ Gemini API error: {e}")
-        return "Sorry, I couldn't process your request right now."
+    return generate(
+        f"You are a helpful assistant for a UAE property finder app. "
+        f"Answer naturally in 1-2 sentences. Query: {query}",
+        fallback=lambda: "Sorry, I couldn't process your request right now."
+    )
 
 def validate_query(query: str) -> bool:
     """Validate search query"""
@@ -58,59 +83,39 @@ def validate_query(query: str) -> bool:
         return False
     return True
 
-def clean_price(price_text: str) -> str:
-    if not price_text:
-        return "Price on request"
-    clean = re.sub(r'\s+', ' ', price_text.strip())
-    if 'aed' in clean.lower() and not clean.upper().startswith('AED'):
-        clean = re.sub(r'aed', 'AED', clean, flags=re.IGNORECASE)
-    return clean
-
-def normalize_location(location: str) -> str:
-    if not location:
-        return "UAE"
-    location_map = {
-        'dxb': 'Dubai', 'auh': 'Abu Dhabi', 'shj': 'Sharjah', 'ajm': 'Ajman'
-    }
-    location_lower = location.lower()
-    for abbrev, full_name in location_map.items():
-        if abbrev in location_lower:
-            return full_name
-    return location.title()
-
-def remove_duplicates(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def remove_duplicates(results: List[Listing], seen: set = None) -> List[Listing]:
+    """Listings whose signature isn't in `seen` yet, as they are (no copies); `seen` is updated in place"""
     if not results:
         return results
     unique_results = []
-    seen_combinations = set()
-    
-    for prop in results:
-        title = prop.get('title', '').lower().strip()
-        price = prop.get('price', '').lower().strip()
-        location = prop.get('location', '').lower().strip()
-        price_numbers = re.findall(r'\d+', price)
-        price_signature = ''.join(price_numbers)
-        signature = f"{title[:30]}_{price_signature}_{location[:20]}"
-        
+    seen_combinations = set() if seen is None else seen
+
+    for listing in results:
+        signature = listing.signature
         if signature not in seen_combinations:
             seen_combinations.add(signature)
-            cleaned_prop = {
-                'title': prop.get('title', 'Property Available'),
-                'price': clean_price(prop.get('price', '')),
-                'location': normalize_location(prop.get('location', '')),
-                'description': prop.get('description', ''),
-                'link': prop.get('link', '#'),
-                'source': prop.get('source', 'Unknown')
-            }
-            unique_results.append(cleaned_prop)
-    
+            unique_results.append(listing)
+
     return unique_results
 
-def crawl_single_site(site_name: str, crawler_func, query: str) -> List[Dict[str, Any]]:
+def crawl_single_site(site_name: str, crawler_func, query: str, spec: QuerySpec,
+                      cancel: threading.Event = None, on_page=None) -> List[Listing]:
+    store = get_listing_store()
+    streamed = False
+
+    def page(results):
+        nonlocal streamed
+        streamed = True
+        store.upsert(normalize_listings(results), spec)
+        if on_page:
+            on_page(results)
+
     try:
         logger.info(f"🔍 Starting {site_name} crawler...")
         start_time = time.time()
-        results = crawler_func(query)
+        results = crawler_func(query, spec, cancel, page)
+        if not streamed:
+            store.upsert(normalize_listings(results), spec)
         end_time = time.time()
         duration = end_time - start_time
         
@@ -124,7 +129,19 @@ def crawl_single_site(site_name: str, crawler_func, query: str) -> List[Dict[str
         logger.error(f"❌ {site_name} crawler failed: {e}")
         return []
 
-def search_all_properties(query: str) -> List[Dict[str, Any]]:
+def assistant_reply(query: str) -> List[Listing]:
+    """Gemini answer for non-property queries, shaped like a single listing"""
+    logger.info("💬 Non-property query detected → Using Gemini AI")
+    try:
+        ai_response = call_gemini_api(query)
+        return [Listing("AI Assistant Response", "—", "UAE", ai_response, source="AI Assistant")]
+    except Exception as e:
+        logger.error(f"❌ Gemini failed: {e}")
+        return [Listing("AI Assistant", "—", "UAE",
+                        "I can help you find properties in UAE. Try searching for '2 bedroom apartment in Dubai Marina'.",
+                        source="AI Assistant")]
+
+def search_all_properties(query: str) -> List[Listing]:
     """
     Main function: Returns either scraped results OR Gemini response
     based on query type
@@ -136,69 +153,311 @@ def search_all_properties(query: str) -> List[Dict[str, Any]]:
         return []
     
     if not is_property_query(query):
-        logger.info("💬 Non-property query detected → Using Gemini AI")
-        try:
-            ai_response = call_gemini_api(query)
-            return [{
-                'title': "AI Assistant Response",
-                'price': "—",
-                'location': "UAE",
-                'description': ai_response,
-                'link': "#",
-                'source': "AI Assistant"
-            }]
-        except Exception as e:
-            logger.error(f"❌ Gemini failed: {e}")
-            return [{
-                'title': "AI Assistant",
-                'price': "—",
-                'location': "UAE",
-                'description': "I can help you find properties in UAE. Try searching for '2 bedroom apartment in Dubai Marina'.",
-                'link': "#",
-                'source': "AI Assistant"
-            }]
+        return assistant_reply(query)
     
     logger.info("🏠 Property query detected → Starting web scraping")
     start_time = time.time()
-    all_results = []
-    
-    crawlers = [
-        ("Property Finder", crawl_property_finder),
-        ("Find Properties", crawl_find_properties)
-    ]
-    
-    try:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_crawler = {
-                executor.submit(crawl_single_site, name, func, query): name 
-                for name, func in crawlers
-            }
-            for future in concurrent.futures.as_completed(future_to_crawler, timeout=90):
-                crawler_name = future_to_crawler[future]
-                try:
-                    results = future.result()
-                    if results:
-                        all_results.extend(results)
-                        logger.info(f"✅ {crawler_name}: Added {len(results)} properties")
-                except Exception as e:
-                    logger.error(f"❌ {crawler_name} failed: {e}")
-    except Exception as e:
-        logger.error(f"❌ Parallel execution failed: {e}")
-        for name, func in crawlers:
-            results = crawl_single_site(name, func, query)
-            if results:
-                all_results.extend(results)
-    
+
+    # Understand the query once; every crawler maps this spec to its own URLs
+    spec = extract_query_spec(query)
+
+    key = spec_key(spec)
+    results_by_source, state = get_result_cache().get_or_refresh(
+        key, lambda: stored_or_crawl(key, query, spec)
+    )
+    if state != "miss":
+        logger.info(f"🗄️ Result cache {state} hit for {spec.to_dict()}")
+
+    all_results = [prop for results in results_by_source.values() for prop in results]
     if all_results:
-        unique_results = remove_duplicates(all_results)
-        def sort_key(prop):
-            has_price = 'aed' in prop['price'].lower() or any(char.isdigit() for char in prop['price'])
-            return (not has_price, prop['title'].lower())
-        sorted_results = sorted(unique_results, key=sort_key)
-        
+        sorted_results = merge_results(all_results, spec)
         end_time = time.time()
         logger.info(f"🎉 Found {len(sorted_results)} unique properties in {end_time - start_time:.1f}s")
+        if state == "miss":
+            logger.info(f"⏱️ Page readiness by site: {readiness_timings.summary()}")
+            logger.info(f"🏁 Winning candidate URL index by site: {win_stats.summary()}")
         return sorted_results
     else:
         logger.warning("⚠️ No properties found")
-        return []
\ No newline at end of file
+        return []
+
+def stored_or_crawl(key: str, query: str, spec: QuerySpec) -> Dict[str, List[Listing]]:
+    """Listings from the store if enough were seen within LISTING_STORE_MAX_AGE, else a crawl"""
+    stored = get_listing_store().answer(spec, query) if STORE_FIRST else None
+    if stored is not None:
+        logger.info(f"🗃️ Listing store answered with {sum(map(len, stored.values()))} listings "
+                    f"seen in the last {LISTING_STORE_MAX_AGE / 3600:.1f}h, skipping the crawl")
+        return stored
+    return coalesced_crawl(key, query, spec)
+
+def search_listings(query: str, limit: int = 50, max_age: float = None) -> List[Listing]:
+    """
+    Offline search over every stored listing, no crawl: BM25 full-text
+    ranking on the words the QuerySpec doesn't capture ("sea view
+    penthouse marina" → "sea view"), filtered by the spec (purpose, area,
+    type, beds, baths, price). `max_age` limits it to listings seen that recently.
+    """
+    if not validate_query(query):
+        logger.error("❌ Invalid query")
+        return []
+    start_time = time.time()
+    spec = extract_query_spec(query)
+    results = remove_duplicates(get_listing_store().text_search(query, spec, max_age, limit))
+    logger.info(f"🔎 {len(results)} stored listings for '{query}' in {(time.time() - start_time) * 1000:.1f}ms")
+    return results
+
+def coalesced_crawl(key: str, query: str, spec: QuerySpec) -> Dict[str, List[Listing]]:
+    """crawl_all_sources, shared with any identical search already in flight"""
+    if not SINGLEFLIGHT:
+        return crawl_all_sources(query, spec)
+    try:
+        return search_flights.do(key, lambda cancel, emit: crawl_all_sources(query, spec, cancel, emit),
+                                 timeout=SEARCH_WAIT_TIMEOUT)
+    except TimeoutError as e:
+        logger.error(f"❌ {e}")
+        return {}
+
+async def coalesced_pages(key: str, query: str, spec: QuerySpec,
+                          budget: float = None) -> AsyncIterator[Tuple[str, List[Listing], bool]]:
+    """
+    stream_sources, shared with any identical search already in flight
+    (streamed or not): every caller gets every page of the one crawl,
+    including the ones delivered before it joined.
+    """
+    if not SINGLEFLIGHT:
+        async for item in stream_sources(query, spec, budget=budget):
+            yield item
+        return
+    loop = asyncio.get_running_loop()
+    subscription = search_flights.subscribe(
+        key, lambda cancel, emit: crawl_all_sources(query, spec, cancel, emit, budget))
+    deadline = loop.time() + SEARCH_WAIT_TIMEOUT
+    try:
+        while True:
+            items, finished = await loop.run_in_executor(None, subscription.poll, 0.5)
+            for item in items:
+                yield item
+            if finished:
+                subscription.result()
+                return
+            if loop.time() >= deadline:
+                logger.error(f"❌ search: gave up waiting for {key!r} after {SEARCH_WAIT_TIMEOUT}s")
+                return
+    finally:
+        subscription.close()
+
+def crawl_all_sources(query: str, spec: QuerySpec, cancel: threading.Event = None,
+                      emit: Callable[[Tuple[str, List[Listing], bool]], None] = None,
+                      budget: float = None) -> Dict[str, List[Listing]]:
+    """Run every crawler in parallel; results keyed by source name. `emit` gets each stream_sources item"""
+    async def collect():
+        results_by_source = {name: [] for name, _ in CRAWLERS}
+        async for name, results, finished in stream_sources(query, spec, cancel, budget):
+            results_by_source.setdefault(name, []).extend(results)
+            if emit:
+                emit((name, results, finished))
+        return results_by_source
+
+    return asyncio.run(collect())
+
+async def stream_sources(query: str, spec: QuerySpec, cancel: threading.Event = None,
+                         budget: float = None) -> AsyncIterator[Tuple[str, List[Listing], bool]]:
+    """
+    Run every crawler on its own thread and yield (source, listings, finished)
+    as each page is parsed; the last item for a source has finished=True. A
+    source that overruns its deadline is cancelled, which kills the browser it
+    is waiting on and frees its pool slot, and the search carries on with the
+    pages it already delivered. Nothing runs past the overall `budget`
+    (SEARCH_BUDGET by default).
+    """
+    loop = asyncio.get_running_loop()
+    arrivals: asyncio.Queue = asyncio.Queue()
+    budget = SEARCH_BUDGET if budget is None else budget
+    start = loop.time()
+    crawlers = list(CRAWLERS)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(crawlers), thread_name_prefix="crawl")
+
+    def arrive(name, results, finished):
+        try:
+            loop.call_soon_threadsafe(arrivals.put_nowait, (name, results, finished))
+        except RuntimeError:
+            pass  # The stream has already been closed
+
+    def run(name, func, source_cancel):
+        results = []
+        try:
+            results = crawl_single_site(name, func, query, spec, source_cancel,
+                                        on_page=lambda page: arrive(name, page, False))
+        finally:
+            arrive(name, results, True)
+
+    pending = {}
+    for name, func in crawlers:
+        source_cancel = LinkedEvent(cancel)
+        pending[name] = (source_cancel, start + min(SOURCE_DEADLINES.get(name, SOURCE_DEADLINE), budget))
+        executor.submit(run, name, func, source_cancel)
+
+    streamed = set()
+    delivered = {name: 0 for name in pending}
+    try:
+        while pending:
+            if cancel is not None and cancel.is_set():
+                logger.info("🛑 Search cancelled, dropping remaining sources")
+                break
+            now = loop.time()
+            for name, (source_cancel, deadline) in list(pending.items()):
+                if now >= deadline:
+                    # Partial results, not a re-crawl: keep the pages it delivered, kill what it is loading
+                    logger.warning(f"⏰ {name}: over its {deadline - start:.1f}s deadline, "
+                                   f"keeping the {delivered[name]} listings it already returned")
+                    source_cancel.set()
+                    del pending[name]
+                    yield name, [], True
+            if not pending:
+                break
+
+            wait = min(deadline for _, deadline in pending.values()) - now
+            if cancel is not None:
+                wait = min(wait, 0.5)
+            try:
+                name, results, finished = await asyncio.wait_for(arrivals.get(), timeout=max(wait, 0))
+            except asyncio.TimeoutError:
+                continue
+            if name not in pending:
+                continue
+            if finished:
+                del pending[name]
+                if name in streamed:
+                    results = []  # Already delivered page by page
+            else:
+                streamed.add(name)
+            delivered[name] += len(results)
+            if results or finished:
+                yield name, results, finished
+    finally:
+        for source_cancel, _ in pending.values():
+            source_cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def search_stream(query: str, budget: float = None,
+                        on_progress: Callable[[List[str]], None] = None) -> AsyncIterator[List[Listing]]:
+    """
+    Progressive search: yields batches of new, deduplicated listings that
+    match the query as each source and page arrives. Cached searches, and searches the
+    listing store can answer, come back as a single batch (stale ones
+    refresh in the background). Identical searches running at the same time
+    share one crawl (search_flights), and the finished crawl is
+    stored in the result cache, so search_all_properties benefits too.
+    `on_progress(pending)` gets the sources still searching whenever that changes.
+
+        async for batch in search_stream("2 bed apartment in dubai marina"):
+            ...
+    """
+    logger.info(f"🚀 Streaming query: '{query}'")
+    if not validate_query(query):
+        logger.error("❌ Invalid query")
+        return
+
+    def progress(pending):
+        if on_progress:
+            on_progress(sorted(pending))
+
+    loop = asyncio.get_running_loop()
+    if not is_property_query(query):
+        progress([])
+        yield await loop.run_in_executor(None, assistant_reply, query)
+        return
+
+    start_time = time.time()
+    spec = await loop.run_in_executor(None, extract_query_spec, query)
+    key = spec_key(spec)
+    cache = get_result_cache()
+
+    cached, state = cache.lookup(key)
+    if state != "miss":
+        logger.info(f"🗄️ Result cache {state} hit for {spec.to_dict()}")
+        if state == "stale":
+            cache.revalidate(key, lambda: stored_or_crawl(key, query, spec))
+        progress([])
+        yield merge_results([prop for results in cached.values() for prop in results], spec)
+        return
+
+    stored = await loop.run_in_executor(None, get_listing_store().answer, spec, query) if STORE_FIRST else None
+    if stored is not None:
+        logger.info(f"🗃️ Listing store answered with {sum(map(len, stored.values()))} listings, skipping the crawl")
+        cache.store(key, stored)
+        progress([])
+        yield merge_results([prop for results in stored.values() for prop in results], spec)
+        return
+
+    seen = set()
+    results_by_source = {name: [] for name, _ in CRAWLERS}
+    first_batch_at = None
+    pending = set(results_by_source)
+    progress(pending)
+    async for name, results, finished in coalesced_pages(key, query, spec, budget):
+        results_by_source.setdefault(name, []).extend(results)
+        if finished:
+            pending.discard(name)
+            progress(pending)
+        batch = remove_duplicates(filter_results(results, spec), seen)
+        if batch:
+            if first_batch_at is None:
+                first_batch_at = time.time() - start_time
+                logger.info(f"⚡ First {len(batch)} listings from {name} after {first_batch_at:.1f}s")
+            yield batch
+
+    if any(results_by_source.values()):
+        cache.store(key, results_by_source)
+    logger.info(f"🎉 Streamed {len(seen)} unique properties in {time.time() - start_time:.1f}s")
+
+def iter_search(query: str, budget: float = None,
+                on_progress: Callable[[List[str]], None] = None) -> Iterator[List[Listing]]:
+    """search_stream for synchronous callers (Streamlit); closing it early cancels the crawl"""
+    loop = asyncio.new_event_loop()
+    stream = search_stream(query, budget, on_progress)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(stream.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(stream.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+def filter_results(results: List[Listing], spec: QuerySpec) -> List[Listing]:
+    """`results` without the listings that contradict the spec (see POST_FILTER)"""
+    if not POST_FILTER or not results:
+        return results
+    kept = filter_listings(results, spec)
+    if len(kept) < len(results):
+        logger.info(f"🧹 Dropped {len(results) - len(kept)} of {len(results)} listings not matching {spec.to_dict()}")
+    return kept
+
+def merge_results(all_results: List[Listing], spec: QuerySpec = None) -> List[Listing]:
+    """Filter to `spec` (if given), deduplicate, then priced listings first, alphabetically"""
+    if spec is not None:
+        all_results = filter_results(all_results, spec)
+    unique_results = remove_duplicates(all_results)
+    return sorted(unique_results, key=lambda listing: (listing.price_aed is None, listing.title.lower()))
+
+def invalidate_results(source: str = None) -> int:
+    """Drop cached results for one source (e.g. "Property Finder"), or everything"""
+    touched = get_result_cache().invalidate(source=source)
+    logger.info(f"🗑️ Invalidated cached results for {source or 'all sources'} in {touched} searches")
+    return touched
+
+def result_cache_stats() -> Dict[str, Any]:
+    return get_result_cache().snapshot()
+
+def search_flight_stats() -> Dict[str, int]:
+    return search_flights.snapshot()
+
+def listing_store_stats() -> Dict[str, Any]:
+    return get_listing_store().snapshot()
+
+def query_parse_stats() -> Dict[str, Any]:
+    """How often the LLM's query spec had to be repaired or was thrown away"""
+    return parse_stats.snapshot()
@@ -0,0 +1,106 @@
+"""
+Per-page card extraction time and WebDriver round-trips, per-element
+WebDriver walk vs one batched execute_script, on the Bayut fixture page.
+
+    python -m benchmarks.bench_batch_extract --cards 25 --reps 5
+
+Covers final_bayut (extract_card vs extract_cards + card_from_row) and
+BAYUT V1/llm.py scrape_property_listings with BATCH_EXTRACT off and on.
+scrap_4.py runs its whole search at import time, but its batched path
+uses the same extract_cards call as llm.py.
+"""
+import argparse
+import importlib.util
+import os
+import time
+
+from selenium.webdriver.common.by import By
+
+import final_bayut
+from benchmarks.fixture_server import percentile, serve_fixtures
+from crawlers.batch_extract import extract_cards
+from crawlers.driver_pool import create_chrome_driver
+from crawlers.readiness import install_hooks, wait_for_listings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_llm_module():
+    spec = importlib.util.spec_from_file_location("bayut_v1_llm", os.path.join(ROOT, "BAYUT V1", "llm.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def count_commands(driver):
+    """Wrap driver.execute so every chromedriver HTTP round-trip is counted"""
+    counter = {"n": 0}
+    original = driver.execute
+
+    def execute(command, params=None):
+        counter["n"] += 1
+        return original(command, params)
+
+    driver.execute = execute
+    return counter
+
+
+def final_bayut_legacy(driver):
+    elements = driver.find_elements(By.CSS_SELECTOR, final_bayut.LISTING_SELECTORS[0])
+    return [card for card in map(final_bayut.extract_card, elements) if card]
+
+
+def final_bayut_batched(driver):
+    _, rows = extract_cards(driver, final_bayut.LISTING_SELECTORS, final_bayut.BAYUT_CARD_FIELDS, min_cards=5)
+    return [card for card in map(final_bayut.card_from_row, rows) if card]
+
+
+def llm_path(module, batched):
+    def run(driver):
+        module.BATCH_EXTRACT = batched
+        return module.scrape_property_listings(driver, {"location": "Dubai"})
+    return run
+
+
+def measure(driver, counter, fn, reps):
+    samples, calls, count = [], 0, 0
+    for _ in range(reps):
+        counter["n"] = 0
+        start = time.perf_counter()
+        count = len(fn(driver))
+        samples.append(time.perf_counter() - start)
+        calls = counter["n"]
+    return samples, calls, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=25)
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    llm = load_llm_module()
+    paths = [
+        ("final_bayut per-element", final_bayut_legacy),
+        ("final_bayut batched", final_bayut_batched),
+        ("llm.py per-element", llm_path(llm, False)),
+        ("llm.py batched", llm_path(llm, True)),
+    ]
+
+    with serve_fixtures() as base:
+        driver = create_chrome_driver()
+        install_hooks(driver)
+        try:
+            driver.get(f"{base}/bayut/search?cards={args.cards}")
+            wait_for_listings(driver, "bayut")
+            counter = count_commands(driver)
+            for label, fn in paths:
+                samples, calls, count = measure(driver, counter, fn, args.reps)
+                print(f"{label:<24} p50={percentile(samples, 50) * 1000:8.1f} ms  "
+                      f"p95={percentile(samples, 95) * 1000:8.1f} ms  round-trips={calls:>5}  cards={count}")
+        finally:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
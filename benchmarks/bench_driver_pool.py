@@ -0,0 +1,70 @@
+"""
+Search latency with and without the warm driver pool.
+
+Each "search" is what a crawler does per query: obtain a Chrome, load a
+fixture results page, parse the cards, give the browser back. Without the
+pool every search launches and quits its own Chrome.
+
+    python -m benchmarks.bench_driver_pool --searches 20
+"""
+import argparse
+import time
+
+from benchmarks.fixture_server import percentile, serve_fixtures
+from crawlers.driver_pool import DriverPool, create_chrome_driver
+from crawlers.html_parser import parse_html
+from crawlers.property_finder import extract_properties_enhanced
+
+
+def _search(driver, url):
+    driver.get(url)
+    return extract_properties_enhanced(parse_html(driver.page_source), url)
+
+
+def run_cold(url, searches):
+    samples = []
+    for _ in range(searches):
+        start = time.perf_counter()
+        driver = create_chrome_driver()
+        try:
+            _search(driver, url)
+        finally:
+            driver.quit()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_pooled(url, searches):
+    pool = DriverPool("bench", create_chrome_driver, min_size=1, max_size=1)
+    pool.warm()
+    samples = []
+    try:
+        for _ in range(searches):
+            start = time.perf_counter()
+            with pool.lease() as driver:
+                _search(driver, url)
+            samples.append(time.perf_counter() - start)
+    finally:
+        pool.close()
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<10} n={len(samples):<3} p50={percentile(samples, 50) * 1000:8.1f} ms  "
+          f"p95={percentile(samples, 95) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=25)
+    args = parser.parse_args()
+
+    with serve_fixtures() as base:
+        url = f"{base}/propertyfinder/search?cards={args.cards}"
+        report("no pool", run_cold(url, args.searches))
+        report("pool", run_pooled(url, args.searches))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Parse and extract time per HTML parser backend on large result pages.
+
+    python -m benchmarks.bench_html_parser --cards 500 --reps 10
+    python -m benchmarks.bench_html_parser --pages saved/
+
+Every installed backend (selectolax, lxml, html.parser) parses each page
+once; the site's DOM extractor then runs on that tree. Fixture pages are
+generated without embedded JSON so the extractors do the full walk. Saved
+pages are matched to a site by file-name prefix, as in
+bench_structured_data.
+"""
+import argparse
+import time
+
+from benchmarks.bench_structured_data import SITES, URL, load_pages
+from benchmarks.fixture_server import RENDERERS, generate_listings, percentile
+from crawlers.bayut import BayutCrawler
+from crawlers.find_properties import extract_properties
+from crawlers.html_parser import available_backends, parse_html
+from crawlers.property_finder import extract_properties_enhanced
+
+_bayut = BayutCrawler.__new__(BayutCrawler)
+
+EXTRACTORS = {
+    "property_finder": lambda page: extract_properties_enhanced(page, URL),
+    "find_properties": lambda page: extract_properties(page, URL),
+    "bayut": _bayut.extract_page,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved result pages")
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--reps", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages, args.cards)
+    else:
+        listings = generate_listings(args.cards)
+        pages = [(site, f"fixture-{args.cards}", RENDERERS[path](listings, False)) for site, path in SITES.items()]
+
+    for site, name, html in pages:
+        print(f"{site} / {name} ({len(html) / 1024:.0f} KiB)")
+        for backend in available_backends():
+            parse_times, extract_times, count = [], [], 0
+            for _ in range(args.reps):
+                start = time.perf_counter()
+                page = parse_html(html, backend)
+                parsed = time.perf_counter()
+                count = len(EXTRACTORS[site](page))
+                extract_times.append(time.perf_counter() - parsed)
+                parse_times.append(parsed - start)
+            print(f"  {backend:<12} parse p50={percentile(parse_times, 50) * 1000:8.2f} ms  "
+                  f"extract p50={percentile(extract_times, 50) * 1000:8.2f} ms  listings={count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Cold-start cost of importing the app's entry points, from `python -X importtime`.
+
+    python -m benchmarks.bench_importtime --reps 5 --top 12
+
+Each rep imports the target in a fresh interpreter and parses the
+importtime log: the target's cumulative time, plus its direct imports by
+cumulative cost (first rep). `--ref` measures another commit from a
+temporary git worktree alongside. `app` is imported outside `streamlit run`
+(bare mode) with DRIVER_POOL_WARMUP=0 so no browser starts.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import List, Tuple
+
+from benchmarks.fixture_server import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS = ["backend", "app", "crawlers", "crawlers.query_spec"]
+
+
+def import_log(module: str, root: str = ROOT) -> List[Tuple[str, int, int, int]]:
+    """(name, depth, self_us, cumulative_us) per line, for one cold import of `module`"""
+    env = dict(os.environ, DRIVER_POOL_WARMUP="0", PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=root, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    log = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        log.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return log
+
+
+def breakdown(log, target: str):
+    """Cumulative time of `target` and of the modules it imported directly"""
+    index = max(i for i, entry in enumerate(log) if entry[0] == target)
+    _, depth, _, cumulative = log[index]
+    children = []
+    for name, child_depth, _, child_cumulative in reversed(log[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1:
+            children.append((child_cumulative, name))
+    return cumulative, sorted(children, reverse=True)
+
+
+def measure(target: str, reps: int, root: str = ROOT):
+    samples, children = [], None
+    for _ in range(reps):
+        cumulative, direct = breakdown(import_log(target, root), target)
+        samples.append(cumulative / 1000)
+        children = children or direct
+    return samples, children
+
+
+@contextmanager
+def checkout(ref: str):
+    """A throwaway git worktree of `ref`, to compare against"""
+    path = tempfile.mkdtemp(prefix="importtime-")
+    subprocess.run(["git", "worktree", "add", "--detach", path, ref], cwd=ROOT, check=True, capture_output=True)
+    try:
+        yield path
+    finally:
+        subprocess.run(["git", "worktree", "remove", "--force", path], cwd=ROOT, capture_output=True)
+
+
+def report(label: str, samples, children, top: int):
+    print(f"{label:<32} cumulative p50={percentile(samples, 50):7.1f}ms  "
+          f"min={min(samples):7.1f}ms  stdev={statistics.pstdev(samples):5.1f}ms")
+    for cumulative, name in children[:top]:
+        print(f"    {cumulative / 1000:8.1f}ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reps", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="direct imports to list per target")
+    parser.add_argument("--ref", help="also measure this git ref (e.g. HEAD~1) for comparison")
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    args = parser.parse_args()
+
+    for target in args.targets:
+        samples, children = measure(target, args.reps)
+        if args.ref:
+            with checkout(args.ref) as path:
+                try:
+                    before, before_children = measure(target, args.reps, path)
+                    report(f"{target} @ {args.ref}", before, before_children, args.top)
+                except RuntimeError as e:
+                    print(f"{target} @ {args.ref}: {str(e).splitlines()[0]}")
+        report(target, samples, children, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Bytes transferred, page-ready time and Chrome RSS with and without the
+lean browsing profile, on the fixture result pages.
+
+    python -m benchmarks.bench_lean --loads 10
+
+The fixture analytics script is served from the local host, so it is
+added to the block list explicitly to stand in for the tracker domains.
+RSS is the sum over chromedriver's process tree (Linux /proc).
+"""
+import argparse
+import os
+import time
+
+from benchmarks.fixture_server import percentile, serve_fixtures
+from crawlers.driver_pool import create_chrome_driver
+from crawlers.lean import apply_lean_profile
+from crawlers.readiness import SITE_READINESS, install_hooks, wait_until_ready
+
+SITES = {"property_finder": "propertyfinder", "find_properties": "findproperties", "bayut": "bayut"}
+
+BYTES_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var total = nav ? nav.transferSize : 0;
+performance.getEntriesByType('resource').forEach(function (e) { total += e.transferSize; });
+return total;
+"""
+
+
+def process_tree_rss(root_pid: int) -> int:
+    """Resident memory in bytes of `root_pid` and all its descendants"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return total
+
+
+def measure(base, site, lean, loads, cards):
+    driver = create_chrome_driver()
+    install_hooks(driver)
+    if lean:
+        apply_lean_profile(driver, site, extra=["*/static/analytics.js"])
+    else:
+        apply_lean_profile(driver, "none")
+    config = SITE_READINESS[site]
+    url = f"{base}/{SITES[site]}/search?cards={cards}"
+    ready_times, transferred = [], []
+    try:
+        for _ in range(loads):
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            start = time.perf_counter()
+            driver.get(url)
+            wait_until_ready(driver, config["selector"], max_wait=config["max_wait"], min_count=1)
+            ready_times.append(time.perf_counter() - start)
+            transferred.append(driver.execute_script(BYTES_JS))
+        rss = process_tree_rss(driver.service.process.pid)
+    finally:
+        driver.quit()
+    return ready_times, transferred, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--cards", type=int, default=25)
+    args = parser.parse_args()
+
+    with serve_fixtures() as base:
+        for site in SITES:
+            for lean in (False, True):
+                ready, sent, rss = measure(base, site, lean, args.loads, args.cards)
+                print(f"{site:<16} {'lean' if lean else 'full':<5} "
+                      f"bytes/page={sum(sent) / len(sent) / 1024:8.1f} KiB  "
+                      f"ready p50={percentile(ready, 50) * 1000:7.1f} ms p95={percentile(ready, 95) * 1000:7.1f} ms  "
+                      f"chrome rss={rss / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
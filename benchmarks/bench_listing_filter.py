@@ -0,0 +1,110 @@
+"""
+Post-crawl listing filter (crawlers.listing_filter): time to filter a
+crawl's worth of parsed listings against a few query specs, and how many
+of them survive, i.e. how much less gets deduplicated and rendered.
+
+    python -m benchmarks.bench_listing_filter --sizes 1000 5000 20000 --reps 50
+
+ListingFilter.apply runs one list pass per criterion over what the
+previous criteria kept. "numpy" is the column-mask alternative: gather
+each attribute into an array, compare whole columns, then select. Both
+must keep the same listings.
+
+"normalise" is normalize_listings on the fresh batch, with the place cache
+empty: prices, areas, emirate and type read from the text, once per batch
+(crawl pages pay it before the store upsert). "first" is the first apply
+after it, "apply" the repeats. Neither filter is sub-millisecond past a
+couple of thousand listings: reading attributes off that many objects is
+the cost, whichever way they are compared.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_listing_model import scraped_cards
+from benchmarks.fixture_server import percentile
+from crawlers.listing import Listing, normalize_listings, read_place
+from crawlers.listing_filter import TYPE_MATCHES, ListingFilter
+from crawlers.query_parser import parse_query
+
+QUERIES = [
+    "apartment for rent in dubai",
+    "2 bedroom apartment in dubai marina",
+    "3 bed villa under 400k",
+    "2 bed 2 bath apartment between 80k and 150k",
+    "villa for rent in arabian ranches",
+]
+
+
+def numpy_filter(listings, spec_filter):
+    """The same rules as ListingFilter.apply, as column masks"""
+    keep = np.ones(len(listings), dtype=bool)
+
+    def column(name):
+        values = np.array([getattr(listing, name) for listing in listings], dtype=object)
+        known = values != None  # noqa: E711 (element-wise)
+        return known, np.where(known, values, 0).astype(float)
+
+    if spec_filter.bedrooms is not None:
+        known, beds = column("bedrooms")
+        keep &= ~known | (beds == spec_filter.bedrooms)
+    if spec_filter.min_price is not None or spec_filter.max_price is not None:
+        known, price = column("price_aed")
+        monthly = np.array([listing.period == "monthly" for listing in listings], dtype=bool)
+        price = np.where(monthly, price * 12, price)
+        keep &= ~known | ((price >= (spec_filter.min_price or 0)) & (price <= (spec_filter.max_price or np.inf)))
+    if spec_filter.bathrooms is not None:
+        known, baths = column("bathrooms")
+        keep &= ~known | (baths >= spec_filter.bathrooms)
+    if spec_filter.community:
+        keep &= np.array([not listing.areas or spec_filter.community in listing.areas for listing in listings],
+                         dtype=bool)
+    if spec_filter.city:
+        cities = np.array([listing.city for listing in listings], dtype=object)
+        keep &= (cities == "") | (cities == spec_filter.city)
+    if spec_filter.property_type:
+        types = np.array([listing.property_type for listing in listings], dtype=object)
+        keep &= np.isin(types, TYPE_MATCHES.get(spec_filter.property_type, (spec_filter.property_type, "")))
+    return [listings[i] for i in np.flatnonzero(keep)]
+
+
+def timed(run, reps):
+    samples = []
+    for _ in range(reps):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--reps", type=int, default=50)
+    args = parser.parse_args()
+
+    specs = [(query, ListingFilter.from_spec(parse_query(query)[0])) for query in QUERIES]
+    for size in args.sizes:
+        cards = scraped_cards(size)
+        print(f"\n{size:,} listings")
+        for query, spec_filter in specs:
+            listings = [Listing.parse(t, p, loc, d, link, s) for t, p, loc, d, link, s, _ in cards]
+            read_place.cache_clear()
+            start = time.perf_counter()
+            normalize_listings(listings)
+            normalised = time.perf_counter() - start
+            start = time.perf_counter()
+            kept = spec_filter.apply(listings)
+            first = time.perf_counter() - start
+            assert kept == numpy_filter(listings, spec_filter), query
+            warm = timed(lambda: spec_filter.apply(listings), args.reps)
+            masks = timed(lambda: numpy_filter(listings, spec_filter), args.reps)
+            print(f"  {query:<46} kept {len(kept):>6,} ({len(kept) / size:6.1%})  normalise={normalised * 1000:7.2f} ms  "
+                  f"first={first * 1000:6.3f} ms  "
+                  f"apply p50={percentile(warm, 50) * 1000:6.3f} ms p95={percentile(warm, 95) * 1000:6.3f} ms  "
+                  f"numpy p50={percentile(masks, 50) * 1000:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Listing records: memory per 100k listings and end-to-end time through
+parse -> dedup -> sort -> CSV, the old result dicts vs `Listing`.
+
+    python -m benchmarks.bench_listing_model --count 100000 --reps 5
+
+The dict pipeline is the one the crawlers and backend ran before Listing:
+crawler dicts, price/beds/baths/area parsed out of their strings for the
+listing store (normalize_listing), copied by clean_listing while
+deduplicating, sorted on the price text, then written by csv.DictWriter
+(the app used pandas, which only adds to the dict side). With Listing those
+numbers are parsed once per listing and the store reads attributes.
+Both sides start from the same scraped strings (~10% repeats across pages),
+so what is measured is the records built from them. Memory is what tracemalloc still holds once the deduplicated, sorted
+records are the only thing left, i.e. what a search keeps around.
+"""
+import argparse
+import csv
+import gc
+import io
+import random
+import re
+import time
+import tracemalloc
+
+from backend import merge_results
+from benchmarks.fixture_server import percentile
+from crawlers.listing import (_AREA_SQFT_RE, Listing, _number, clean_price, listings_csv, normalize_listings,
+                              normalize_location)
+from crawlers.prices import normalize_price, normalize_prices
+from crawlers.query_parser import _BATHS_RE, _BEDS_RE, _count
+
+AREAS = ("Dubai Marina", "Downtown Dubai", "JBR", "Business Bay", "Al Reem Island", "Al Nahda", "DXB Hills")
+TYPES = ("Apartment", "Villa", "Townhouse", "Penthouse", "Studio")
+SOURCES = ("Property Finder", "Find Properties", "Bayut")
+
+
+def scraped_cards(count: int, seed: int = 5):
+    """(title, price, location, description, link, source, card_text) as the DOM scrapers read them"""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        n = rng.randrange(int(count * 0.9)) if rng.random() < 0.1 else i
+        card = random.Random(n)
+        beds, area, place = card.randint(1, 5), card.randint(8, 60) * 50, card.choice(AREAS)
+        title = f"{beds} Bedroom {card.choice(TYPES)} in {place}"
+        price = f"AED {card.randint(30, 900) * 1_000 + card.randrange(1_000):,} per year"
+        text = f"{title} {price} {beds} Beds {beds} Baths {area:,} sqft {place}, Dubai"
+        cards.append((title, price, place, text[:120] + "...",
+                      f"https://listings.example/{n}", SOURCES[n % len(SOURCES)], text))
+    return cards
+
+
+# --- The dict pipeline, as backend.py had it ---------------------------------------------------
+
+def _signature(prop):
+    title = prop.get('title', '').lower().strip()
+    price = prop.get('price', '').lower().strip()
+    location = prop.get('location', '').lower().strip()
+    return f"{title[:30]}_{''.join(re.findall(r'[0-9]+', price))}_{location[:20]}"
+
+
+def _clean_listing(prop):
+    return {
+        'title': prop.get('title', 'Property Available'),
+        'price': clean_price(prop.get('price', '')),
+        'location': normalize_location(prop.get('location', '')),
+        'description': prop.get('description', ''),
+        'link': prop.get('link', '#'),
+        'source': prop.get('source', 'Unknown')
+    }
+
+
+def _store_numbers(prop):
+    """The number parsing normalize_listing did on every crawled dict"""
+    text = f"{prop.get('title') or ''} {prop.get('description') or ''}".lower()
+    price, period, _ = normalize_price(prop.get("price", ""))
+    bedrooms = _number(prop.get("bedrooms"))
+    if bedrooms is None and (m := _BEDS_RE.search(text)):
+        bedrooms = _count(m.group(1))
+    bathrooms = _number(prop.get("bathrooms"))
+    if bathrooms is None and (m := _BATHS_RE.search(text)):
+        bathrooms = _count(m.group(1))
+    area = _number(prop.get("area"))
+    if area is None and (m := _AREA_SQFT_RE.search(text)):
+        area = _number(m.group(1))
+    return price, period, bedrooms, bathrooms, area
+
+
+def dict_pipeline(cards):
+    props = [{"title": t, "price": p, "location": loc, "description": d, "link": link, "source": s}
+             for t, p, loc, d, link, s, _ in cards]
+    for prop in props:
+        _store_numbers(prop)
+    seen, unique = set(), []
+    for prop in props:
+        signature = _signature(prop)
+        if signature not in seen:
+            seen.add(signature)
+            unique.append(_clean_listing(prop))
+
+    def sort_key(prop):
+        has_price = 'aed' in prop['price'].lower() or any(char.isdigit() for char in prop['price'])
+        return (not has_price, prop['title'].lower())
+    return sorted(unique, key=sort_key)
+
+
+def dict_csv(results):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(results[0]))
+    writer.writeheader()
+    writer.writerows(results)
+    return out.getvalue()
+
+
+# --- Listing ------------------------------------------------------------------------------------
+
+def listing_pipeline(cards):
+    return merge_results(normalize_listings(
+        [Listing.parse(t, p, loc, d, link, s, raw=text) for t, p, loc, d, link, s, text in cards]))
+
+
+PIPELINES = {"dicts": (dict_pipeline, dict_csv), "Listing": (listing_pipeline, listings_csv)}
+
+
+def held_bytes(pipeline, cards) -> int:
+    gc.collect()
+    tracemalloc.start()
+    records = pipeline(cards)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    cards = scraped_cards(args.count)
+    per_100k = 100_000 / args.count
+    normalize_prices(["AED 1,000"])  # pandas/pyarrow imports out of the memory figure
+    for name, (pipeline, to_csv) in PIPELINES.items():
+        held = held_bytes(pipeline, cards)
+        timings = {"parse+dedup+sort": [], "csv": []}
+        for _ in range(args.reps):
+            start = time.perf_counter()
+            records = pipeline(cards)
+            mid = time.perf_counter()
+            to_csv(records)
+            timings["parse+dedup+sort"].append(mid - start)
+            timings["csv"].append(time.perf_counter() - mid)
+        total = [a + b for a, b in zip(timings["parse+dedup+sort"], timings["csv"])]
+        print(f"{name:<8} {len(records):,} kept  memory={held * per_100k / 1e6:6.1f} MB/100k  "
+              + "  ".join(f"{stage} p50={percentile(samples, 50) * 1000:7.1f} ms" for stage, samples in timings.items())
+              + f"  end-to-end p50={percentile(total, 50) * 1000:7.1f} ms p95={percentile(total, 95) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Full-text search over the listing store: FTS5 + BM25 on the words the
+QuerySpec doesn't capture, combined with the spec's structured filters,
+as backend.search_listings does.
+
+    python -m benchmarks.bench_listing_search --rows 2000000 --reps 50
+    python -m benchmarks.bench_listing_search --path /tmp/listings.sqlite3   # reuse a built store
+
+Reports:
+  - index maintenance: loading a sample with the per-row triggers vs.
+    bulk_load() (triggers off, one rebuild at the end), and the cost of a
+    crawled page of 20 upserted into the full store;
+  - rebuild and optimize times for the full index;
+  - per query latency and hit count, spanning rare and very common terms,
+    with and without structured filters: "first" includes counting each
+    new term's document frequency (cached for LISTING_FTS_STATS_TTL), p50/p95
+    are the repeats.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_listing_store import synthetic_rows
+from benchmarks.fixture_server import percentile
+from crawlers.listing import Listing
+from crawlers.listing_store import ListingStore, free_text_terms
+from crawlers.query_parser import parse_query
+from crawlers.query_spec import QuerySpec
+
+QUERIES = [
+    "sea view penthouse marina",
+    "villa with maid's room and private pool in arabian ranches",
+    "furnished 2 bedroom apartment jlt with balcony under 150k",
+    "burj khalifa view downtown",
+    "jacuzzi rooftop terrace",
+    "pet friendly",
+    "balcony",
+]
+
+
+def load(store: ListingStore, rows, batch: int):
+    pending = []
+    for row in rows:
+        pending.append(row)
+        if len(pending) >= batch:
+            store.upsert_rows(pending)
+            pending = []
+    store.upsert_rows(pending)
+
+
+def timed(label: str, count: int, run):
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed:6.1f}s  ({count / elapsed:,.0f} rows/s)")
+
+
+def maintenance(sample: int, batch: int, now: float):
+    directory = tempfile.mkdtemp(prefix="listing-search-")
+    incremental = ListingStore(os.path.join(directory, "incremental.sqlite3"))
+    timed(f"load {sample:,} with per-row index triggers", sample,
+          lambda: load(incremental, synthetic_rows(sample, now), batch))
+    bulk = ListingStore(os.path.join(directory, "bulk.sqlite3"))
+
+    def bulk_run():
+        with bulk.bulk_load():
+            load(bulk, synthetic_rows(sample, now), batch)
+    timed(f"load {sample:,} with bulk_load() + rebuild", sample, bulk_run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--sample", type=int, default=200_000, help="rows for the load-strategy comparison")
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--reps", type=int, default=50)
+    parser.add_argument("--path", help="store file to build/reuse (default: a temporary file)")
+    args = parser.parse_args()
+
+    now = time.time()
+    maintenance(args.sample, args.batch, now)
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="listing-search-"), "listings.sqlite3")
+    store = ListingStore(path)
+    missing = args.rows - store.count()
+    if missing > 0:
+        def build():
+            with store.bulk_load():
+                load(store, synthetic_rows(missing, now, start=store.count()), args.batch)
+        timed(f"build {missing:,} with bulk_load()", missing, build)
+    total = store.count()
+    timed("rebuild index", total, store.rebuild_index)
+    timed("optimize index", total, store.optimize_index)
+    print(f"store: {total:,} listings, {os.path.getsize(path) / 1e6:,.0f} MB at {path}")
+
+    spec = QuerySpec(purpose="rent", location="dubai marina", city="dubai")
+    page_times = []
+    for n in range(20):
+        page = [Listing.parse(title=f"Sea view {n % 4 + 1} bedroom apartment", price=f"AED {90_000 + n * 1000 + i:,}",
+                              location="Dubai Marina", description="balcony, gym, covered parking",
+                              link=f"https://crawled.example/{n}/{i}", source="Property Finder") for i in range(20)]
+        start = time.perf_counter()
+        store.upsert(page, spec)
+        page_times.append(time.perf_counter() - start)
+    print(f"{'upsert a crawled page of 20 (indexed)':<44} p50={percentile(page_times, 50) * 1000:6.2f} ms  "
+          f"p95={percentile(page_times, 95) * 1000:6.2f} ms")
+
+    print()
+    for query in QUERIES:
+        for label, query_spec in (("filtered", parse_query(query)[0]), ("text only", None)):
+            latencies, hits = [], 0
+            for _ in range(args.reps):
+                start = time.perf_counter()
+                hits = len(store.text_search(query, query_spec, limit=50))
+                latencies.append(time.perf_counter() - start)
+            print(f"{query[:44]:<45} {label:<9} terms={' '.join(free_text_terms(query)):<28} "
+                  f"first={latencies[0] * 1000:7.2f} ms  p50={percentile(latencies, 50) * 1000:7.2f} ms  "
+                  f"p95={percentile(latencies, 95) * 1000:7.2f} ms  hits={hits}")
+
+
+if __name__ == "__main__":
+    main()
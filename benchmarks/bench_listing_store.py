@@ -0,0 +1,141 @@
+"""
+Listing store at scale: load a synthetic store (1M listings by default)
+through batched upserts, then time cache-first lookups for a mix of
+QuerySpecs against it.
+
+    python -m benchmarks.bench_listing_store --rows 1000000 --queries 500
+    python -m benchmarks.bench_listing_store --path /tmp/listings.sqlite3   # reuse a built store
+
+Rows are spread over the known areas, both purposes, every property type,
+0-5 bedrooms and a year of last_seen times, so a lookup with the default
+6h freshness bound sees a realistic sliver of the table. Reported: upsert
+throughput (normalised rows, plus crawler Listings through normalize_listing on
+a sample), then per query shape the p50/p95 latency and the mean number of
+listings returned.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.fixture_server import percentile
+from crawlers.listing import Listing
+from crawlers.listing_store import ListingStore
+from crawlers.query_parser import AREA_CITY, AREAS
+from crawlers.query_spec import PROPERTY_TYPES, QuerySpec
+
+COMMUNITIES = sorted(set(AREAS.values()))
+SOURCES = ("Property Finder", "Find Properties", "Bayut")
+AMENITIES = ("sea view", "marina view", "burj khalifa view", "golf course view", "balcony", "private pool",
+             "shared pool", "gym", "maid's room", "study", "storage room", "covered parking", "furnished",
+             "unfurnished", "chiller free", "pet friendly", "built-in wardrobes", "kitchen appliances",
+             "private garden", "rooftop terrace", "jacuzzi", "walk-in closet", "high floor", "upgraded")
+YEAR = 365 * 86400
+
+
+def synthetic_rows(count: int, now: float, seed: int = 7, start: int = 0):
+    """Normalised store rows; ~2% were seen in the last 6h"""
+    rng = random.Random(seed + start)
+    for i in range(start, start + count):
+        community = rng.choice(COMMUNITIES)
+        purpose = "rent" if rng.random() < 0.6 else "sale"
+        bedrooms = rng.randint(0, 5)
+        price = (rng.randint(30, 400) * 1_000 if purpose == "rent" else rng.randint(500, 15_000) * 1_000)
+        seen = now - (rng.random() * 6 * 3600 if rng.random() < 0.02 else rng.random() * YEAR)
+        amenities = rng.sample(AMENITIES, 3)
+        yield {
+            "url": f"https://listings.example/{i}",
+            "source": SOURCES[i % len(SOURCES)],
+            "title": f"{amenities[0].capitalize()} {bedrooms} bedroom {rng.choice(PROPERTY_TYPES)} "
+                     f"in {community.title()}",
+            "description": f"{bedrooms} Bed | {max(bedrooms, 1)} Bath | {500 + bedrooms * 400} sqft | "
+                           f"{', '.join(amenities)}",
+            "price": price,
+            "price_text": f"AED {price:,}" + (" per year" if purpose == "rent" else ""),
+            "period": "yearly" if purpose == "rent" else None,
+            "purpose": purpose,
+            "property_type": rng.choice(PROPERTY_TYPES),
+            "bedrooms": bedrooms,
+            "bathrooms": max(bedrooms, 1),
+            "area_sqft": float(500 + bedrooms * 400),
+            "city": AREA_CITY.get(community, "dubai"),
+            "community": community,
+            "location": community.title(),
+            "first_seen": seen,
+            "last_seen": seen,
+        }
+
+
+def build(store: ListingStore, rows: int, batch: int, now: float):
+    start = time.perf_counter()
+    pending = []
+    for row in synthetic_rows(rows, now, start=store.count()):
+        pending.append(row)
+        if len(pending) >= batch:
+            store.upsert_rows(pending)
+            pending = []
+    store.upsert_rows(pending)
+    elapsed = time.perf_counter() - start
+    print(f"built {rows:,} rows in {elapsed:5.1f}s  ({rows / elapsed:,.0f} rows/s, batches of {batch})")
+
+
+def crawler_upsert(store: ListingStore, count: int):
+    """Crawler Listings through normalize_listing + upsert, as crawl_single_site does"""
+    spec = QuerySpec(purpose="rent", location="dubai marina", city="dubai")
+    props = [Listing.parse(title=f"{i % 4 + 1} Bedroom Apartment in Dubai Marina", price=f"AED {60_000 + i:,} per year",
+                           location="Marina", description=f"{i % 4 + 1} beds {i % 3 + 1} baths 1,{i % 900:03d} sqft",
+                           link=f"https://crawled.example/{i}", source="Property Finder") for i in range(count)]
+    start = time.perf_counter()
+    for i in range(0, count, 20):  # One crawled page at a time
+        store.upsert(props[i:i + 20], spec)
+    elapsed = time.perf_counter() - start
+    print(f"crawler upserts: {count:,} listings in pages of 20 in {elapsed:5.2f}s  ({count / elapsed:,.0f} listings/s)")
+
+
+def query_shapes(rng: random.Random):
+    community = rng.choice(COMMUNITIES)
+    city = AREA_CITY.get(community, "dubai")
+    purpose = rng.choice(("rent", "sale"))
+    return {
+        "city only": QuerySpec(purpose=purpose, location=city, city=city),
+        "area": QuerySpec(purpose=purpose, location=community, city=city),
+        "area+type+beds": QuerySpec(purpose=purpose, location=community, city=city,
+                                    property_type=rng.choice(PROPERTY_TYPES), bedrooms=rng.randint(0, 5)),
+        "area+price": QuerySpec(purpose=purpose, location=community, city=city, max_price=150_000
+                                if purpose == "rent" else 3_000_000),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--max-age", type=float, default=6 * 3600)
+    parser.add_argument("--path", help="store file to build/reuse (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="listing-store-"), "listings.sqlite3")
+    store = ListingStore(path)
+    now = time.time()
+    if store.count() < args.rows:
+        build(store, args.rows - store.count(), args.batch, now)
+    crawler_upsert(store, 10_000)
+    print(f"store: {store.count():,} listings, {os.path.getsize(path) / 1e6:,.0f} MB at {path}")
+
+    rng = random.Random(11)
+    latencies, returned = {}, {}
+    for _ in range(args.queries):
+        for shape, spec in query_shapes(rng).items():
+            start = time.perf_counter()
+            listings = store.search(spec, max_age=args.max_age)
+            latencies.setdefault(shape, []).append(time.perf_counter() - start)
+            returned.setdefault(shape, []).append(len(listings))
+    for shape, samples in latencies.items():
+        print(f"{shape:<16} p50={percentile(samples, 50) * 1000:7.2f} ms  p95={percentile(samples, 95) * 1000:7.2f} ms  "
+              f"avg listings={sum(returned[shape]) / len(returned[shape]):6.1f}")
+
+
+if __name__ == "__main__":
+    main()
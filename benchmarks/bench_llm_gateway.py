@@ -0,0 +1,99 @@
+"""
+Bare LLM calls vs the LLM gateway against a fake LLM that is healthy,
+flaky (errors and hangs) or down.
+
+    python -m benchmarks.bench_llm_gateway --calls 60 --users 20 --deadline 3
+
+"bare" is what the app used to do: one blocking request with no timeout.
+The gateway gets a deadline per call, LLM_MAX_CONCURRENCY-style slots,
+jittered retries, a circuit breaker and a canned fallback. Per scenario it
+prints latency percentiles, how many calls got a real answer vs the
+fallback, and the peak concurrency the LLM saw.
+"""
+import argparse
+import logging
+import threading
+import time
+
+from benchmarks.fake_llm import FakeLLM, serve_fake_llm
+from benchmarks.fixture_server import percentile
+from crawlers.llm_gateway import CircuitBreaker, LLMGateway, http_transport
+
+PROMPT = "You are a helpful assistant for a UAE property finder app. Query: hello"
+FALLBACK = "fallback"
+SCENARIOS = {
+    "healthy": dict(latency=0.4),
+    "flaky": dict(latency=0.4, error_rate=0.2, hang_rate=0.05, hang=6),
+    "down": dict(latency=0.4, down=True),
+}
+
+
+def bare_call(url):
+    send = http_transport(url)
+
+    def call():
+        try:
+            return send(PROMPT, None)
+        except Exception:
+            return FALLBACK
+    return call
+
+
+def gateway_call(url, args):
+    gateway = LLMGateway(http_transport(url), max_concurrency=args.slots, deadline=args.deadline,
+                         retries=2, retry_base=0.1, breaker=CircuitBreaker(5, 30))
+    return lambda: gateway.generate(PROMPT, fallback=lambda: FALLBACK), gateway
+
+
+def run(call, calls, users):
+    latencies, answers, lock = [], [], threading.Lock()
+    remaining = iter(range(calls))
+
+    def user():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = time.perf_counter()
+            text = call()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                answers.append(text != FALLBACK)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, answers, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS))
+    args = parser.parse_args()
+    logging.getLogger("crawlers.llm_gateway").setLevel(logging.ERROR)  # One fallback warning per call otherwise
+
+    for scenario in args.scenarios:
+        for mode in ("bare", "gateway"):
+            with serve_fake_llm(FakeLLM(**SCENARIOS[scenario])) as (url, llm):
+                call, gateway = (bare_call(url), None) if mode == "bare" else gateway_call(url, args)
+                latencies, answers, wall = run(call, args.calls, args.users)
+            extra = ""
+            if gateway is not None:
+                stats = gateway.snapshot()
+                extra = (f"  retries={stats['retries']} timeouts={stats['timeouts']} "
+                         f"short_circuited={stats['short_circuited']} saturated={stats['saturated']}")
+            print(f"{scenario:<8} {mode:<8} p50={percentile(latencies, 50):5.2f}s "
+                  f"p95={percentile(latencies, 95):5.2f}s max={max(latencies):5.2f}s  "
+                  f"answered={sum(answers)}/{len(answers)}  llm peak in-flight={llm.stats['peak_in_flight']}  "
+                  f"wall={wall:5.1f}s{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Price normalisation: accuracy over the labelled corpus in
+benchmarks/price_corpus.jsonl, and throughput by batch size for the old
+per-string parser, normalize_price (same grammar, one string at a time)
+and normalize_prices (vectorised over the batch).
+
+    python -m benchmarks.bench_prices
+    python -m benchmarks.bench_prices --sizes 25 1000 100000 --reps 5
+
+Each corpus row labels price_aed, period and confident (plus
+price_per_sqft when it gives an area); a row counts as correct when every
+labelled field matches. The old parser only knew amount and period, so it
+is scored on those two. Throughput batches are corpus prices with their
+amounts varied, so the regexes see realistic text rather than repeats.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+from benchmarks.fixture_server import percentile
+from crawlers.listing import Listing, normalize_listings
+from crawlers.prices import PRICE_BATCH_MIN, normalize_price, normalize_prices, price_per_sqft
+
+CORPUS = os.path.join(os.path.dirname(__file__), "price_corpus.jsonl")
+
+_OLD_PRICE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(k|m|mn|million)?\b", re.I)
+_OLD_THOUSANDS_RE = re.compile(r"(?<=\d),(?=\d{3})")
+_OLD_MONTHLY_RE = re.compile(r"\b(?:month|monthly|mo|pm)\b")
+_OLD_YEARLY_RE = re.compile(r"\b(?:year|yearly|yr|annual|annually|pa)\b")
+
+
+def old_parse_price(text):
+    """crawlers.listing.parse_price before the normalisation engine"""
+    text = (text or "").lower()
+    if "," in text:
+        text = _OLD_THOUSANDS_RE.sub("", text)
+    match = _OLD_PRICE_RE.search(text)
+    if not match:
+        return None, None
+    amount = float(match.group(1))
+    unit = (match.group(2) or "").lower()
+    if unit == "k":
+        amount *= 1_000
+    elif unit:
+        amount *= 1_000_000
+    period = None
+    if ("mo" in text or "pm" in text) and _OLD_MONTHLY_RE.search(text):
+        period = "monthly"
+    elif ("y" in text or "pa" in text) and _OLD_YEARLY_RE.search(text):
+        period = "yearly"
+    return int(amount), period
+
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def score(name, corpus, results, fields):
+    correct, misses = 0, []
+    for row, got in zip(corpus, results):
+        expected = {k: v for k, v in row["expected"].items() if k in fields}
+        if all(got.get(k) == v for k, v in expected.items()):
+            correct += 1
+        else:
+            misses.append(row["price"])
+    print(f"{name:<18} acc={correct / len(corpus):6.1%}" + (f"  misses: {misses[:6]}" if misses else ""))
+
+
+def accuracy(corpus):
+    prices = [row["price"] for row in corpus]
+    areas = [row.get("area_sqft") for row in corpus]
+    scalar = []
+    for price, area in zip(prices, areas):
+        aed, period, confident = normalize_price(price)
+        scalar.append({"price_aed": aed, "period": period, "confident": confident,
+                       "price_per_sqft": price_per_sqft(aed, period, area)})
+    frame = normalize_prices(prices, areas)
+    vectorised = [{"price_aed": None if aed is None else int(aed), "period": period, "confident": confident,
+                   "price_per_sqft": None if per_sqft != per_sqft else per_sqft}
+                  for aed, period, confident, per_sqft in zip(frame["price_aed"].to_numpy(dtype=object, na_value=None),
+                                                              frame["period"], frame["confident"].tolist(),
+                                                              frame["price_per_sqft"].tolist())]
+    old = [dict(zip(("price_aed", "period"), old_parse_price(price))) for price in prices]
+    print(f"{len(corpus)} labelled prices")
+    score("old parser", corpus, old, ("price_aed", "period"))
+    score("normalize_price", corpus, scalar, ("price_aed", "period", "confident", "price_per_sqft"))
+    score("normalize_prices", corpus, vectorised, ("price_aed", "period", "confident", "price_per_sqft"))
+    disagree = sum(a != b for a, b in zip(scalar, vectorised))
+    print(f"scalar vs vectorised disagree on {disagree} rows")
+
+
+def batch(corpus, size, rng):
+    prices = []
+    for _ in range(size):
+        text = rng.choice(corpus)["price"]
+        prices.append(re.sub(r"\d", lambda _: str(rng.randrange(10)), text))
+    return prices
+
+
+def throughput(corpus, sizes, reps):
+    rng = random.Random(3)
+    print(f"\nthroughput (p50 of {reps}; normalize_listings goes vectorised from {PRICE_BATCH_MIN} rows)")
+    for size in sizes:
+        prices = batch(corpus, size, rng)
+        paths = {
+            "old parser": lambda: [old_parse_price(p) for p in prices],
+            "normalize_price": lambda: [normalize_price(p) for p in prices],
+            "normalize_prices": lambda: normalize_prices(prices),
+            "normalize_listings": lambda: normalize_listings([Listing(p, p, "Dubai") for p in prices]),
+        }
+        normalize_prices(prices[:10])  # Imports and regex compilation out of the timings
+        line = []
+        for name, run in paths.items():
+            samples = []
+            for _ in range(reps):
+                start = time.perf_counter()
+                run()
+                samples.append(time.perf_counter() - start)
+            p50 = percentile(samples, 50)
+            line.append(f"{name} {p50 * 1000:8.2f} ms ({size / p50 / 1e6:5.2f} M/s)")
+        print(f"{size:>7,} rows  " + "  ".join(line))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 1_000, 10_000, 100_000])
+    parser.add_argument("--reps", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    accuracy(corpus)
+    throughput(corpus, args.sizes, args.reps)
+
+
+if __name__ == "__main__":
+    main()
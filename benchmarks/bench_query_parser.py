@@ -0,0 +1,77 @@
+"""
+Accuracy and latency of query understanding over the labelled corpus in
+benchmarks/query_corpus.jsonl, for the rule parser, the Gemini path and
+the hybrid (rules first, Gemini below the confidence threshold).
+
+    python -m benchmarks.bench_query_parser            # all three paths
+    python -m benchmarks.bench_query_parser --no-llm   # rules only, offline
+
+Each corpus row labels only the fields it cares about; a query counts as
+correct when every labelled field matches.
+"""
+import argparse
+import json
+import os
+import time
+
+from benchmarks.fixture_server import percentile
+from crawlers.query_parser import parse_query
+from crawlers.query_spec import RULE_CONFIDENCE_THRESHOLD, QuerySpec, _llm_extract
+
+CORPUS = os.path.join(os.path.dirname(__file__), "query_corpus.jsonl")
+
+
+def load_corpus(path=CORPUS):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def rule_path(query):
+    return parse_query(query)[0]
+
+
+def llm_path(query):
+    data = _llm_extract(query)
+    return QuerySpec.from_dict(data, query) if data else QuerySpec()
+
+
+def hybrid_path(query, threshold):
+    spec, confidence = parse_query(query)
+    return spec if confidence >= threshold else llm_path(query)
+
+
+def evaluate(name, corpus, extract):
+    correct, field_hits, field_total, latencies = 0, 0, 0, []
+    for row in corpus:
+        start = time.perf_counter()
+        spec = extract(row["query"])
+        latencies.append(time.perf_counter() - start)
+
+        got = spec.to_dict()
+        hits = sum(got.get(k) == v for k, v in row["expected"].items())
+        field_hits += hits
+        field_total += len(row["expected"])
+        correct += hits == len(row["expected"])
+
+    print(f"{name:<8} query acc={correct / len(corpus):6.1%}  field acc={field_hits / max(field_total, 1):6.1%}  "
+          f"p50={percentile(latencies, 50) * 1000:9.3f} ms  p95={percentile(latencies, 95) * 1000:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--no-llm", action="store_true", help="skip the Gemini and hybrid paths")
+    parser.add_argument("--threshold", type=float, default=RULE_CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    print(f"{len(corpus)} labelled queries, hybrid threshold {args.threshold}")
+    evaluate("rules", corpus, rule_path)
+    fallbacks = sum(parse_query(row["query"])[1] < args.threshold for row in corpus)
+    print(f"         hybrid would consult Gemini for {fallbacks}/{len(corpus)} queries")
+    if not args.no_llm:
+        evaluate("llm", corpus, llm_path)
+        evaluate("hybrid", corpus, lambda q: hybrid_path(q, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Time-to-first-result of backend.search_stream against the blocking
+backend.search_all_properties, with one fast and one slow source.
+
+    python -m benchmarks.bench_stream --fast 0.5 --slow 5 --pages 3 --reps 3
+
+The real crawlers are swapped for fixture crawlers that fetch `pages`
+fixture result pages each (with the given per-page delay) and report every
+page through `on_page`, like the real ones do. No browsers start and no
+portal is contacted; the result cache is cleared before every run.
+"""
+import argparse
+import asyncio
+import time
+
+import backend
+from benchmarks.fixture_server import percentile, serve_fixtures
+from crawlers.result_cache import get_result_cache
+from crawlers.structured_data import fetch_structured
+
+QUERY = "apartments for rent in dubai"
+
+
+def fixture_crawlers(base, fast, slow, pages):
+    def make(path, site_key, delay, seed):
+        def crawl(query, spec=None, cancel=None, on_page=None):
+            results = []
+            for page in range(1, pages + 1):
+                if cancel is not None and cancel.is_set():
+                    break
+                found = fetch_structured(f"{base}/{path}/search?cards=25&seed={seed + page}&delay={delay}",
+                                         site_key, timeout=delay + 10)
+                if on_page and found:
+                    on_page(found)
+                results.extend(found)
+            return results
+        return crawl
+    return [("Property Finder", make("propertyfinder", "property_finder", fast, 100)),
+            ("Find Properties", make("findproperties", "find_properties", slow, 200))]
+
+
+async def stream_once():
+    start = time.perf_counter()
+    first, batches, listings = None, 0, 0
+    async for batch in backend.search_stream(QUERY):
+        if first is None:
+            first = time.perf_counter() - start
+        batches += 1
+        listings += len(batch)
+    return first, time.perf_counter() - start, batches, listings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fast", type=float, default=0.5, help="per-page delay of the fast source (s)")
+    parser.add_argument("--slow", type=float, default=5.0, help="per-page delay of the slow source (s)")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--reps", type=int, default=3)
+    args = parser.parse_args()
+
+    with serve_fixtures() as base:
+        backend.CRAWLERS = fixture_crawlers(base, args.fast, args.slow, args.pages)
+        backend.STORE_FIRST = False  # Every rep must crawl
+        blocking, first, total = [], [], []
+        for _ in range(args.reps):
+            get_result_cache().clear()
+            start = time.perf_counter()
+            count = len(backend.search_all_properties(QUERY))
+            blocking.append(time.perf_counter() - start)
+
+            get_result_cache().clear()
+            first_at, total_at, batches, listings = asyncio.run(stream_once())
+            first.append(first_at)
+            total.append(total_at)
+
+    print(f"search_all_properties  first result p50={percentile(blocking, 50):.2f}s  ({count} listings)")
+    print(f"search_stream          first result p50={percentile(first, 50):.2f}s  "
+          f"complete p50={percentile(total, 50):.2f}s  ({listings} listings in {batches} batches)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Listing extraction time: embedded-JSON engine vs the DOM scrapers, on
+saved result pages.
+
+    python -m benchmarks.bench_structured_data --cards 25 --reps 50
+    python -m benchmarks.bench_structured_data --pages saved/   # real pages
+    python -m benchmarks.bench_structured_data --http           # + browser-free fetch
+
+Saved pages are matched to a site by file-name prefix (property_finder*.html,
+find_properties*.html, bayut*.html). Without --pages the fixture pages are
+generated in memory. The DOM path is timed on the same HTML, so it includes
+HTML parsing (parse_html, default backend) just as the crawlers do.
+"""
+import argparse
+import glob
+import os
+import time
+
+from benchmarks.fixture_server import RENDERERS, generate_listings, percentile, serve_fixtures
+from crawlers.bayut import BayutCrawler
+from crawlers.find_properties import extract_properties
+from crawlers.html_parser import parse_html
+from crawlers.property_finder import extract_properties_enhanced
+from crawlers.structured_data import extract_structured, fetch_structured
+
+SITES = {"property_finder": "propertyfinder", "find_properties": "findproperties", "bayut": "bayut"}
+URL = "https://example.invalid/search"
+
+# BayutCrawler() probes proxies on construction; the parsers don't need that
+_bayut = BayutCrawler.__new__(BayutCrawler)
+
+DOM_PATHS = {
+    "property_finder": lambda html: extract_properties_enhanced(parse_html(html), URL),
+    "find_properties": lambda html: extract_properties(parse_html(html), URL),
+    "bayut": _bayut.parse_dom,
+}
+
+
+def load_pages(pages_dir, cards):
+    if not pages_dir:
+        listings = generate_listings(cards)
+        return [(site, f"fixture-{cards}", RENDERERS[path](listings)) for site, path in SITES.items()]
+    pages = []
+    for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+        name = os.path.basename(path)
+        site = next((s for s in SITES if name.startswith(s)), None)
+        if site:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((site, name, f.read()))
+    return pages
+
+
+def time_it(fn, html, reps):
+    samples, results = [], []
+    for _ in range(reps):
+        start = time.perf_counter()
+        results = fn(html)
+        samples.append(time.perf_counter() - start)
+    return samples, len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of saved result pages")
+    parser.add_argument("--cards", type=int, default=25)
+    parser.add_argument("--reps", type=int, default=50)
+    parser.add_argument("--http", action="store_true", help="also time fetch_structured against the fixture server")
+    args = parser.parse_args()
+
+    for site, name, html in load_pages(args.pages, args.cards):
+        dom, dom_count = time_it(DOM_PATHS[site], html, args.reps)
+        json_, json_count = time_it(lambda h: extract_structured(h, site, URL), html, args.reps)
+        dom_p50, json_p50 = percentile(dom, 50), percentile(json_, 50)
+        # The DOM scrapers cap their card count; compare per listing as well
+        dom_each, json_each = dom_p50 / max(dom_count, 1), json_p50 / max(json_count, 1)
+        print(f"{site:<16} {name:<24} dom p50={dom_p50 * 1000:7.2f} ms ({dom_count:>3} listings)  "
+              f"json p50={json_p50 * 1000:7.2f} ms ({json_count:>3} listings)  "
+              f"per-listing speedup={dom_each / json_each if json_each else float('inf'):6.1f}x")
+
+    if args.http:
+        with serve_fixtures() as base:
+            for site, path in SITES.items():
+                samples, count = time_it(lambda url: fetch_structured(url, site),
+                                         f"{base}/{path}/search?cards={args.cards}", args.reps)
+                print(f"{site:<16} http-only fetch+extract p50={percentile(samples, 50) * 1000:7.2f} ms "
+                      f"p95={percentile(samples, 95) * 1000:7.2f} ms ({count} listings)")
+
+
+if __name__ == "__main__":
+    main()
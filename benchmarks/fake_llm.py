@@ -0,0 +1,149 @@
+"""
+Local stand-in for the LLM: POST /generate {"prompt": ...} → {"text": ...}.
+Point the gateway at it with LLM_ENDPOINT=<base>/generate.
+
+    python -m benchmarks.fake_llm --latency 0.8 --error-rate 0.1 --hang-rate 0.05
+
+Behaviour is set per server (and can be changed while it runs through
+`FakeLLM.configure`):
+    latency     mean seconds per answer, ±50% uniform jitter
+    error_rate  fraction of requests answered with HTTP 500
+    hang_rate   fraction of requests that stall for `hang` seconds
+    down        every request fails with HTTP 503
+    malformed_rate  fraction of JSON answers that are broken (prose around
+                    them, a missing field, a word where a number belongs)
+
+Query-spec prompts ("Return only JSON") get a JSON spec back, bare when the
+request carries a schema and wrapped in a ```json fence otherwise; anything
+else gets a one-line chat answer. Repair prompts ("was rejected") are always
+answered correctly. `stats` counts requests, errors, hangs and the peak
+number of requests in flight.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SPEC_ANSWER = {"purpose": "rent", "location": "dubai marina", "city": "dubai", "property_type": "apartment",
+               "bedrooms": 2, "bathrooms": None, "min_price": None, "max_price": 120000,
+               "budget_period": None}
+
+
+class FakeLLM:
+    def __init__(self, latency: float = 0.5, error_rate: float = 0.0, hang_rate: float = 0.0,
+                 hang: float = 30.0, down: bool = False, malformed_rate: float = 0.0, seed: int = 7):
+        self.configure(latency=latency, error_rate=error_rate, hang_rate=hang_rate, hang=hang, down=down,
+                       malformed_rate=malformed_rate)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "errors": 0, "hangs": 0, "malformed": 0, "peak_in_flight": 0}
+
+    def configure(self, **settings):
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+    def answer(self, prompt: str, schema=None):
+        """(status, body) for one request, after the simulated delay"""
+        with self.lock:
+            self.stats["requests"] += 1
+            self.in_flight += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+            roll, jitter, broken = self.rng.random(), self.rng.uniform(0.5, 1.5), self.rng.random()
+        try:
+            if self.down:
+                return 503, {"error": "unavailable"}
+            if roll < self.hang_rate:
+                with self.lock:
+                    self.stats["hangs"] += 1
+                time.sleep(self.hang)
+            else:
+                time.sleep(self.latency * jitter)
+            if roll >= 1 - self.error_rate:
+                with self.lock:
+                    self.stats["errors"] += 1
+                return 500, {"error": "internal"}
+            if "Return only" in prompt and "JSON" in prompt:
+                return 200, {"text": self.spec_text(prompt, schema, broken)}
+            return 200, {"text": "Happy to help! Tell me the area, budget and number of bedrooms you need."}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+    def spec_text(self, prompt: str, schema, broken: float) -> str:
+        if broken < self.malformed_rate and "was rejected" not in prompt:
+            with self.lock:
+                self.stats["malformed"] += 1
+            answer = dict(SPEC_ANSWER)
+            kind = int(broken / self.malformed_rate * 3)
+            if kind == 0:
+                return f"Sure! Here are the parameters: {json.dumps(answer)}"
+            if kind == 1:
+                del answer["city"]
+            else:
+                answer["bedrooms"] = "two"
+            return json.dumps(answer)
+        text = json.dumps(SPEC_ANSWER)
+        return text if schema else f"```json\n{text}\n```"
+
+
+def make_handler(llm: FakeLLM):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                request = {}
+            status, body = llm.answer(request.get("prompt", ""), request.get("schema"))
+            payload = json.dumps(body).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client gave up (deadline) before we answered
+    return Handler
+
+
+@contextmanager
+def serve_fake_llm(llm: FakeLLM = None, host: str = "127.0.0.1", port: int = 0):
+    """Run a fake LLM on a background thread; yields (generate URL, FakeLLM)"""
+    llm = llm or FakeLLM()
+    server = ThreadingHTTPServer((host, port), make_handler(llm))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}/generate", llm
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeLLM(latency=args.latency, error_rate=args.error_rate, hang_rate=args.hang_rate,
+                   malformed_rate=args.malformed_rate)
+    with serve_fake_llm(fake, port=args.port) as (url, _):
+        print(f"Fake LLM at {url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,210 @@
+"""
+Local HTTP server serving synthetic search-result pages shaped like the
+sites we crawl, so benchmarks never touch the real portals.
+
+    with serve_fixtures() as base_url:
+        driver.get(f"{base_url}/propertyfinder/search?cards=25&delay=0.3")
+
+Query parameters understood by every page:
+    cards   number of listing cards to render (default 25)
+    delay   seconds to sleep before responding (simulated server latency)
+    seed    listing generator seed (default 7); vary it for distinct pages
+    json    1 (default) to embed the result set the way each portal does
+            (__NEXT_DATA__, JSON-LD, window.state); 0 for DOM-only pages
+
+Pages pull in the same kind of weight the real portals do: a web font,
+an analytics script and one gallery image per card, all served from
+/static/ with realistic sizes.
+"""
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+AREAS = ["Dubai Marina", "Downtown Dubai", "JBR", "Business Bay", "JVC", "Al Barsha", "Deira"]
+TYPES = ["Apartment", "Villa", "Studio", "Penthouse", "Townhouse"]
+
+STATIC_ASSETS = {
+    ".jpg": ("image/jpeg", 60_000),
+    ".woff2": ("font/woff2", 45_000),
+    ".js": ("application/javascript", 80_000),
+}
+PAGE_HEAD = (
+    '<style>@font-face{font-family:Fx;src:url(/static/fonts/brand.woff2) format("woff2")}'
+    'body{font-family:Fx,sans-serif}</style>'
+    '<script src="/static/analytics.js"></script>'
+)
+
+
+def _listing(i: int, rng: random.Random) -> dict:
+    beds = rng.randint(0, 5)
+    return {
+        "id": 100000 + i,
+        "title": f"{'Studio' if beds == 0 else f'{beds} Bedroom'} {rng.choice(TYPES)} in {rng.choice(AREAS)}",
+        "price": rng.randrange(35_000, 900_000, 500),
+        "beds": beds,
+        "baths": max(1, beds),
+        "area": rng.randint(400, 6000),
+        "location": f"{rng.choice(AREAS)}, Dubai",
+    }
+
+
+def _script(body: str, **attrs) -> str:
+    attr_text = "".join(f' {k.replace("_", "-")}="{v}"' for k, v in attrs.items())
+    return f"<script{attr_text}>{body}</script>"
+
+
+def embed_property_finder(listings) -> str:
+    data = {"props": {"pageProps": {"searchResult": {"listings": [
+        {"listing_type": "property", "property": {
+            "id": str(l["id"]), "title": l["title"], "bedrooms": str(l["beds"]), "bathrooms": str(l["baths"]),
+            "price": {"value": l["price"], "currency": "AED", "period": "monthly"},
+            "size": {"value": l["area"], "unit": "sqft"},
+            "location": {"full_name": l["location"]},
+            "share_url": f"https://www.propertyfinder.ae/en/plp/rent/{l['id']}.html",
+        }} for l in listings]}}}, "page": "/search"}
+    return _script(json.dumps(data), id="__NEXT_DATA__", type="application/json")
+
+
+def embed_find_properties(listings) -> str:
+    data = {"@context": "https://schema.org", "@type": "ItemList", "itemListElement": [
+        {"@type": "ListItem", "position": i + 1, "item": {
+            "@type": "Apartment", "name": l["title"], "url": f"/property/{l['id']}",
+            "numberOfRooms": l["beds"], "numberOfBathroomsTotal": l["baths"],
+            "floorSize": {"@type": "QuantitativeValue", "value": l["area"]},
+            "address": {"@type": "PostalAddress", "addressLocality": l["location"]},
+            "offers": {"@type": "Offer", "price": l["price"], "priceCurrency": "AED"},
+        }} for i, l in enumerate(listings)]}
+    return _script(json.dumps(data), type="application/ld+json")
+
+
+def embed_bayut(listings) -> str:
+    hits = [{
+        "externalID": str(l["id"]), "title": l["title"], "price": l["price"], "rentFrequency": "yearly",
+        "rooms": l["beds"], "baths": l["baths"], "area": l["area"],
+        "location": [{"name": "UAE"}, {"name": "Dubai"}, {"name": l["location"].split(",")[0]}],
+    } for l in listings]
+    return _script("window.state = " + json.dumps({"algolia": {"content": {"hits": hits, "nbHits": len(hits)}}}) + ";")
+
+
+def render_property_finder(listings, embed: bool = True) -> str:
+    cards = "".join(
+        f'<article data-testid="property-card"><a href="/en/plp/rent/{l["id"]}.html">'
+        f'<h2>{l["title"]}</h2></a><p>AED {l["price"]:,} per month</p>'
+        f'<p>{l["beds"]} Beds {l["baths"]} Baths {l["area"]:,} sqft</p><span>{l["location"]}</span>'
+        f'<img src="/static/img/{l["id"]}.jpg"></article>'
+        for l in listings
+    )
+    state = embed_property_finder(listings) if embed else ""
+    return f"<html><head><title>Property Finder</title>{PAGE_HEAD}</head><body><main>{cards}</main>{state}</body></html>"
+
+
+def render_find_properties(listings, embed: bool = True) -> str:
+    cards = "".join(
+        f'<div class="property-card"><h3>{l["title"]}</h3><div class="price">AED {l["price"]:,}</div>'
+        f'<div>{l["location"]}</div><a href="/property/{l["id"]}">View</a>'
+        f'<img src="/static/img/fp-{l["id"]}.jpg"></div>'
+        for l in listings
+    )
+    state = embed_find_properties(listings) if embed else ""
+    return f"<html><head><title>Find Properties</title>{PAGE_HEAD}{state}</head><body>{cards}</body></html>"
+
+
+def render_bayut(listings, embed: bool = True) -> str:
+    cards = "".join(
+        f'<article data-testid="listing-card"><a href="/property/details-{l["id"]}.html" title="{l["title"]}">'
+        f'<h2>{l["title"]}</h2></a><div class="property-price"><span>AED</span> <span>{l["price"]:,}</span></div>'
+        f'<div class="location">{l["location"]}</div><span>{l["beds"]} Beds</span> <span>{l["baths"]} Baths</span> '
+        f'<span>{l["area"]:,} sqft</span><img src="/static/img/b-{l["id"]}.jpg"></article>'
+        for l in listings
+    )
+    state = embed_bayut(listings) if embed else ""
+    return f"<html><head><title>Bayut</title>{PAGE_HEAD}{state}</head><body>{cards}</body></html>"
+
+
+RENDERERS = {
+    "propertyfinder": render_property_finder,
+    "findproperties": render_find_properties,
+    "bayut": render_bayut,
+}
+
+
+def generate_listings(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [_listing(i, rng) for i in range(count)]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        qs = parse_qs(parsed.query)
+        delay = float(qs.get("delay", ["0"])[0])
+        cards = int(qs.get("cards", ["25"])[0])
+        embed = qs.get("json", ["1"])[0] != "0"
+        seed = int(qs.get("seed", ["7"])[0])
+        site = parsed.path.strip("/").split("/")[0]
+
+        if site == "static":
+            self._send_static(parsed.path)
+            return
+
+        renderer = RENDERERS.get(site)
+        if renderer is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        if delay:
+            time.sleep(delay)
+        self._send(renderer(generate_listings(cards, seed), embed).encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_static(self, path):
+        ext = path[path.rfind("."):]
+        content_type, size = STATIC_ASSETS.get(ext, ("application/octet-stream", 1_000))
+        body = b"/* analytics */" + b" " * size if ext == ".js" else b"\0" * size
+        self._send(body, content_type)
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@contextmanager
+def serve_fixtures(host: str = "127.0.0.1", port: int = 0):
+    """Run the fixture server on a background thread and yield its base URL"""
+    server = ThreadingHTTPServer((host, port), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+if __name__ == "__main__":
+    with serve_fixtures(port=8765) as base:
+        print(f"Serving fixtures at {base} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,82 @@
+"""
+Fire N simultaneous identical searches through backend.search_all_properties
+and count how many crawls actually run, with and without singleflight.
+
+    python -m benchmarks.load_singleflight --users 50 --delay 2
+
+The real crawlers are swapped for fixture crawlers that fetch the fixture
+result pages over HTTP (with `delay` seconds of simulated crawl time), so
+no browsers start and no portal is contacted. The result cache is cleared
+before each run so every caller starts on a miss.
+"""
+import argparse
+import threading
+import time
+from collections import Counter
+
+import backend
+from benchmarks.fixture_server import percentile, serve_fixtures
+from crawlers.result_cache import get_result_cache
+from crawlers.structured_data import fetch_structured
+
+QUERY = "apartments for rent in dubai"
+SOURCES = [("Property Finder", "propertyfinder", "property_finder"),
+           ("Find Properties", "findproperties", "find_properties")]
+
+
+def fixture_crawlers(base, delay, crawls: Counter, lock: threading.Lock):
+    def make(name, path, site_key):
+        def crawl(query, spec=None, cancel=None, on_page=None):
+            with lock:
+                crawls[name] += 1
+            return fetch_structured(f"{base}/{path}/search?cards=25&delay={delay}", site_key, timeout=delay + 10)
+        return crawl
+    return [(name, make(name, path, key)) for name, path, key in SOURCES]
+
+
+def run(users, coalesce, base, delay):
+    crawls, lock = Counter(), threading.Lock()
+    backend.CRAWLERS = fixture_crawlers(base, delay, crawls, lock)
+    backend.SINGLEFLIGHT = coalesce
+    backend.STORE_FIRST = False  # Every search must reach the crawlers
+    get_result_cache().clear()
+
+    barrier = threading.Barrier(users)
+    latencies, counts = [], []
+
+    def user():
+        barrier.wait()
+        start = time.perf_counter()
+        results = backend.search_all_properties(QUERY)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            counts.append(len(results))
+
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return crawls, latencies, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=2.0, help="simulated crawl time per source (s)")
+    args = parser.parse_args()
+
+    with serve_fixtures() as base:
+        for coalesce in (False, True):
+            before = backend.search_flight_stats()
+            crawls, latencies, counts = run(args.users, coalesce, base, args.delay)
+            after = backend.search_flight_stats()
+            print(f"singleflight={'on ' if coalesce else 'off'}  users={args.users}  "
+                  f"crawls run={sum(crawls.values())} ({dict(crawls)})  "
+                  f"latency p50={percentile(latencies, 50):.2f}s p95={percentile(latencies, 95):.2f}s  "
+                  f"results/user={sorted(set(counts))}  "
+                  f"coalesced={after['coalesced'] - before['coalesced']}")
+
+
+if __name__ == "__main__":
+    main()
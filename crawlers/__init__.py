@@ -1,5 +1,18 @@
 # crawlers/__init__.py
-from .property_finder import crawl_property_finder
-from .find_properties import crawl_find_properties
+# Crawlers load on first attribute access, so importing any crawlers.* helper
+# doesn't drag in every site module.
+import importlib
 
-__all__ = ['crawl_property_finder', 'crawl_find_properties']
\ No newline at end of file
+_EXPORTS = {
+    'crawl_property_finder': '.property_finder',
+    'crawl_find_properties': '.find_properties',
+}
+
+__all__ = ['crawl_property_finder', 'crawl_find_properties']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
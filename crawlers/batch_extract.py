@@ -0,0 +1,72 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Read every card in one execute_script call instead of a find_element per field.
+# Set BATCH_EXTRACT=0 to fall back to the per-element WebDriver walk.
+BATCH_EXTRACT = os.getenv("BATCH_EXTRACT", "1") not in ("0", "false", "no")
+
+# Field spec, per field name:
+#   {"try": [[selector, attr], ...], "min_len": 0}
+# selector: CSS, "xpath:<expr>" relative to the card, or "self" for the card
+# attr:     None for innerText (what WebElement.text returns), "href" for the
+#           resolved link, anything else for getAttribute
+# The first value longer than min_len wins; "" when none does.
+CARD_EXTRACT_JS = """
+var cfg = arguments[0];
+function pick(card, sel) {
+  if (sel === 'self') return card;
+  try {
+    if (sel.indexOf('xpath:') === 0) {
+      return document.evaluate(sel.slice(6), card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return card.querySelector(sel);
+  } catch (e) { return null; }
+}
+function read(el, attr) {
+  if (!el) return '';
+  var v = !attr ? el.innerText : (attr === 'href' ? el.href : el.getAttribute(attr));
+  return (v || '').trim();
+}
+var cards = [], used = null;
+for (var i = 0; i < cfg.cards.length; i++) {
+  var found;
+  try { found = document.querySelectorAll(cfg.cards[i]); } catch (e) { continue; }
+  if (found.length) { cards = found; used = cfg.cards[i]; }
+  if (found.length >= cfg.minCards) break;
+}
+var limit = cfg.limit ? Math.min(cards.length, cfg.limit) : cards.length, out = [];
+for (var c = 0; c < limit; c++) {
+  var card = cards[c], row = {_text: (card.innerText || '').trim(), _tag: card.tagName.toLowerCase()};
+  for (var name in cfg.fields) {
+    var spec = cfg.fields[name], value = '';
+    for (var j = 0; j < spec.try.length && !value; j++) {
+      var v = read(pick(card, spec.try[j][0]), spec.try[j][1]);
+      if (v.length > (spec.min_len || 0)) value = v;
+    }
+    row[name] = value;
+  }
+  out.push(row);
+}
+return {selector: used, cards: out};
+"""
+
+
+def extract_cards(driver, card_selectors: Sequence[str], fields: Dict[str, Dict[str, Any]],
+                  min_cards: int = 1, limit: Optional[int] = None) -> Tuple[Optional[str], List[Dict[str, str]]]:
+    """
+    Read all listing cards in a single WebDriver round-trip. Card selectors
+    are tried in order and the first one matching at least `min_cards`
+    elements is used (else the last one that matched anything). Returns
+    (selector used, rows); each row holds the requested fields plus the
+    card's `_text` and `_tag`.
+    """
+    config = {"cards": list(card_selectors), "fields": fields, "minCards": min_cards, "limit": limit or 0}
+    try:
+        result = driver.execute_script(CARD_EXTRACT_JS, config) or {}
+        return result.get("selector"), result.get("cards") or []
+    except Exception as e:
+        logger.warning(f"⚠️ Batched card extraction failed: {e}")
+        return None, []
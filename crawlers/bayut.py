@@ -1,19 +1,19 @@
 import requests
 import time
-import os
 import re
 import json
 import random
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-import google.generativeai as genai
 import urllib3
 
+from .html_parser import parse_html
+from .listing import Listing
+from .query_spec import QuerySpec, extract_query_spec
+from .structured_data import extract_structured
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-load_dotenv()
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+BAYUT_TYPES = {"apartment": "apartments", "studio": "apartments", "villa": "villas",
+               "townhouse": "townhouses", "penthouse": "penthouses", "office": "offices"}
 
 PROXY_CONFIGS = [
     {
@@ -82,17 +82,15 @@ class BayutCrawler:
         print("⚠️  No proxy working. Using direct connection.")
         return False
 
-    def extract_query_params(self, query):
-        prompt = f"Extract JSON: location, property_type, bedrooms, max_price, purpose from '{query}'"
-        try:
-            response = gemini_model.generate_content(prompt)
-            text = response.text.strip()
-            if "```json" in text: text = text.split("```json")[1].split("```")[0]
-            params = json.loads(text)
-            params["purpose"] = "to-rent" if params.get("purpose") == "rent" else "for-sale"
-            return params
-        except:
-            return {"location": "dubai", "property_type": "apartment", "purpose": "to-rent"}
+    def params_from_spec(self, spec: QuerySpec):
+        """Map the shared QuerySpec onto Bayut URL parameters"""
+        return {
+            "location": spec.location,
+            "property_type": BAYUT_TYPES.get(spec.property_type, "property"),
+            "bedrooms": spec.bedrooms,
+            "max_price": spec.yearly_max_price,  # Portal rent filters are per year
+            "purpose": "to-rent" if spec.purpose == "rent" else "for-sale",
+        }
 
     def build_search_url(self, params):
         base_url = "https://www.bayut.com"
@@ -118,7 +116,7 @@ class BayutCrawler:
             response = self.session.get(url, headers=self.headers, proxies=proxies, timeout=30, verify=False)
             print(f"📡 Status: {response.status_code} | Via {'Proxy' if proxies else 'Direct'}")
             if response.status_code == 200:
-                return self.parse_properties(response.text)
+                return self.parse_properties(response.text, url)
             elif response.status_code in [403, 429]:
                 print("🚫 Blocked! Switching to direct.")
                 return self.scrape_direct_fallback(url)
@@ -133,20 +131,28 @@ class BayutCrawler:
             time.sleep(5)
             response = self.session.get(url, headers=self.headers, timeout=30, verify=False)
             if response.status_code == 200:
-                return self.parse_properties(response.text)
+                return self.parse_properties(response.text, url)
         except:
             pass
         return []
 
-    def parse_properties(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+    def parse_properties(self, html, url="https://www.bayut.com"):
+        # Listings shipped as embedded JSON (window.state / JSON-LD) need no DOM walk
+        structured = extract_structured(html, "bayut", url)
+        if structured:
+            return structured[:10]
+        return self.parse_dom(html)
 
+    def parse_dom(self, html):
+        return self.extract_page(parse_html(html))
+
+    def extract_page(self, page):
         # Extract JSON-LD data
-        script = soup.find("script", {"type": "application/ld+json"})
+        script = page.select_one('script[type="application/ld+json"]')
         json_data = {}
         if script:
             try:
-                data = json.loads(script.string)
+                data = json.loads(script.text())
                 if isinstance(data, list):
                     for item in data:
                         if item.get("url"):
@@ -155,89 +161,92 @@ class BayutCrawler:
                 pass
 
         # Find cards
-        cards = soup.select('article[data-testid="property-card"], [class*="card"]')
+        cards = page.select('article[data-testid="property-card"], [class*="card"]')
         if not cards:
             print("🔧 Fallback: searching by keywords...")
-            cards = soup.find_all(string=re.compile("AED|Bed|Bath", re.I))
-            cards = [c.find_parent('article') or c.find_parent('div') for c in cards]
+            cards = page.text_parents(re.compile("AED|Bed|Bath", re.I))
+            cards = [c.closest('article') or c.closest('div') for c in cards]
             cards = [c for c in cards if c]
 
         properties = []
         for card in cards[:10]:
             try:
                 prop = self.extract_property(card, json_data)
-                if prop and "Not found" not in prop["title"]:
+                if prop and "Not found" not in prop.title:
                     properties.append(prop)
             except:
                 continue
         return properties
 
     def extract_property(self, card, json_data):
-        soup = BeautifulSoup(str(card), 'html.parser')
-        link_tag = soup.find('a', href=True)
-        link = link_tag['href'] if link_tag else "#"
+        link_tag = card.select_one('a[href]')
+        link = link_tag.attr('href') if link_tag else "#"
         link = link if link.startswith("http") else "https://www.bayut.com" + link
 
         # Use JSON-LD if available
         if link in json_data:
             data = json_data[link]
-            price_tag = soup.find(string=re.compile(r'AED', re.I))
-            price = price_tag.parent.get_text(strip=True) if price_tag else "AED Price on Request"
-            return {
-                "title": data.get("name", "Not found"),
-                "price": price,
-                "location": data["address"].get("addressLocality", "UAE"),
-                "bedrooms": data["numberOfRooms"]["value"] if isinstance(data["numberOfRooms"], dict) else "N/A",
-                "bathrooms": data.get("numberOfBathroomsTotal", "N/A"),
-                "area": data["floorSize"]["value"].replace(",", "") if isinstance(data["floorSize"], dict) else "N/A",
-                "link": link,
-                "image": data.get("image", "Not found"),
-                "description": f"{data['numberOfRooms']['value']} Bed | {data.get('numberOfBathroomsTotal', 'N/A')} Bath | {data['floorSize']['value']} sqft"
-            }
+            price_tag = card.text_parents(re.compile(r'AED', re.I))
+            price = price_tag[0].text(strip=True) if price_tag else "AED Price on Request"
+            return Listing.parse(
+                title=data.get("name", "Not found"),
+                price=price,
+                location=data["address"].get("addressLocality", "UAE"),
+                bedrooms=data["numberOfRooms"]["value"] if isinstance(data["numberOfRooms"], dict) else None,
+                bathrooms=data.get("numberOfBathroomsTotal"),
+                area=data["floorSize"]["value"] if isinstance(data["floorSize"], dict) else None,
+                link=link,
+                source="Bayut",
+                image=data.get("image"),
+                description=f"{data['numberOfRooms']['value']} Bed | {data.get('numberOfBathroomsTotal', 'N/A')} Bath | {data['floorSize']['value']} sqft",
+                raw=data,
+            )
 
         # Fallback parsing
-        title = self.safe_text(soup, 'h2, h3, a[href*="/property/"]')
-        price = self.safe_text(soup, '[data-testid*="price"], *:contains("AED")') or "AED Price on Request"
-        location = self.safe_text(soup, '*:contains("Dubai")|*:contains("JBR")') or "Dubai"
-        text = soup.get_text()
+        title = self.safe_text(card, 'h2, h3, a[href*="/property/"]')
+        price = self.safe_text(card, '[data-testid*="price"], *:contains("AED")') or "AED Price on Request"
+        location = self.safe_text(card, '*:contains("Dubai")|*:contains("JBR")') or "Dubai"
+        text = card.text()
         beds = re.search(r'(\d+)\s*bed', text, re.I)
         baths = re.search(r'(\d+)\s*bath', text, re.I)
         area = re.search(r'(\d{1,4}(?:,\d{3})*)\s*sq\.?\s*ft', text, re.I)
 
-        return {
-            "title": title,
-            "price": price,
-            "location": location,
-            "bedrooms": beds.group(1) if beds else "N/A",
-            "bathrooms": baths.group(1) if baths else "N/A",
-            "area": area.group(1).replace(",", "") if area else "N/A",
-            "link": link,
-            "image": self.safe_attr(soup, 'img[data-src], img[src]', 'src') or "Not found",
-            "description": f"{beds.group(1) if beds else 'N/A'} Bed | {baths.group(1) if baths else 'N/A'} Bath | {area.group(1).replace(',', '') if area else 'N/A'} sqft"
-        }
+        return Listing.parse(
+            title=title,
+            price=price,
+            location=location,
+            bedrooms=beds.group(1) if beds else None,
+            bathrooms=baths.group(1) if baths else None,
+            area=area.group(1) if area else None,
+            link=link,
+            source="Bayut",
+            image=self.safe_attr(card, 'img[data-src], img[src]', 'src'),
+            description=f"{beds.group(1) if beds else 'N/A'} Bed | {baths.group(1) if baths else 'N/A'} Bath | {area.group(1).replace(',', '') if area else 'N/A'} sqft",
+            raw=text,
+        )
 
-    def safe_text(self, soup, selector):
+    def safe_text(self, node, selector):
         try:
             if selector.startswith('*:contains'):
                 txt = selector.split('("')[1].split('")')[0]
-                match = soup.find(string=re.compile(txt, re.I))
+                match = node.find_string(re.compile(txt, re.I))
                 return match.strip() if match else "Not found"
-            el = soup.select_one(selector)
-            return el.get_text(strip=True) if el else "Not found"
+            el = node.select_one(selector)
+            return el.text(strip=True) if el else "Not found"
         except:
             return "Not found"
 
-    def safe_attr(self, soup, selector, attr):
+    def safe_attr(self, node, selector, attr):
         try:
-            el = soup.select_one(selector)
-            return el.get(attr, '') if el else "Not found"
+            el = node.select_one(selector)
+            return el.attr(attr, '') if el else "Not found"
         except:
             return "Not found"
 
-    def search_properties(self, query):
+    def search_properties(self, query, spec=None):
         print(f"\n🚀 SEARCHING: '{query}'")
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        params = self.extract_query_params(query)
+        params = self.params_from_spec(spec or extract_query_spec(query))
         url = self.build_search_url(params)
         print(f"🔗 URL: {url}")
         results = self.scrape_properties(url)
@@ -250,18 +259,18 @@ class BayutCrawler:
             return
         print(f"\n🎯 Found {len(results)} properties:\n")
         for i, p in enumerate(results, 1):
-            print(f"📌 [{i}] {p['title']}")
-            print(f"   💵 {p['price']} | 📍 {p['location']}")
-            print(f"   🛏️  {p['description']}")
-            print(f"   🔗 {p['link']}")
-            if p['image'] != "Not found":
-                print(f"   🖼️  Image: {p['image']}")
+            print(f"📌 [{i}] {p.title}")
+            print(f"   💵 {p.price} | 📍 {p.location}")
+            print(f"   🛏️  {p.description}")
+            print(f"   🔗 {p.link}")
+            if p.image:
+                print(f"   🖼️  Image: {p.image}")
             print("   ─────────────────────────")
 
-def bayut_property_search(query):
+def bayut_property_search(query, spec=None):
     try:
         crawler = BayutCrawler()
-        return crawler.search_properties(query)
+        return crawler.search_properties(query, spec)
     except Exception as e:
         print(f"💥 Error: {e}")
         return []
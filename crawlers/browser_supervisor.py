@@ -0,0 +1,322 @@
+import atexit
+import logging
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-browser caps (chromedriver + Chrome + renderers), and how often to check them
+MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", 1500))
+MAX_LIFETIME = float(os.getenv("BROWSER_MAX_LIFETIME", 1800))
+REAP_INTERVAL = float(os.getenv("BROWSER_REAP_INTERVAL", 60))
+# An untracked chromedriver of ours this old is a leak (e.g. a failed driver setup)
+STRAY_GRACE = float(os.getenv("BROWSER_STRAY_GRACE", 120))
+REAP_ORPHANS = os.getenv("BROWSER_REAP_ORPHANS", "1") not in ("0", "false", "no")
+
+BROWSER_NAMES = ("chromedriver", "chrome", "chromium", "headless_shell")
+AUTOMATION_FLAGS = (b"--enable-automation", b"--test-type=webdriver", b"--remote-debugging-port")
+
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class Proc:
+    __slots__ = ("pid", "ppid", "name", "state", "rss_kb", "started_at")
+
+    def __init__(self, pid, ppid, name, state, rss_kb, started_at):
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+        self.state = state
+        self.rss_kb = rss_kb
+        self.started_at = started_at
+
+
+def _boot_time() -> float:
+    try:
+        with open("/proc/stat") as f:
+            for line in f:
+                if line.startswith("btime"):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+def process_table(uid: Optional[int] = None) -> Dict[int, Proc]:
+    """One pass over /proc (empty where there is none), optionally only `uid`'s processes"""
+    table = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return table
+    boot = _boot_time()
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            if uid is not None and os.stat(f"/proc/{entry}").st_uid != uid:
+                continue
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            fields = stat[stat.rindex(")") + 2:].split()
+            table[int(entry)] = Proc(int(entry), int(fields[1]), name, fields[0],
+                                     int(fields[21]) * _PAGE_KB, boot + int(fields[19]) / _CLK_TCK)
+        except (OSError, ValueError, IndexError):
+            continue
+    return table
+
+
+def descendants(pid: int, table: Dict[int, Proc]) -> List[int]:
+    children: Dict[int, List[int]] = {}
+    for proc in table.values():
+        children.setdefault(proc.ppid, []).append(proc.pid)
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
+
+
+def kill_process_tree(pid: int, table: Optional[Dict[int, Proc]] = None):
+    """SIGKILL `pid` and everything it spawned (chromedriver → Chrome → renderers)"""
+    table = process_table() if table is None else table
+    for child in reversed(descendants(pid, table)):
+        _kill(child)
+    _kill(pid)
+
+
+def _kill(pid: int):
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except OSError:
+        pass
+
+
+def _cmdline(pid: int) -> bytes:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read()
+    except OSError:
+        return b""
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID of the chromedriver process behind a Selenium driver"""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+class _Browser:
+    __slots__ = ("pid", "pool", "started_at", "retire", "retiring")
+
+    def __init__(self, pid: int, pool: str, retire: Optional[Callable[[], None]]):
+        self.pid = pid
+        self.pool = pool
+        self.started_at = time.time()
+        self.retire = retire
+        self.retiring = False
+
+
+class BrowserSupervisor:
+    """
+    Tracks the chromedriver PID (and through it every Chrome process) behind
+    each driver the pools launch. A background sweep every `reap_interval`
+    seconds retires browsers over `max_rss_mb` or `max_lifetime`, and kills
+    orphans: automation Chrome left behind by a dead chromedriver, and
+    untracked chromedrivers of ours older than STRAY_GRACE. Everything still
+    tracked is killed at interpreter exit. Linux only (/proc); elsewhere it
+    just keeps the books.
+    """
+
+    def __init__(self, max_rss_mb: float = 1500, max_lifetime: float = 1800, reap_interval: float = 60):
+        self.max_rss_mb = max_rss_mb
+        self.max_lifetime = max_lifetime
+        self.reap_interval = reap_interval
+        self.stats = {"tracked": 0, "retired_rss": 0, "retired_lifetime": 0, "reaped": 0, "sweeps": 0}
+
+        self._lock = threading.Lock()
+        self._browsers: Dict[int, _Browser] = {}
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def track(self, driver, pool: str, retire: Optional[Callable[[], None]] = None) -> Optional[int]:
+        """Start supervising `driver`; `retire()` is called (once) if it breaks a cap"""
+        pid = driver_pid(driver)
+        if pid is None:
+            return None
+        with self._lock:
+            self._browsers[pid] = _Browser(pid, pool, retire)
+            self.stats["tracked"] += 1
+            if self._sweeper is None and self.reap_interval > 0:
+                self._sweeper = threading.Thread(target=self._run, name="browser-supervisor", daemon=True)
+                self._sweeper.start()
+        return pid
+
+    def untrack(self, driver_or_pid):
+        pid = driver_or_pid if isinstance(driver_or_pid, int) else driver_pid(driver_or_pid)
+        with self._lock:
+            self._browsers.pop(pid, None)
+
+    def _run(self):
+        while not self._stop.wait(self.reap_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"⚠️ Browser sweep failed: {e}")
+
+    def sweep(self) -> Dict[str, int]:
+        """Enforce the caps and reap orphans once; returns what was done"""
+        table = process_table(os.getuid()) if hasattr(os, "getuid") else process_table()
+        now = time.time()
+        over = []
+        with self._lock:
+            self.stats["sweeps"] += 1
+            for pid, browser in list(self._browsers.items()):
+                if pid not in table or table[pid].state == "Z":
+                    del self._browsers[pid]
+                    continue
+                if browser.retiring:
+                    continue
+                rss_mb = sum(table[p].rss_kb for p in [pid] + descendants(pid, table) if p in table) / 1024
+                if rss_mb > self.max_rss_mb:
+                    over.append((browser, "rss", f"{rss_mb:.0f} MB RSS"))
+                elif now - browser.started_at > self.max_lifetime:
+                    over.append((browser, "lifetime", f"{now - browser.started_at:.0f}s old"))
+                else:
+                    continue
+                browser.retiring = True
+                self.stats[f"retired_{over[-1][1]}"] += 1
+
+        for browser, _, reason in over:
+            logger.warning(f"♻️ [{browser.pool}] Retiring browser {browser.pid}: {reason}")
+            try:
+                if browser.retire is not None:
+                    browser.retire()
+                else:
+                    kill_process_tree(browser.pid, table)
+            except Exception as e:
+                logger.warning(f"⚠️ Retiring browser {browser.pid} failed: {e}")
+
+        reaped = self.reap(table) if REAP_ORPHANS else 0
+        return {"retired": len(over), "reaped": reaped}
+
+    def reap(self, table: Optional[Dict[int, Proc]] = None) -> int:
+        """Kill orphaned automation browsers and collect our own zombie chromedrivers"""
+        if table is None:
+            table = process_table(os.getuid()) if hasattr(os, "getuid") else process_table()
+        me, now = os.getpid(), time.time()
+        with self._lock:
+            tracked = set(self._browsers)
+        supervised = set(tracked)
+        for pid in tracked:
+            supervised.update(descendants(pid, table))
+
+        reaped = 0
+        for proc in list(table.values()):
+            if proc.pid in supervised or proc.pid == me or not proc.name.startswith(BROWSER_NAMES):
+                continue
+            if proc.state == "Z":
+                if proc.ppid == me:
+                    try:
+                        os.waitpid(proc.pid, os.WNOHANG)
+                    except (ChildProcessError, OSError):
+                        pass
+                continue
+            orphaned = proc.ppid == 1 or proc.ppid not in table
+            stray = proc.ppid == me and proc.name.startswith("chromedriver") and now - proc.started_at > STRAY_GRACE
+            if not (orphaned or stray):
+                continue
+            if not proc.name.startswith("chromedriver") and not any(
+                    flag in _cmdline(proc.pid) for flag in AUTOMATION_FLAGS):
+                continue  # Somebody's real browser, not one of ours
+            logger.warning(f"🧹 Reaping {'stray' if stray else 'orphaned'} {proc.name} {proc.pid} "
+                           f"({proc.rss_kb / 1024:.0f} MB)")
+            kill_process_tree(proc.pid, table)
+            if stray:
+                try:
+                    os.waitpid(proc.pid, 0)
+                except (ChildProcessError, OSError):
+                    pass
+            reaped += 1
+
+        if reaped:
+            with self._lock:
+                self.stats["reaped"] += reaped
+        return reaped
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Live counts and memory per supervised browser, for sizing hosts"""
+        table = process_table()
+        now = time.time()
+        with self._lock:
+            browsers = list(self._browsers.values())
+            stats = dict(self.stats)
+        per_browser = []
+        for browser in browsers:
+            pids = [p for p in [browser.pid] + descendants(browser.pid, table) if p in table]
+            per_browser.append({
+                "pid": browser.pid,
+                "pool": browser.pool,
+                "age": now - browser.started_at,
+                "processes": len(pids),
+                "rss_mb": sum(table[p].rss_kb for p in pids) / 1024,
+            })
+        return {
+            **stats,
+            "browsers": len(per_browser),
+            "processes": sum(b["processes"] for b in per_browser),
+            "rss_mb": sum(b["rss_mb"] for b in per_browser),
+            "per_browser": per_browser,
+        }
+
+    def shutdown(self):
+        """Kill every supervised browser tree and reap orphans; runs at exit"""
+        self._stop.set()
+        table = process_table()
+        with self._lock:
+            pids, self._browsers = list(self._browsers), {}
+        for pid in pids:
+            kill_process_tree(pid, table)
+        if REAP_ORPHANS:
+            self.reap()
+
+
+_supervisor: Optional[BrowserSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> BrowserSupervisor:
+    """Process-wide supervisor shared by every driver pool"""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = BrowserSupervisor(MAX_RSS_MB, MAX_LIFETIME, REAP_INTERVAL)
+        return _supervisor
+
+
+def browser_stats() -> Dict[str, Any]:
+    return get_supervisor().snapshot()
+
+
+@atexit.register
+def _shutdown_supervisor():
+    if _supervisor is not None:
+        _supervisor.shutdown()
+
+
+if __name__ == "__main__":
+    # Ad-hoc host check: list automation browsers on the box, reap orphans with --reap
+    import sys
+    table = process_table()
+    for proc in sorted(table.values(), key=lambda p: p.pid):
+        if proc.name.startswith(BROWSER_NAMES):
+            print(f"{proc.pid:>7} ppid={proc.ppid:<7} {proc.state} {proc.rss_kb / 1024:8.1f} MB  "
+                  f"{time.time() - proc.started_at:8.0f}s  {proc.name}")
+    if "--reap" in sys.argv:
+        print(f"reaped {BrowserSupervisor().reap()}")
@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# An explicit chromedriver wins over everything else
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
+# Never touch the network: configured path, cached manifest or PATH only
+CHROMEDRIVER_OFFLINE = os.getenv("CHROMEDRIVER_OFFLINE", "0") not in ("0", "false", "no")
+CHROMEDRIVER_MANIFEST = os.getenv(
+    "CHROMEDRIVER_MANIFEST", os.path.join(os.path.expanduser("~"), ".cache", "property-seek", "chromedriver.json")
+)
+# How long a cached resolution is trusted before webdriver-manager is asked again
+CHROMEDRIVER_MANIFEST_TTL = float(os.getenv("CHROMEDRIVER_MANIFEST_TTL", 7 * 24 * 3600))
+
+_resolved = False
+_path: Optional[str] = None
+_lock = threading.Lock()
+
+
+def _usable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _read_manifest() -> Optional[dict]:
+    try:
+        with open(CHROMEDRIVER_MANIFEST) as f:
+            manifest = json.load(f)
+        return manifest if _usable(manifest.get("path")) else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_manifest(path: str, source: str):
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_MANIFEST), exist_ok=True)
+        tmp = CHROMEDRIVER_MANIFEST + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"path": path, "source": source, "resolved_at": time.time()}, f)
+        os.replace(tmp, CHROMEDRIVER_MANIFEST)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not write chromedriver manifest: {e}")
+
+
+def _download() -> Optional[str]:
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    except Exception as e:
+        logger.warning(f"⚠️ webdriver-manager could not resolve chromedriver: {e}")
+        return None
+
+
+def _resolve() -> Optional[str]:
+    if CHROMEDRIVER_PATH:
+        if _usable(CHROMEDRIVER_PATH):
+            return CHROMEDRIVER_PATH
+        logger.error(f"❌ CHROMEDRIVER_PATH={CHROMEDRIVER_PATH} is not an executable file")
+
+    manifest = _read_manifest()
+    if manifest and (CHROMEDRIVER_OFFLINE or time.time() - manifest.get("resolved_at", 0) < CHROMEDRIVER_MANIFEST_TTL):
+        return manifest["path"]
+
+    if not CHROMEDRIVER_OFFLINE:
+        path = _download()
+        if _usable(path):
+            _write_manifest(path, "webdriver-manager")
+            return path
+
+    # Network down or offline: an old manifest entry still beats nothing
+    if manifest:
+        logger.warning("⚠️ Using the cached chromedriver past its manifest TTL")
+        return manifest["path"]
+    path = shutil.which("chromedriver")
+    if path:
+        _write_manifest(path, "PATH")
+    return path
+
+
+def resolve_chromedriver() -> Optional[str]:
+    """
+    Path to chromedriver, resolved once per process: CHROMEDRIVER_PATH, then
+    the cached manifest, then webdriver-manager (skipped when
+    CHROMEDRIVER_OFFLINE is set), then PATH. None leaves it to Selenium.
+    """
+    global _resolved, _path
+    with _lock:
+        if not _resolved:
+            start = time.time()
+            _path = _resolve()
+            _resolved = True
+            if _path:
+                logger.info(f"🔧 chromedriver resolved to {_path} in {time.time() - start:.2f}s")
+            else:
+                if CHROMEDRIVER_OFFLINE:
+                    os.environ.setdefault("SE_OFFLINE", "true")  # Keep Selenium Manager off the network too
+                logger.warning("⚠️ No chromedriver found; leaving it to Selenium Manager")
+        return _path
+
+
+def chrome_service():
+    """Selenium Service for the resolved chromedriver, without re-resolving it per driver"""
+    from selenium.webdriver.chrome.service import Service
+
+    path = resolve_chromedriver()
+    return Service(path) if path else Service()
@@ -0,0 +1,385 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from .browser_supervisor import get_supervisor, kill_process_tree
+from .driver_binary import chrome_service, resolve_chromedriver
+from .readiness import install_hooks
+from .speculative import on_cancel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+# How long an aborted driver gets to quit cleanly before its processes are killed
+ABORT_GRACE = float(os.getenv("DRIVER_ABORT_GRACE", 3))
+
+
+def create_chrome_driver():
+    """Default factory: headless Chrome with the anti-detection flags the crawlers share"""
+    from selenium import webdriver
+
+    service = chrome_service()
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument(f"--user-agent={DEFAULT_USER_AGENT}")
+
+    driver = webdriver.Chrome(service=service, options=options)
+    try:
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    except Exception:
+        driver.quit()  # Chrome is already up; don't leave it behind
+        raise
+    return driver
+
+
+class PooledDriver:
+    """
+    A leased WebDriver. Attribute access is proxied to the underlying driver,
+    `get()` is counted so the pool can retire drivers after `max_pages`.
+    """
+
+    def __init__(self, driver, pool_name: str):
+        self.driver = driver
+        self.pool_name = pool_name
+        self.created_at = time.monotonic()
+        self.pages = 0
+        self.leases = 0
+        self.aborted = False
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+    def get(self, url: str):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def quit(self):
+        # Leased drivers are returned to the pool, not quit by callers
+        logger.debug("quit() on pooled driver ignored; the pool owns its lifetime")
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class DriverPool:
+    """
+    Bounded pool of warm Chrome instances.
+
+    Drivers are created lazily up to `max_size` (and `min_size` are pre-launched
+    by `warm()`), health-checked on checkout, wiped of cookies and storage on
+    checkin, and retired once they exceed `max_pages` navigations or `max_age`
+    seconds.
+    """
+
+    def __init__(self, name: str, factory: Callable, min_size: int = 0, max_size: int = 2,
+                 max_pages: int = 50, max_age: float = 900, acquire_timeout: float = 60):
+        self.name = name
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max(1, max_size)
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.acquire_timeout = acquire_timeout
+
+        self._idle: List[PooledDriver] = []
+        self._total = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {"created": 0, "reused": 0, "retired": 0, "failed": 0, "aborted": 0}
+
+    def _spawn(self) -> Optional[PooledDriver]:
+        driver = None
+        try:
+            start = time.time()
+            driver = self.factory()
+            if driver is None:
+                raise RuntimeError("factory returned no driver")
+            install_hooks(driver)
+            logger.info(f"🔧 [{self.name}] Launched Chrome in {time.time() - start:.1f}s")
+            self.stats["created"] += 1
+            pooled = PooledDriver(driver, self.name)
+            get_supervisor().track(driver, self.name, retire=lambda: self.retire(pooled))
+            return pooled
+        except Exception as e:
+            logger.error(f"❌ [{self.name}] Driver creation failed: {e}")
+            self.stats["failed"] += 1
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            return None
+
+    def _destroy(self, pooled: PooledDriver):
+        get_supervisor().untrack(pooled.driver)
+        if not pooled.aborted:  # An aborted driver is already being torn down
+            try:
+                pooled.driver.quit()
+            except Exception:
+                pass
+        self.stats["retired"] += 1
+
+    def retire(self, pooled: PooledDriver):
+        """Supervisor cap hit: drop the driver now if idle, else abort it under its lease"""
+        with self._cond:
+            idle = pooled in self._idle
+            if idle:
+                self._idle.remove(pooled)
+        if idle:
+            self._discard(pooled)
+        else:
+            self.abort(pooled)
+
+    def abort(self, pooled: PooledDriver):
+        """
+        Tear down a leased driver while its lease is still blocked in a page
+        load or wait: whatever it is doing fails fast, and the lease discards
+        it on release, freeing the slot. Quit runs in the background with
+        ABORT_GRACE seconds to finish before the process tree is killed.
+        """
+        if pooled.aborted:
+            return
+        pooled.aborted = True
+        self.stats["aborted"] += 1
+        logger.info(f"🛑 [{self.name}] Aborting a leased driver")
+        threading.Thread(target=self._kill, args=(pooled,), name=f"{self.name}-abort", daemon=True).start()
+
+    def _kill(self, pooled: PooledDriver):
+        driver = pooled.driver
+
+        def quit_quietly():
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+        quitter = threading.Thread(target=quit_quietly, daemon=True)
+        quitter.start()
+        quitter.join(ABORT_GRACE)
+        if not quitter.is_alive():
+            return
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is None:
+            return
+        logger.warning(f"⚠️ [{self.name}] Driver didn't quit within {ABORT_GRACE:.0f}s, killing its processes")
+        kill_process_tree(process.pid)
+        try:
+            process.wait(5)
+        except Exception:
+            pass
+
+    def _is_expired(self, pooled: PooledDriver) -> bool:
+        return pooled.pages >= self.max_pages or pooled.age >= self.max_age
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, pooled: PooledDriver) -> bool:
+        """Clear cookies, web storage and cache so leases don't leak state into each other"""
+        driver = pooled.driver
+        try:
+            try:
+                driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+            try:
+                driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            except Exception:
+                pass
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ [{self.name}] Driver reset failed, retiring it: {e}")
+            return False
+
+    def warm(self):
+        """Pre-launch `min_size` browsers so the first lease skips startup"""
+        while True:
+            with self._cond:
+                if self._closed or self._total >= max(self.min_size, 0):
+                    return
+                self._total += 1
+            pooled = self._spawn()
+            with self._cond:
+                if pooled is None:
+                    self._total -= 1
+                    return
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    def acquire(self, timeout: Optional[float] = None,
+                cancel: Optional[threading.Event] = None) -> Optional[PooledDriver]:
+        deadline = time.monotonic() + (self.acquire_timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                while not self._idle and self._total >= self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.error(f"❌ [{self.name}] Timed out waiting for a free driver")
+                        return None
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    self._cond.wait(remaining if cancel is None else min(remaining, 0.5))
+                if self._closed or (cancel is not None and cancel.is_set()):
+                    return None
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    pooled = None
+                    self._total += 1
+
+            if pooled is None:
+                pooled = self._spawn()
+                if pooled is None:
+                    with self._cond:
+                        self._total -= 1
+                        self._cond.notify()
+                    return None
+            elif self._is_expired(pooled) or not self._is_healthy(pooled):
+                self._discard(pooled)
+                continue
+            else:
+                self.stats["reused"] += 1
+
+            pooled.leases += 1
+            return pooled
+
+    def _discard(self, pooled: PooledDriver):
+        self._destroy(pooled)
+        with self._cond:
+            self._total -= 1
+            self._cond.notify()
+
+    def release(self, pooled: Optional[PooledDriver], discard: bool = False):
+        if pooled is None:
+            return
+        if discard or pooled.aborted or self._closed or self._is_expired(pooled) or not self._reset(pooled):
+            self._discard(pooled)
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None, cancel: Optional[threading.Event] = None):
+        """
+        Check out a driver for the duration of the block. Yields None if no
+        driver could be obtained (or `cancel` was set while waiting), mirroring
+        the old `create_driver()` contract. Interrupting `cancel` during the
+        block aborts the driver, see `abort`.
+        """
+        pooled = self.acquire(timeout, cancel)
+        unregister = on_cancel(cancel, lambda: self.abort(pooled)) if pooled else (lambda: None)
+        broken = False
+        try:
+            yield pooled
+        except Exception:
+            broken = True
+            raise
+        finally:
+            unregister()
+            self.release(pooled, discard=broken)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._destroy(pooled)
+            with self._cond:
+                self._total -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "idle": len(self._idle),
+                "in_use": self._total - len(self._idle),
+                "total": self._total,
+                **self.stats,
+            }
+
+
+_pools: Dict[str, DriverPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str = "default", factory: Optional[Callable] = None, **limits) -> DriverPool:
+    """
+    Return the process-wide pool registered under `name`, creating it on first
+    use. Limits default to the DRIVER_POOL_* environment variables.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            limits.setdefault("min_size", _env_int("DRIVER_POOL_MIN", 0))
+            limits.setdefault("max_size", _env_int("DRIVER_POOL_MAX", 4))
+            limits.setdefault("max_pages", _env_int("DRIVER_POOL_MAX_PAGES", 50))
+            limits.setdefault("max_age", _env_int("DRIVER_POOL_MAX_AGE", 900))
+            pool = DriverPool(name, factory or create_chrome_driver, **limits)
+            _pools[name] = pool
+        return pool
+
+
+def lease_driver(name: str = "default", factory: Optional[Callable] = None, timeout: Optional[float] = None,
+                 cancel: Optional[threading.Event] = None):
+    """Shorthand for `get_pool(name, factory).lease(timeout, cancel)`"""
+    return get_pool(name, factory).lease(timeout, cancel)
+
+
+def warm_up(names=("default",), size: Optional[int] = None):
+    """
+    Startup hook: resolve chromedriver and pre-launch `size` browsers
+    (DRIVER_POOL_WARMUP, default 1) in each named pool, so the first search
+    pays for neither. Blocking; run it on a background thread.
+    """
+    start = time.time()
+    resolve_chromedriver()
+    size = _env_int("DRIVER_POOL_WARMUP", 1) if size is None else size
+    for name in names:
+        pool = get_pool(name)
+        pool.min_size = max(pool.min_size, min(size, pool.max_size))
+        pool.warm()
+    logger.info(f"🔥 Warm-up done in {time.time() - start:.1f}s: {pool_stats()}")
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.snapshot() for pool in pools}
+
+
+@atexit.register
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
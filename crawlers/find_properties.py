@@ -1,56 +1,29 @@
-import time
+import sys
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from webdriver_manager.chrome import ChromeDriverManager
-from dotenv import load_dotenv
-import google.generativeai as genai
 import logging
-import os
 
-load_dotenv()
+from .driver_pool import lease_driver
+from .html_parser import parse_html
+from .listing import Listing
+from .lean import apply_lean_profile
+from .query_spec import QuerySpec, extract_query_spec
+from .readiness import wait_for_listings
+from .speculative import race_urls
+from .structured_data import HTTP_FIRST, extract_structured, fetch_structured
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-2.0-flash")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_driver():
-    try:
-        service = Service(ChromeDriverManager().install())
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless=new")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        driver = webdriver.Chrome(service=service, options=options)
-        return driver
-    except Exception as e:
-        logger.error(f"❌ Driver failed: {e}")
-        return None
-
-def extract_query_params(query):
-    prompt = f"""
-    Extract for Find Properties UAE:
-    - location: 'dubai', 'sharjah', etc.
-    - property_type: 'apartments', 'villas'
-    - purpose: 'for-rent' or 'for-sale'
-
-    Query: "{query}"
-
-    Return JSON:
-    {{"location": "dubai", "property_type": "apartments", "purpose": "for-rent"}}
-    """
-    try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-        if "```json" in text: text = text.split("```json")[1].split("```")[0]
-        import json
-        return json.loads(text)
-    except:
-        return {"location": "dubai", "property_type": "properties", "purpose": "for-rent"}
+FIND_PROPERTIES_TYPES = {"apartment": "apartments", "studio": "apartments", "penthouse": "apartments",
+                         "villa": "villas", "townhouse": "villas"}
+
+def params_from_spec(spec: QuerySpec):
+    """Map the shared QuerySpec onto Find Properties URL segments"""
+    return {
+        "location": spec.city_slug,
+        "property_type": FIND_PROPERTIES_TYPES.get(spec.property_type, "properties"),
+        "purpose": "for-rent" if spec.purpose == "rent" else "for-sale",
+    }
 
 def build_urls(params):
     base = "https://findproperties.ae"
@@ -64,81 +37,103 @@ def build_urls(params):
         f"{base}/{purpose}/properties"
     ]
 
-def extract_properties(soup, source_url):
+def extract_properties(page, source_url):
     results = []
-    cards = soup.select("div.property-card, .listing, .card") or soup.find_all("div", class_=lambda x: x and "property" in str(x).lower())
+    cards = page.select("div.property-card, .listing, .card") or page.select('div[class*="property" i]')
     
     if not cards:
-        text = soup.get_text()
+        text = page.text()
         matches = re.findall(r'([^.\n]*AED[^.\n]*)', text, re.IGNORECASE)[:10]
         for m in matches:
-            results.append({
-                "title": "Property Listed",
-                "price": re.search(r'AED[\s\d,]+', m).group() if re.search(r'AED[\s\d,]+', m) else "Price on request",
-                "location": "UAE",
-                "description": m[:80] + "...",
-                "link": source_url,
-                "source": "Find Properties"
-            })
+            results.append(Listing.parse(
+                title="Property Listed",
+                price=re.search(r'AED[\s\d,]+', m).group() if re.search(r'AED[\s\d,]+', m) else "Price on request",
+                location="UAE",
+                description=m[:80] + "...",
+                link=source_url,
+                source="Find Properties",
+                raw=m,
+            ))
         return results
 
     for card in cards[:20]:
         try:
-            title = card.find(['h2','h3']) or card.find(class_=lambda x: x and 'title' in str(x).lower())
-            title = title.get_text(strip=True) if title else "Property Available"
+            card_text = card.text()
+            title = card.select_one('h2, h3') or card.select_one('[class*="title" i]')
+            title = title.text(strip=True) if title else "Property Available"
 
             price = "Price on request"
             for pat in [r'AED[\s\d,]+', r'[\d,]+\s*AED']: 
-                if re.search(pat, card.get_text(), re.IGNORECASE):
-                    price = re.search(pat, card.get_text(), re.IGNORECASE).group(); break
+                if re.search(pat, card_text, re.IGNORECASE):
+                    price = re.search(pat, card_text, re.IGNORECASE).group(); break
 
             location = "UAE"
             for loc in ['Dubai', 'Sharjah', 'Abu Dhabi']: 
-                if loc.lower() in card.get_text().lower(): 
+                if loc.lower() in card_text.lower(): 
                     location = loc; break
 
-            link = card.find('a', href=True)
-            link = link['href'] if link else source_url
+            link = card.select_one('a[href]')
+            link = link.attr('href') if link else source_url
             if link.startswith('/'): link = f"https://findproperties.ae{link}"
 
-            results.append({
-                "title": title,
-                "price": price,
-                "location": location,
-                "description": card.get_text()[:100] + "...",
-                "link": link,
-                "source": "Find Properties"
-            })
+            results.append(Listing.parse(
+                title=title,
+                price=price,
+                location=location,
+                description=card_text[:100] + "...",
+                link=link,
+                source="Find Properties",
+                raw=card_text,
+            ))
         except: continue
     return results
 
-def crawl_find_properties(query):
+def crawl_find_properties(query, spec=None, cancel=None, on_page=None):
+    """`on_page(results)` is called with the winning URL's listings as soon as its page is parsed"""
     logger.info(f"🚀 Searching Find Properties: {query}")
-    params = extract_query_params(query)
-    driver = create_driver()
-    if not driver: return []
-
-    all_results = []
-    for url in build_urls(params):
-        try:
-            driver.get(url)
-            time.sleep(4)
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            results = extract_properties(soup, url)
-            
-            # ✅ Fix: Har property ki location ko query ki location se override karo agar nahi extract hui
-            for prop in results:
-                if not any(loc in prop["location"].lower() for loc in ['dubai', 'sharjah', 'abu dhabi', 'ajman', 'ras al khaimah']):
-                    prop["location"] = params["location"].title()  # e.g., "abu dhabi" → "Abu Dhabi"
-
-            all_results.extend(results)
-            if all_results: break
-        except: continue
+    params = params_from_spec(spec or extract_query_spec(query))
+    all_results = race_urls("find_properties", build_urls(params),
+                            lambda url, cancel, page: _fetch_url(url, params, cancel, page),
+                            cancel=cancel, on_page=on_page)
 
-    driver.quit()
     logger.info(f"✅ Found {len(all_results)} from Find Properties")
     return all_results[:60]
 
+def _fill_location(results, params):
+    # ✅ Fix: Har property ki location ko query ki location se override karo agar nahi extract hui
+    location = sys.intern(params["location"].replace("-", " ").title())  # e.g., "abu-dhabi" → "Abu Dhabi"
+    for prop in results:
+        if not any(loc in prop.location.lower() for loc in ['dubai', 'sharjah', 'abu dhabi', 'ajman', 'ras al khaimah']):
+            prop.location = location
+    return results
+
+def _fetch_url(url, params, cancel, on_page=None):
+    """Load one candidate search URL: plain HTTP first, else on a leased driver"""
+    if cancel.is_set(): return []
+    if HTTP_FIRST:
+        results = fetch_structured(url, "find_properties")
+        if results:
+            logger.info(f"🌐 Find Properties: {len(results)} listings from embedded JSON, no browser needed")
+            results = _fill_location(results, params)
+            if on_page: on_page(results)
+            return results
+        if cancel.is_set(): return []
+
+    with lease_driver(cancel=cancel) as driver:
+        if not driver: return []
+        apply_lean_profile(driver, "find_properties")
+        try:
+            driver.get(url)
+            wait_for_listings(driver, "find_properties", cancel=cancel)
+            html = driver.page_source
+            results = extract_structured(html, "find_properties", url) or \
+                extract_properties(parse_html(html), url)
+            results = _fill_location(results, params)
+            if on_page and results: on_page(results)
+            return results
+        except:
+            return []
+
 def main():
     query = input("Enter your property search query (e.g., 'apartments for rent in Dubai'): ").strip()
     if not query:
@@ -149,11 +144,11 @@ def main():
     if results:
         print(f"🎯 Found {len(results)} properties:\n")
         for i, prop in enumerate(results, 1):
-            print(f"{i}. {prop['title']}")
-            print(f"   💰 {prop['price']}")
-            print(f"   📍 {prop['location']}")
-            print(f"   📝 {prop['description']}")
-            print(f"   🔗 {prop['link']}")
+            print(f"{i}. {prop.title}")
+            print(f"   💰 {prop.price}")
+            print(f"   📍 {prop.location}")
+            print(f"   📝 {prop.description}")
+            print(f"   🔗 {prop.link}")
             print("-" * 60)
     else:
         print("❌ No properties found. Check your internet, site structure, or API key.")
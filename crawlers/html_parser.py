@@ -0,0 +1,209 @@
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fastest first. "auto" picks the first one that imports; HTML_PARSER pins one.
+#   selectolax   lexbor/modest C parser, its own node API
+#   lxml         BeautifulSoup on the lxml tree builder
+#   html.parser  BeautifulSoup on the stdlib builder (always available)
+BACKEND_ORDER = ["selectolax", "lxml", "html.parser"]
+# jQuery-style `*:contains("text")` alternatives inside a selector group
+_CONTAINS_RE = re.compile(r'^\*?:contains\("([^"]*)"\)$')
+HTML_PARSER = os.getenv("HTML_PARSER", "auto")
+
+
+@lru_cache(maxsize=None)
+def _available(backend: str) -> bool:
+    try:
+        if backend == "selectolax":
+            import selectolax  # noqa: F401
+        elif backend == "lxml":
+            import bs4, lxml  # noqa: F401,E401
+        else:
+            import bs4  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def available_backends() -> List[str]:
+    return [b for b in BACKEND_ORDER if _available(b)]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    backend = backend or HTML_PARSER
+    if backend != "auto":
+        if not _available(backend):
+            raise ImportError(f"HTML parser backend '{backend}' is not installed")
+        return backend
+    for candidate in BACKEND_ORDER:
+        if _available(candidate):
+            return candidate
+    raise ImportError("No HTML parser available: install beautifulsoup4, lxml or selectolax")
+
+
+class Node(ABC):
+    """
+    The small element API the extractors need, over either a BeautifulSoup
+    Tag or a selectolax node. Card subtrees are handed out as Nodes of the
+    one parsed page, never re-serialised.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def __bool__(self):
+        return True
+
+    @abstractmethod
+    def select(self, css: str) -> List["Node"]:
+        """Descendants matching `css`; `*:contains("text")` alternatives work on every backend"""
+
+    @abstractmethod
+    def select_one(self, css: str) -> Optional["Node"]:
+        """First of `select(css)` in document order"""
+
+    @abstractmethod
+    def text(self, sep: str = "", strip: bool = False) -> str:
+        """Like BeautifulSoup.get_text(sep, strip=strip)"""
+
+    @abstractmethod
+    def attr(self, name: str, default=None):
+        """Attribute value; multi-valued ones (class) joined with spaces"""
+
+    @property
+    @abstractmethod
+    def tag(self) -> str:
+        """Lower-case tag name"""
+
+    @abstractmethod
+    def closest(self, *tags: str) -> Optional["Node"]:
+        """Nearest ancestor-or-self with one of `tags`"""
+
+    @abstractmethod
+    def text_parents(self, pattern: "re.Pattern") -> List["Node"]:
+        """Elements owning a text node that matches `pattern`, in document order"""
+
+    @abstractmethod
+    def find_string(self, pattern: "re.Pattern") -> Optional[str]:
+        """First text node matching `pattern`, like soup.find(string=pattern)"""
+
+
+def _soup_css(css: str) -> str:
+    """soupsieve spells jQuery's :contains as :-soup-contains"""
+    return css.replace(":contains(", ":-soup-contains(")
+
+
+class SoupNode(Node):
+    __slots__ = ()
+
+    def select(self, css):
+        return [SoupNode(t) for t in self.raw.select(_soup_css(css))]
+
+    def select_one(self, css):
+        found = self.raw.select_one(_soup_css(css))
+        return SoupNode(found) if found is not None else None
+
+    def text(self, sep="", strip=False):
+        return self.raw.get_text(sep, strip=strip)
+
+    def attr(self, name, default=None):
+        value = self.raw.get(name, default)
+        return " ".join(value) if isinstance(value, list) else value
+
+    @property
+    def tag(self):
+        return self.raw.name
+
+    def closest(self, *tags):
+        node = self.raw if self.raw.name in tags else self.raw.find_parent(list(tags))
+        return SoupNode(node) if node is not None else None
+
+    def text_parents(self, pattern):
+        return [SoupNode(s.parent) for s in self.raw.find_all(string=pattern) if s.parent is not None]
+
+    def find_string(self, pattern):
+        found = self.raw.find(string=pattern)
+        return str(found) if found is not None else None
+
+
+class LexborNode(Node):
+    __slots__ = ()
+
+    def select(self, css):
+        if ":contains(" in css:
+            return list(self._select_contains(css))
+        return [LexborNode(n) for n in self.raw.css(css)]
+
+    def select_one(self, css):
+        if ":contains(" in css:
+            return next(self._select_contains(css), None)
+        found = self.raw.css_first(css)
+        return LexborNode(found) if found is not None else None
+
+    def _select_contains(self, css):
+        # lexbor has no :contains; match soupsieve: descendants in document order
+        # that match a plain alternative or whose text has the needle
+        parts = [p.strip() for p in css.split(",")]
+        needles = [m.group(1) for m in map(_CONTAINS_RE.match, parts) if m]
+        plain = ", ".join(p for p in parts if not _CONTAINS_RE.match(p))
+        for i, node in enumerate(self.raw.traverse()):
+            if i == 0:
+                continue
+            if plain and node.css_matches(plain) or any(n in node.text() for n in needles):
+                yield LexborNode(node)
+
+    def text(self, sep="", strip=False):
+        return self.raw.text(deep=True, separator=sep, strip=strip)
+
+    def attr(self, name, default=None):
+        return self.raw.attributes.get(name, default)
+
+    @property
+    def tag(self):
+        return self.raw.tag
+
+    def closest(self, *tags):
+        node = self.raw
+        while node is not None and node.tag not in tags:
+            node = node.parent
+        return LexborNode(node) if node is not None else None
+
+    def _text_nodes(self):
+        for node in self.raw.traverse(include_text=True):
+            if node.tag == "-text":
+                yield node
+
+    def text_parents(self, pattern):
+        return [LexborNode(n.parent) for n in self._text_nodes()
+                if n.parent is not None and pattern.search(n.text_content or "")]
+
+    def find_string(self, pattern):
+        for node in self._text_nodes():
+            if pattern.search(node.text_content or ""):
+                return node.text_content
+        return None
+
+
+def parse_html(html, backend: Optional[str] = None) -> Node:
+    """Parse a page once with the configured backend and return its root Node"""
+    backend = resolve_backend(backend)
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    if backend == "selectolax":
+        try:
+            from selectolax.lexbor import LexborHTMLParser as Parser
+        except ImportError:
+            from selectolax.parser import HTMLParser as Parser
+        tree = Parser(html)
+        return LexborNode(tree.root if tree.root is not None else tree.body)
+
+    from bs4 import BeautifulSoup
+    return SoupNode(BeautifulSoup(html, backend))
@@ -0,0 +1,60 @@
+import logging
+import os
+from typing import Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+# Static resource types we never parse: we only read text out of page_source
+RESOURCE_PATTERNS = {
+    "images": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg"],
+}
+
+# Analytics, ads and session-replay hosts seen on the portals
+TRACKER_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "adservice.google.com", "facebook.net", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "segment.io", "segment.com", "mixpanel.com", "amplitude.com",
+    "newrelic.com", "nr-data.net", "criteo.com", "taboola.com", "outbrain.com", "snapchat.com",
+    "tiktok.com", "bing.com/bat", "branch.io", "intercom.io", "zopim.com", "onesignal.com",
+]
+
+# Per-site lean profile; a site missing here browses normally
+LEAN_PROFILES: Dict[str, Dict[str, bool]] = {
+    "property_finder": {"images": True, "fonts": True, "media": True, "trackers": True},
+    "find_properties": {"images": True, "fonts": True, "media": True, "trackers": True},
+    "bayut": {"images": True, "fonts": True, "media": True, "trackers": True},
+}
+
+LEAN_BROWSING = os.getenv("LEAN_BROWSING", "1") not in ("0", "false", "no")
+
+
+def blocked_patterns(site: str, extra: Iterable[str] = ()) -> List[str]:
+    profile = LEAN_PROFILES.get(site, {}) if LEAN_BROWSING else {}
+    patterns = []
+    for kind, blocked in profile.items():
+        if not blocked:
+            continue
+        if kind == "trackers":
+            patterns += [f"*{domain}*" for domain in TRACKER_DOMAINS]
+        else:
+            patterns += RESOURCE_PATTERNS.get(kind, [])
+    return patterns + list(extra)
+
+
+def apply_lean_profile(driver, site: str, extra: Iterable[str] = ()) -> int:
+    """
+    Block the site's lean-profile URL patterns for `driver` through CDP.
+    Called on every lease since pooled drivers are shared between sites;
+    an empty profile clears any previous block list. Returns the number of
+    patterns in force.
+    """
+    patterns = blocked_patterns(site, extra)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return len(patterns)
+    except Exception as e:
+        logger.debug(f"Lean browsing not applied for {site}: {e}")
+        return 0
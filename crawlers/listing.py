@@ -0,0 +1,295 @@
+import csv
+import io
+import json
+import re
+import sys
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .prices import PRICE_BATCH_MIN, annual_price, normalize_price, normalize_prices, price_per_sqft
+from .query_parser import (AREA_CITY, AREAS, CITIES, _AREA_RE, _BATHS_RE, _BEDS_RE, _CITY_RE, _TYPE_RE,
+                           PROPERTY_TYPES, _count)
+
+_AREA_SQFT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(?:sq\.?\s*ft|sqft|square feet)", re.I)
+_DIGITS_RE = re.compile(r"\d+")
+_SPACES_RE = re.compile(r"\s{2,}|[^\S ]")
+_AED_RE = re.compile(r"aed", re.I)
+_UNPARSED = object()  # Price numbers not read from the price text yet
+_LOCATION_ABBREVIATIONS = {"dxb": "Dubai", "auh": "Abu Dhabi", "shj": "Sharjah", "ajm": "Ajman"}
+# What the legacy scrapers call each field (final_bayut.py, BAYUT V1/llm.py, extrabayut.py)
+_ALIASES = {
+    "title": ("title", "Name", "name"),
+    "price": ("price", "Price"),
+    "location": ("location", "Location"),
+    "description": ("description", "details", "Details"),
+    "link": ("link", "url", "Link"),
+    "source": ("source", "Source"),
+}
+
+
+def clean_price(price_text: str) -> str:
+    if not price_text:
+        return "Price on request"
+    clean = _SPACES_RE.sub(' ', price_text.strip())  # Already-tidy text comes back as the same object
+    if 'aed' in clean.lower() and not clean.upper().startswith('AED'):
+        clean = _AED_RE.sub('AED', clean)
+    return clean
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(location: str) -> str:
+    """Display location, interned: the same few areas come back on every page"""
+    return sys.intern(_normalize_location(location))
+
+
+def _normalize_location(location: str) -> str:
+    if not location:
+        return "UAE"
+    location_lower = location.lower()
+    for abbrev, full_name in _LOCATION_ABBREVIATIONS.items():
+        if abbrev in location_lower:
+            return full_name
+    return location.title()
+
+
+@lru_cache(maxsize=4096)
+def read_place(location: str, title: str) -> Tuple[Tuple[str, ...], str]:
+    """(areas, emirate) a card's location and title name; the same few come back on every page"""
+    location, title = location.lower(), title.lower()
+    areas = tuple(dict.fromkeys(AREAS[name] for name in _AREA_RE.findall(f"{location} {title}")))
+    # The location's emirate beats the area's ('Al Nahda, Sharjah' is not Dubai's Al Nahda),
+    # which beats one the title mentions ('near Dubai Mall')
+    if m := _CITY_RE.search(location):
+        city = CITIES[m.group(1)]
+    elif areas:
+        city = AREA_CITY.get(areas[0], "dubai")
+    else:
+        city = CITIES[m.group(1)] if (m := _CITY_RE.search(title)) else ""
+    return areas, city
+
+
+def read_type(title: str, description: str) -> str:
+    """'apartment', 'villa', 'studio', ... as the title or description says, '' if neither does"""
+    m = _TYPE_RE.search(f"{title} {description}".lower())
+    return PROPERTY_TYPES[m.group(1)] if m else ""
+
+
+def _number(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+class Listing:
+    """
+    One property listing: what every crawler emits and what dedup, sorting,
+    the listing store and the CSV export consume, without copying it into
+    new dicts along the way. Beds/baths/area are parsed when it is made
+    (`Listing.parse`), the price, area and type once per result batch
+    (`normalize_listings`, or on first use), source and location strings are interned, and the
+    raw card text / site JSON only becomes a string when `raw_text` is read.
+
+    Display code written against the old result dicts keeps working:
+    `listing["title"]` and `listing.get("link")` read the attributes.
+    """
+
+    FIELDS = ("title", "price", "location", "description", "link", "source", "price_aed", "period",
+              "price_per_sqft", "price_confident", "bedrooms", "bathrooms", "area_sqft", "property_type", "image",
+              "last_seen")
+    __slots__ = ("title", "price", "location", "description", "link", "source", "_price_aed", "_period",
+                 "_price_confident", "bedrooms", "bathrooms", "area_sqft", "_property_type", "_place", "image",
+                 "last_seen", "_raw")
+
+    def __init__(self, title: str, price: str, location: str, description: str = "", link: str = "#",
+                 source: str = "Unknown", price_aed: Any = _UNPARSED, period: Optional[str] = None,
+                 bedrooms: Optional[int] = None, bathrooms: Optional[int] = None,
+                 area_sqft: Optional[float] = None, image: Optional[str] = None,
+                 last_seen: Optional[float] = None, raw: Any = None, price_confident: Optional[bool] = None,
+                 property_type: Optional[str] = None):
+        self.title = title
+        self.price = price                  # As shown: "AED 85,000 per year", "Price on request"
+        self.location = sys.intern(location)
+        self.description = description
+        self.link = link
+        self.source = sys.intern(source)
+        self._price_aed = price_aed         # Without one, read from `price` by normalize_listings / on first use
+        self._period = period
+        self._price_confident = price_aed is not None if price_confident is None else price_confident
+        self.bedrooms = bedrooms            # 0 = studio
+        self.bathrooms = bathrooms
+        self.area_sqft = area_sqft
+        self._property_type = property_type  # None: read from title/description by normalize_listings / on first use
+        self._place: Optional[Tuple[Tuple[str, ...], str]] = None  # (areas, city), read likewise
+        self.image = image
+        self.last_seen = last_seen          # Listing store rows only
+        self._raw = raw
+
+    @classmethod
+    def parse(cls, title: str, price: str, location: str, description: str = "", link: str = "#",
+              source: str = "Unknown", bedrooms=None, bathrooms=None, area=None, image=None,
+              raw: Any = None) -> "Listing":
+        """
+        A Listing from the strings a crawler scraped. Bed/bath/area values
+        the site gave are used as-is, missing ones are read from the title
+        and description ("2 Bed | 3 Bath | 1,200 sqft"). The price is read
+        later, a whole batch at once (normalize_listings).
+        """
+        title = str(title or "Property Available").strip()
+        price = clean_price(str(price or ""))
+        description = str(description or "")
+        text = None
+        bedrooms, bathrooms, area = _number(bedrooms), _number(bathrooms), _number(area)
+        if bedrooms is None or bathrooms is None or area is None:
+            text = f"{title} {description}".lower()
+        if bedrooms is None:
+            if m := _BEDS_RE.search(text):
+                bedrooms = _count(m.group(1))
+            elif "studio" in text:
+                bedrooms = 0
+        if bathrooms is None and "ba" in text and (m := _BATHS_RE.search(text)):
+            bathrooms = _count(m.group(1))
+        if area is None and "sq" in text and (m := _AREA_SQFT_RE.search(text)):
+            area = _number(m.group(1))
+        return cls(
+            title, price, normalize_location(str(location or "")), description, str(link or "#"),
+            str(source or "Unknown"), _UNPARSED, None,
+            None if bedrooms is None else int(bedrooms),
+            None if bathrooms is None else int(bathrooms),
+            area,
+            image if isinstance(image, str) and image.startswith("http") else None,
+            None, raw,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Listing":
+        """Lift a result dict (any crawler's keys, see _ALIASES) into a Listing"""
+        fields = {name: next((data[key] for key in keys if data.get(key)), None) for name, keys in _ALIASES.items()}
+        return cls.parse(**fields, bedrooms=data.get("bedrooms"), bathrooms=data.get("bathrooms"),
+                         area=data.get("area", data.get("area_sqft")), image=data.get("image"), raw=data)
+
+    @property
+    def price_parsed(self) -> bool:
+        return self._price_aed is not _UNPARSED
+
+    def set_price(self, price_aed: Optional[int], period: Optional[str], confident: bool):
+        self._price_aed, self._period, self._price_confident = price_aed, period, confident
+
+    @property
+    def price_aed(self) -> Optional[int]:
+        """AED amount, None when on request"""
+        if self._price_aed is _UNPARSED:
+            self.set_price(*normalize_price(self.price))
+        return self._price_aed
+
+    @property
+    def period(self) -> Optional[str]:
+        """'yearly' | 'monthly' | None (not stated, or a sale)"""
+        if self._price_aed is _UNPARSED:
+            self.set_price(*normalize_price(self.price))
+        return self._period
+
+    @property
+    def price_confident(self) -> bool:
+        """The price text gave one plausible AED amount (not a range, "from" price or bare number)"""
+        if self._price_aed is _UNPARSED:
+            self.set_price(*normalize_price(self.price))
+        return self._price_confident
+
+    @property
+    def annual_price(self) -> Optional[int]:
+        """AED per year for rents quoted per month, else price_aed"""
+        return annual_price(self.price_aed, self.period)
+
+    @property
+    def price_per_sqft(self) -> Optional[float]:
+        return price_per_sqft(self.price_aed, self.period, self.area_sqft)
+
+    @property
+    def property_type(self) -> str:
+        """'apartment', 'villa', 'studio', ... as the title or description says, '' if neither does"""
+        if self._property_type is None:
+            self._property_type = read_type(self.title, self.description)
+        return self._property_type
+
+    def _read_place(self) -> Tuple[Tuple[str, ...], str]:
+        if self._place is None:
+            self._place = read_place(self.location, self.title)
+        return self._place
+
+    @property
+    def areas(self) -> Tuple[str, ...]:
+        """Canonical areas ('dubai marina') the location or title names, first named first"""
+        return self._read_place()[0]
+
+    @property
+    def city(self) -> str:
+        """Emirate the location names, else the first area's, else one the title names ('' if none)"""
+        return self._read_place()[1]
+
+    @property
+    def raw_text(self) -> str:
+        """The card text or site JSON this listing was read from ('' if not kept)"""
+        if self._raw is not None and not isinstance(self._raw, str):
+            self._raw = json.dumps(self._raw, ensure_ascii=False, default=str)
+        return self._raw or ""
+
+    @property
+    def signature(self) -> str:
+        """Key two listings share when they are the same property on different sources/pages"""
+        price = "".join(_DIGITS_RE.findall(self.price))
+        return f"{self.title.lower().strip()[:30]}_{price}_{self.location.lower().strip()[:20]}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of FIELDS (exports, JSON)"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def __repr__(self):
+        return f"Listing({self.title!r}, {self.price!r}, {self.location!r}, source={self.source!r})"
+
+
+def normalize_listings(listings: List[Listing]) -> List[Listing]:
+    """
+    Read the price of every listing in a result batch that hasn't been yet,
+    in one vectorised pass (crawlers.prices.normalize_prices) once the
+    batch is PRICE_BATCH_MIN or more; smaller ones go one at a time.
+    Areas, emirate and property type are read from the text here too, so
+    the post-crawl filter and the listing store only compare attributes.
+    """
+    pending = [listing for listing in listings if not listing.price_parsed]
+    if len(pending) < PRICE_BATCH_MIN:
+        for listing in pending:
+            listing.set_price(*normalize_price(listing.price))
+    else:
+        frame = normalize_prices([listing.price for listing in pending])
+        amounts = frame["price_aed"].to_numpy(dtype=object, na_value=None)
+        # None, never NaN, for no period whatever the pandas version: NaN is truthy (see listing_purpose)
+        periods = frame["period"].astype(object).where(frame["period"].notna(), None).tolist()
+        for listing, aed, period, confident in zip(pending, amounts, periods, frame["confident"].tolist()):
+            listing.set_price(None if aed is None else int(aed), period, confident)
+    for listing in listings:
+        if listing._place is None:
+            listing._place = read_place(listing.location, listing.title)
+        if listing._property_type is None:
+            listing._property_type = read_type(listing.title, listing.description)
+    return listings
+
+
+def listings_csv(listings: Iterable[Listing]) -> str:
+    """CSV of Listing.FIELDS, one row per listing, written straight from the attributes"""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(Listing.FIELDS)
+    writer.writerows(map(attrgetter(*Listing.FIELDS), listings))
+    return out.getvalue()
@@ -0,0 +1,86 @@
+"""
+Local post-crawl filter: drops listings whose own details contradict the
+search (a 3-bed on a 2-bed search, AED 250k on a 120k budget, JVC on a
+Dubai Marina search). Portal fallback URLs such as propertyfinder's plain
+/rent/apartments/dubai page ignore area, bedrooms and price, so crawls
+bring back far more than was asked for.
+
+A listing is only dropped on what it states: missing bedrooms, price, type
+or location never count against it.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .listing import Listing, normalize_listings
+from .query_parser import AREAS
+from .query_spec import QuerySpec
+
+# Listing types a searched type also accepts (studios and penthouses are listed as apartments too)
+TYPE_MATCHES = {
+    "apartment": ("apartment", "studio", "penthouse", ""),
+    "studio": ("studio", "apartment", ""),
+    "penthouse": ("penthouse", "apartment", ""),
+}
+_KNOWN_AREAS = frozenset(AREAS.values())
+
+
+@dataclass(frozen=True)
+class ListingFilter:
+    """The structured part of a search, checked against parsed listings"""
+    min_price: Optional[int] = None   # AED per year (QuerySpec.yearly_*); listing rents are annualised to match
+    max_price: Optional[int] = None
+    bedrooms: Optional[int] = None    # Exact, 0 = studio
+    bathrooms: Optional[int] = None   # At least
+    property_type: str = ""
+    community: str = ""               # Canonical area ('dubai marina'), '' for a city-wide search
+    city: str = ""
+
+    @classmethod
+    def from_spec(cls, spec: QuerySpec) -> "ListingFilter":
+        # Only a known area can be recognised on a card; an unknown one filters nothing
+        community = spec.location if spec.location != spec.city and spec.location in _KNOWN_AREAS else ""
+        return cls(spec.yearly_min_price, spec.yearly_max_price, spec.bedrooms, spec.bathrooms, spec.property_type,
+                   community, spec.city)
+
+    @property
+    def active(self) -> bool:
+        return any(value not in (None, "") for value in
+                   (self.min_price, self.max_price, self.bedrooms, self.bathrooms, self.property_type,
+                    self.community, self.city))
+
+    def apply(self, listings: List[Listing]) -> List[Listing]:
+        """
+        The listings that match, in order. One pass per criterion over
+        what the previous ones kept, most selective first. Price, area and
+        type are read from the text once per batch (normalize_listings,
+        which crawl pages already go through); a batch that has not been
+        pays for that on its first filter.
+        """
+        if not listings or not self.active:
+            return listings
+        kept = listings
+        if self.bedrooms is not None:
+            beds = self.bedrooms
+            kept = [listing for listing in kept if listing.bedrooms is None or listing.bedrooms == beds]
+        if self.min_price is not None or self.max_price is not None:
+            low = float("-inf") if self.min_price is None else self.min_price
+            high = float("inf") if self.max_price is None else self.max_price
+            kept = [listing for listing in normalize_listings(kept)
+                    if listing.price_aed is None or low <= listing.annual_price <= high]
+        if self.bathrooms is not None:
+            baths = self.bathrooms
+            kept = [listing for listing in kept if listing.bathrooms is None or listing.bathrooms >= baths]
+        if self.community or self.city:
+            community, city = self.community, self.city
+            kept = [listing for listing in kept
+                    if (not community or not listing.areas or community in listing.areas)
+                    and (not city or not listing.city or listing.city == city)]
+        if self.property_type:
+            types = TYPE_MATCHES.get(self.property_type, (self.property_type, ""))
+            kept = [listing for listing in kept if listing.property_type in types]
+        return kept
+
+
+def filter_listings(listings: List[Listing], spec: QuerySpec) -> List[Listing]:
+    """`listings` without the ones that contradict `spec`"""
+    return ListingFilter.from_spec(spec).apply(listings)
@@ -0,0 +1,588 @@
+import hashlib
+import itertools
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .listing import Listing
+from .listing_filter import TYPE_MATCHES
+from .query_parser import (GENERIC_TYPES, _AREA_RE, _BATHS_RE, _BEDS_RE, _CITY_RE, _MAX_RE, _MIN_RE, _RANGE_RE,
+                           _STOPWORDS, _TYPE_RE)
+from .query_spec import QuerySpec
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.getenv("LISTING_STORE_PATH", os.path.join(".cache", "listings.sqlite3"))
+# Stored listings seen within this many seconds may answer a search without crawling
+LISTING_STORE_MAX_AGE = float(os.getenv("LISTING_STORE_MAX_AGE", 6 * 3600))
+# ...but only if at least this many match; otherwise crawl
+LISTING_STORE_MIN_RESULTS = int(os.getenv("LISTING_STORE_MIN_RESULTS", 10))
+# Listings not seen for this many days are deleted when the store opens
+LISTING_STORE_RETENTION_DAYS = float(os.getenv("LISTING_STORE_RETENTION_DAYS", 30))
+
+COLUMNS = ("url", "source", "title", "description", "price", "price_text", "period", "purpose",
+           "property_type", "bedrooms", "bathrooms", "area_sqft", "city", "community", "location",
+           "first_seen", "last_seen")
+
+# Bumped when the table layout changes; older stores are migrated on open
+SCHEMA_VERSION = 2
+
+# Equality filters the full-text index applies itself: purpose with every combination of area, type
+# and bedrooms, one token each ('patrentxdubaimarinaxvilla'); a search uses its most selective one
+_FACET_PARTS = {"a": "replace(community, ' ', '')", "t": "property_type", "b": "ifnull(bedrooms, '')"}
+FACETS_SQL = " || ' ' || ".join(
+    f"'p{''.join(combo)}' || purpose || 'x' || " + " || 'x' || ".join(_FACET_PARTS[part] for part in combo)
+    for n in range(1, len(_FACET_PARTS) + 1) for combo in itertools.combinations(_FACET_PARTS, n)
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,             -- stable rowid for the full-text index
+    url TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    price INTEGER,                      -- AED, NULL when on request
+    price_text TEXT NOT NULL,           -- as shown on the portal
+    period TEXT,                        -- 'yearly' / 'monthly' for rent, NULL for sale or unknown
+    purpose TEXT NOT NULL,              -- 'rent' / 'sale'
+    property_type TEXT NOT NULL DEFAULT '',
+    bedrooms INTEGER,                   -- 0 = studio
+    bathrooms INTEGER,
+    area_sqft REAL,
+    city TEXT NOT NULL,                 -- emirate
+    community TEXT NOT NULL DEFAULT '', -- canonical area ('dubai marina'), '' if unknown
+    location TEXT NOT NULL DEFAULT '',  -- as shown on the portal
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    facets TEXT GENERATED ALWAYS AS ({FACETS_SQL}) VIRTUAL
+);
+CREATE INDEX IF NOT EXISTS listings_search ON listings (purpose, city, community, last_seen);
+CREATE INDEX IF NOT EXISTS listings_city ON listings (purpose, city, last_seen);
+CREATE INDEX IF NOT EXISTS listings_last_seen ON listings (last_seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS listings_fts USING fts5(
+    title, description, location, community, facets,
+    content='listings', content_rowid='id', tokenize='porter unicode61'
+);
+"""
+
+FTS_COLUMNS = ("title", "description", "location", "community", "facets")
+# BM25 weight of each searched column (facets only filter); k1 and b as FTS5's bm25()
+BM25_WEIGHTS = {"title": 8.0, "description": 1.0, "location": 3.0, "community": 3.0}
+BM25_K1, BM25_B = 1.2, 0.75
+# Text search ranks the newest matches in windows of this size (at least 4x the results asked for),
+# widening x8 twice if the filters leave too few; ranking time grows with it
+LISTING_FTS_WINDOW = int(os.getenv("LISTING_FTS_WINDOW", 500))
+# How long document frequencies (BM25's IDF) and the table size are reused before being recounted
+LISTING_FTS_STATS_TTL = float(os.getenv("LISTING_FTS_STATS_TTL", 3600))
+
+
+def _fts_row(row: str, delete: bool = False) -> str:
+    columns = ", ".join(FTS_COLUMNS)
+    values = ", ".join(f"{row}.{c}" for c in FTS_COLUMNS)
+    if delete:
+        return f"INSERT INTO listings_fts (listings_fts, rowid, {columns}) VALUES ('delete', {row}.id, {values});"
+    return f"INSERT INTO listings_fts (rowid, {columns}) VALUES ({row}.id, {values});"
+
+
+# Keep listings_fts in step with listings; re-upserting an unchanged listing doesn't touch it
+FTS_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS listings_fts_insert AFTER INSERT ON listings BEGIN
+    {_fts_row("new")}
+END;
+CREATE TRIGGER IF NOT EXISTS listings_fts_delete AFTER DELETE ON listings BEGIN
+    {_fts_row("old", delete=True)}
+END;
+CREATE TRIGGER IF NOT EXISTS listings_fts_update
+AFTER UPDATE OF title, description, location, community, property_type, bedrooms ON listings
+WHEN {" OR ".join(f"old.{c} IS NOT new.{c}" for c in FTS_COLUMNS)}
+BEGIN
+    {_fts_row("old", delete=True)}
+    {_fts_row("new")}
+END;
+"""
+DROP_FTS_TRIGGERS = """
+DROP TRIGGER IF EXISTS listings_fts_insert;
+DROP TRIGGER IF EXISTS listings_fts_delete;
+DROP TRIGGER IF EXISTS listings_fts_update;
+"""
+
+_UPSERT = (
+    f"INSERT INTO listings ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+    "ON CONFLICT(url) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in COLUMNS if c not in ("url", "first_seen"))
+)
+
+_TERM_RE = re.compile(r"[a-z][a-z']+")
+# Words the QuerySpec already covers (purpose, generic "property") on top of the parser's stopwords,
+# less the ones that are noise to the parser but describe a listing
+_NOT_TERMS = (_STOPWORDS - {"furnished", "unfurnished", "luxury"}) | {w for g in GENERIC_TYPES for w in g.split()} | {
+    "rent", "rental", "renting", "lease", "leasing", "let", "buy", "buying", "purchase", "sale", "invest"}
+
+
+def free_text_terms(query: str) -> List[str]:
+    """
+    The words of a query that the QuerySpec doesn't capture ("sea view",
+    "maid's room"): areas, cities, types, bed/bath counts, prices and
+    filler words are removed, the rest is what full-text search ranks on.
+    """
+    text = re.sub(r"(?<=\d),(?=\d{3})", "", (query or "").lower())
+    for pattern in (_RANGE_RE, _MAX_RE, _MIN_RE, _BEDS_RE, _BATHS_RE, _AREA_RE, _CITY_RE, _TYPE_RE):
+        text = pattern.sub(" ", text)
+    return list(dict.fromkeys(w for w in _TERM_RE.findall(text) if w.strip("'") not in _NOT_TERMS))
+
+
+def _quote(token: str) -> str:
+    return '"' + token.replace('"', '""') + '"'
+
+
+def spec_facets(spec: Optional[QuerySpec]) -> List[str]:
+    """
+    listings.facets tokens for the spec's area/type/bedroom filters (the most
+    selective combination), any of which a listing must carry: one per type
+    the searched type accepts and per bedroom count or unknown, as in ListingFilter
+    """
+    if spec is None:
+        return []
+    parts = {"a": [spec.location.replace(" ", "")] if spec.location != spec.city else None,
+             "t": list(TYPE_MATCHES.get(spec.property_type, (spec.property_type, ""))) if spec.property_type else None,
+             "b": None if spec.bedrooms is None else [str(spec.bedrooms), ""]}
+    parts = {tag: values for tag, values in parts.items() if values is not None}
+    if not parts:
+        return []
+    prefix = "p" + "".join(parts)
+    return [prefix + "x".join([spec.purpose, *values]) for values in itertools.product(*parts.values())]
+
+
+def fts_match(terms: List[str], any_term: bool = False, facets: Optional[List[str]] = None) -> str:
+    """
+    FTS5 MATCH expression: every term (or any, with `any_term`) in the
+    searched columns, and one of the facet tokens if given
+    """
+    text = "{%s} : (%s)" % (" ".join(BM25_WEIGHTS), (" OR " if any_term else " ").join(map(_quote, terms)))
+    return f"facets : ({' OR '.join(map(_quote, facets))}) AND {text}" if facets else text
+
+
+@lru_cache(maxsize=4096)
+def match_stem(term: str) -> str:
+    """
+    What to count a term by in raw text: the part of the word its porter
+    stem keeps, so 'balcony' (stem 'balconi') counts 'balconies' too
+    """
+    db = sqlite3.connect(":memory:")
+    try:
+        db.execute("CREATE VIRTUAL TABLE word USING fts5(w, tokenize='porter unicode61')")
+        db.execute("CREATE VIRTUAL TABLE stems USING fts5vocab(word, 'row')")
+        db.execute("INSERT INTO word (w) VALUES (?)", (term,))
+        stems = [row[0] for row in db.execute("SELECT term FROM stems")]
+    finally:
+        db.close()
+    if len(stems) != 1:
+        return term  # "maid's" is two tokens; match it whole
+    return os.path.commonprefix([term, stems[0]]) or term
+
+
+def _filters(spec: Optional[QuerySpec], max_age: Optional[float], table: str = "") -> Tuple[List[str], List[Any]]:
+    """
+    SQL conditions (on `table`.column) for the structured part of a search.
+    Type, bedrooms, bathrooms and price follow ListingFilter, so a search
+    answered from the store keeps what a fresh crawl's filter would: unknown
+    values pass and a type accepts its TYPE_MATCHES. The area stays exact:
+    the store's unknown-area rows came from crawls of other areas.
+    """
+    where: List[str] = []
+    args: List[Any] = []
+    if max_age is not None:
+        where.append(f"{table}last_seen >= ?")
+        args.append(time.time() - max_age)
+    if spec is None:
+        return where, args
+    where += [f"{table}purpose = ?", f"{table}city = ?"]
+    args += [spec.purpose, spec.city]
+    if spec.location != spec.city:
+        where.append(f"{table}community = ?")
+        args.append(spec.location)
+    # Prices and budgets both per year: monthly rents annualised here, monthly budgets by QuerySpec
+    price = f"(CASE WHEN {table}period = 'monthly' THEN {table}price * 12 ELSE {table}price END)"
+    if spec.property_type:
+        types = TYPE_MATCHES.get(spec.property_type, (spec.property_type, ""))
+        where.append(f"{table}property_type IN ({', '.join('?' * len(types))})")
+        args += types
+    for column, op, value in ((f"{table}bedrooms", "=", spec.bedrooms),
+                              (f"{table}bathrooms", ">=", spec.bathrooms),
+                              (price, ">=", spec.yearly_min_price),
+                              (price, "<=", spec.yearly_max_price)):
+        if value is not None:
+            where.append(f"({column} {op} ? OR {column} IS NULL)")
+            args.append(value)
+    return where, args
+
+
+# Portal URL segments that say which side of the market a page is ('/en/rent/...', '/to-buy/...')
+_LINK_PURPOSE_RE = re.compile(r"[/-](rent|buy|sale)(?:[/?#-]|$)")
+
+
+def listing_purpose(listing: Listing, default: str) -> str:
+    """
+    'rent' / 'sale' as the listing itself says: its link (or the page it
+    was read from), else a per-month/-year price means rent; else `default`
+    """
+    if m := _LINK_PURPOSE_RE.search(listing.link.lower()):
+        return "rent" if m.group(1) == "rent" else "sale"
+    return "rent" if listing.period else default
+
+
+def normalize_listing(listing: Listing, spec: QuerySpec, now: float) -> Dict[str, Any]:
+    """
+    Listing → store row, from what the card says: the numbers Listing.parse
+    read, community and type from its text ('' when it doesn't say). A
+    fallback page or a losing URL can return listings of another area or
+    purpose than the spec that was crawled, so only purpose (when neither
+    link nor price tells) and city fall back to the spec.
+    """
+    purpose = listing_purpose(listing, spec.purpose)
+    period = listing.period
+    if purpose == "sale":
+        period = None
+    elif listing.price_aed is not None and period is None:
+        period = "yearly"  # UAE rents are quoted per year unless stated
+
+    return {
+        "url": listing.link,
+        "source": listing.source,
+        "title": listing.title,
+        "description": listing.description,
+        "price": listing.price_aed,
+        "price_text": listing.price,
+        "period": period,
+        "purpose": purpose,
+        "property_type": listing.property_type,
+        "bedrooms": listing.bedrooms,
+        "bathrooms": listing.bathrooms,
+        "area_sqft": listing.area_sqft,
+        "city": listing.city or spec.city,
+        "community": listing.areas[0] if listing.areas else "",
+        "location": listing.location,
+        "first_seen": now,
+        "last_seen": now,
+    }
+
+
+def _unique_urls(rows: List[Dict[str, Any]]):
+    """
+    Cards without their own link carry the search page URL (or '#'); give
+    those a per-listing fragment so they don't overwrite each other.
+    """
+    counts = Counter(row["url"] for row in rows)
+    for row in rows:
+        if counts[row["url"]] > 1 or not row["url"].startswith("http"):
+            signature = f"{row['title']}|{row['price_text']}|{row['location']}".lower()
+            row["url"] = f"{row['url']}#{hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _ranked_sql(stems: List[str], idf: List[float], avg_length: float, where: List[str], window: int,
+                limit: int) -> str:
+    """
+    The newest `window` index matches, filtered by `where` and ranked by
+    BM25 (best first). Term frequencies count each term's match_stem in
+    the lower-cased columns; the first column is how many matches the window held.
+    Parameters: the MATCH expression, `where`'s, then each stem once per BM25 column.
+    """
+    texts = [f"lower(l.{c}) AS c{i}" for i, c in enumerate(BM25_WEIGHTS)]
+    tf = [" + ".join(f"{weight} * ((length(c{i}) - length(replace(c{i}, ?, ''))) / {len(stem)})"
+                     for i, weight in enumerate(BM25_WEIGHTS.values())) for stem in stems]
+    length = " + ".join(f"length(c{i})" for i in range(len(BM25_WEIGHTS)))
+    score = " + ".join(f"{w} * tf{i} * {BM25_K1 + 1} / (tf{i} + {BM25_K1} * ({1 - BM25_B} + {BM25_B} * dl))"
+                       for i, w in enumerate(idf))
+    return (f"WITH hits AS MATERIALIZED (SELECT rowid AS id FROM listings_fts WHERE listings_fts MATCH ? "
+            f"ORDER BY rowid DESC LIMIT {int(window)}), "
+            f"texts AS MATERIALIZED (SELECT l.id, {', '.join(texts)} FROM hits JOIN listings l ON l.id = hits.id "
+            f"WHERE {' AND '.join(where) or '1'}), "
+            f"tfs AS MATERIALIZED (SELECT id, {', '.join(f'{expr} AS tf{i}' for i, expr in enumerate(tf))}, "
+            f"({length}) / {float(avg_length)} AS dl FROM texts), "
+            f"top AS MATERIALIZED (SELECT id, {score} AS score FROM tfs ORDER BY score DESC LIMIT {int(limit)}) "
+            f"SELECT (SELECT COUNT(*) FROM hits), {', '.join('l.' + c for c in COLUMNS)} "
+            f"FROM top JOIN listings l ON l.id = top.id ORDER BY top.score DESC")
+
+
+class ListingStore:
+    """
+    Every listing any crawler has returned, one row per listing URL, in a
+    SQLite database (WAL, so readers don't block the writer). Crawls upsert
+    their pages in batches; `search` answers a QuerySpec from listings seen
+    recently enough, and `text_search` ranks free text with BM25 over an
+    FTS5 index the upserts keep current. Safe to share between threads.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH):
+        self.path = path or ":memory:"  # No path: a per-process store
+        self.stats = {"upserts": 0, "rows_written": 0, "searches": 0, "text_searches": 0, "answered": 0,
+                      "pruned": 0}
+        self._lock = threading.RLock()
+        self._corpus: Optional[Tuple[float, int, float]] = None  # (expires, listings, mean text length)
+        self._doc_freq: Dict[str, int] = {}
+        self._db = self._open(self.path)
+
+    def _open(self, path: str) -> Optional[sqlite3.Connection]:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            (version,) = db.execute("PRAGMA user_version").fetchone()
+            if version < SCHEMA_VERSION and db.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'listings'").fetchone():
+                self._migrate(db, version)
+            db.executescript(SCHEMA + FTS_TRIGGERS)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Listing store disabled ({path}): {e}")
+            return None
+
+    def _migrate(self, db: sqlite3.Connection, version: int):
+        """v1 keyed listings by url alone; copy them into the v2 table (and so into the index)"""
+        logger.info(f"🔧 Migrating listing store from schema v{version} to v{SCHEMA_VERSION}")
+        db.executescript(
+            "BEGIN;"
+            "DROP INDEX IF EXISTS listings_search; DROP INDEX IF EXISTS listings_city;"
+            "DROP INDEX IF EXISTS listings_last_seen;"
+            "ALTER TABLE listings RENAME TO listings_old;"
+            + SCHEMA + FTS_TRIGGERS +
+            f"INSERT INTO listings ({', '.join(COLUMNS)}) SELECT {', '.join(COLUMNS)} FROM listings_old;"
+            "DROP TABLE listings_old;"
+            f"PRAGMA user_version = {SCHEMA_VERSION};"
+            "COMMIT;"
+        )
+
+    def upsert(self, listings: Iterable[Listing], spec: QuerySpec, now: Optional[float] = None) -> int:
+        """Insert or refresh `listings` (from a crawl of `spec`) in one transaction"""
+        now = time.time() if now is None else now
+        rows = [normalize_listing(prop, spec, now) for prop in listings or ()]
+        return self.upsert_rows(rows)
+
+    def upsert_rows(self, rows: List[Dict[str, Any]]) -> int:
+        """Write already-normalised rows; first_seen is kept for URLs already stored"""
+        if not rows or self._db is None:
+            return 0
+        _unique_urls(rows)
+        with self._lock:
+            try:
+                self._db.execute("BEGIN")
+                self._db.executemany(_UPSERT, [tuple(row[c] for c in COLUMNS) for row in rows])
+                self._db.execute("COMMIT")
+            except sqlite3.Error as e:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                logger.warning(f"⚠️ Listing store write failed: {e}")
+                return 0
+            self.stats["upserts"] += 1
+            self.stats["rows_written"] += len(rows)
+        return len(rows)
+
+    def search(self, spec: QuerySpec, max_age: float = LISTING_STORE_MAX_AGE,
+               limit: int = 200) -> List[Listing]:
+        """Stored listings matching `spec` seen in the last `max_age` seconds, newest first"""
+        if self._db is None:
+            return []
+        where, args = _filters(spec, max_age)
+        sql = (f"SELECT {', '.join(COLUMNS)} FROM listings WHERE {' AND '.join(where)} "
+               f"ORDER BY last_seen DESC LIMIT ?")
+        with self._lock:
+            try:
+                rows = self._db.execute(sql, (*args, limit)).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Listing store read failed: {e}")
+                return []
+            self.stats["searches"] += 1
+        return [to_listing(dict(zip(COLUMNS, row))) for row in rows]
+
+    def text_search(self, query: str, spec: Optional[QuerySpec] = None, max_age: Optional[float] = None,
+                    limit: int = 50) -> List[Listing]:
+        """
+        Listings for a free-text query, best BM25 match first, restricted to
+        `spec`'s structured filters (and to `max_age` if given). Ranks on the
+        words the spec doesn't cover; if every term can't match at once any
+        term will do, and a query with no such words is a plain `search`.
+        Ranking covers the newest LISTING_FTS_WINDOW (or 4 * `limit`) matches,
+        widened up to 64x when the filters leave fewer than `limit`.
+        """
+        if self._db is None:
+            return []
+        terms = free_text_terms(query)
+        if not terms:
+            return self.search(spec, max_age, limit) if spec is not None else []
+
+        # Rank only the newest `window` index matches: ranking cost grows with the number of matches,
+        # which for common words ("balcony") is a large share of the table
+        where, args = _filters(spec, max_age, "l.")
+        facets = spec_facets(spec)
+        stems = [match_stem(term) for term in terms]
+        stem_args = [stem for stem in stems for _ in BM25_WEIGHTS]
+        rows = []
+        with self._lock:
+            try:
+                idf, avg_length = self._idf(terms)
+                for any_term in ((False, True) if len(terms) > 1 else (False,)):
+                    match = fts_match(terms, any_term, facets)
+                    base = max(LISTING_FTS_WINDOW, 4 * limit)
+                    for window in (base, base * 8, base * 64):
+                        sql = _ranked_sql(stems, idf, avg_length, where, window, limit)
+                        rows = self._db.execute(sql, (match, *args, *stem_args)).fetchall()
+                        if len(rows) >= limit or (rows and rows[0][0] < window):
+                            break  # Enough, or every match was already ranked
+                    if rows:
+                        break
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Listing store text search failed: {e}")
+                return []
+            self.stats["text_searches"] += 1
+        return [to_listing(dict(zip(COLUMNS, row[1:]))) for row in rows]
+
+    def _idf(self, terms: List[str]) -> Tuple[List[float], float]:
+        """
+        BM25 IDF per term (as FTS5 computes it) and the mean searched text
+        length, cached for LISTING_FTS_STATS_TTL. FTS5's own bm25() recounts
+        every term's matches on each query, most of a query's time for common words.
+        """
+        now = time.time()
+        if self._corpus is None or self._corpus[0] <= now:
+            length = " + ".join(f"length({c})" for c in BM25_WEIGHTS)
+            total = self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+            avg_length = self._db.execute(
+                f"SELECT AVG({length}) FROM (SELECT * FROM listings ORDER BY id DESC LIMIT 10000)").fetchone()[0]
+            self._corpus = (now + LISTING_FTS_STATS_TTL, total, avg_length or 1.0)
+            self._doc_freq.clear()
+        _, total, avg_length = self._corpus
+        idf = []
+        for term in terms:
+            if term not in self._doc_freq:
+                self._doc_freq[term] = self._db.execute(
+                    "SELECT COUNT(*) FROM listings_fts WHERE listings_fts MATCH ?", (fts_match([term]),)).fetchone()[0]
+            found = self._doc_freq[term]
+            idf.append(max(math.log((total - found + 0.5) / (found + 0.5)), 1e-6))
+        return idf, avg_length
+
+    def answer(self, spec: QuerySpec, query: str = "", max_age: float = LISTING_STORE_MAX_AGE,
+               min_results: int = LISTING_STORE_MIN_RESULTS) -> Optional[Dict[str, List[Listing]]]:
+        """
+        Stored listings by source if at least `min_results` fresh ones match
+        `spec` (ranked by the free text of `query` when it has any), else
+        None: crawl.
+        """
+        listings = self.text_search(query, spec, max_age, limit=200) if query else self.search(spec, max_age)
+        if len(listings) < max(min_results, 1):
+            return None
+        by_source: Dict[str, List[Listing]] = {}
+        for listing in listings:
+            by_source.setdefault(listing.source, []).append(listing)
+        with self._lock:
+            self.stats["answered"] += 1
+        return by_source
+
+    @contextmanager
+    def bulk_load(self):
+        """Suspend per-row index maintenance for a large import, then rebuild the index once"""
+        if self._db is None:
+            yield self
+            return
+        with self._lock:
+            self._db.executescript(DROP_FTS_TRIGGERS)
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._db.executescript(FTS_TRIGGERS)
+            self.rebuild_index()
+
+    def rebuild_index(self):
+        """Re-derive the whole full-text index from the listings table"""
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("INSERT INTO listings_fts (listings_fts) VALUES ('rebuild')")
+
+    def optimize_index(self):
+        """Merge the index's b-trees into one; worth it after many small upserts"""
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("INSERT INTO listings_fts (listings_fts) VALUES ('optimize')")
+
+    def prune(self, older_than: float) -> int:
+        """Delete listings not seen for `older_than` seconds"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cur = self._db.execute("DELETE FROM listings WHERE last_seen < ?", (time.time() - older_than,))
+            self.stats["pruned"] += max(cur.rowcount, 0)
+            return max(cur.rowcount, 0)
+
+    def count(self) -> int:
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "listings": self.count()}
+
+
+def to_listing(row: Dict[str, Any]) -> Listing:
+    """Store row → Listing"""
+    return Listing(
+        title=row["title"],
+        price=row["price_text"],
+        location=row["location"] or (row["community"] or row["city"]).title(),
+        description=row["description"],
+        link=row["url"],
+        source=row["source"],
+        price_aed=row["price"],
+        period=row["period"],
+        bedrooms=row["bedrooms"],
+        bathrooms=row["bathrooms"],
+        area_sqft=row["area_sqft"],
+        last_seen=row["last_seen"],
+        property_type=row["property_type"],
+    )
+
+
+_default_store: Optional[ListingStore] = None
+_default_lock = threading.Lock()
+
+
+def get_listing_store() -> ListingStore:
+    """Process-wide store every crawl writes to"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ListingStore()
+            pruned = _default_store.prune(LISTING_STORE_RETENTION_DAYS * 86400)
+            if pruned:
+                logger.info(f"🧹 Pruned {pruned} listings not seen for {LISTING_STORE_RETENTION_DAYS:.0f} days")
+        return _default_store
+
+
+if __name__ == "__main__":
+    # Index maintenance: python -m crawlers.listing_store rebuild|optimize|stats [--path FILE]
+    import argparse
+    parser = argparse.ArgumentParser(description="Listing store maintenance")
+    parser.add_argument("command", choices=("rebuild", "optimize", "stats"))
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    args = parser.parse_args()
+    store = ListingStore(args.path)
+    start = time.perf_counter()
+    if args.command == "rebuild":
+        store.rebuild_index()
+    elif args.command == "optimize":
+        store.optimize_index()
+    print(f"{args.command}: {store.count():,} listings in {args.path} ({time.perf_counter() - start:.1f}s)")
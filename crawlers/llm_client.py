@@ -0,0 +1,29 @@
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+
+_model = None
+_lock = threading.Lock()
+
+
+def get_model():
+    """
+    The shared Gemini model, built on first use. google.generativeai is
+    heavy to import, so nothing pays for it until an LLM call is made.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                import google.generativeai as genai
+                from dotenv import load_dotenv
+
+                load_dotenv()
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                _model = genai.GenerativeModel(GEMINI_MODEL)
+                logger.info(f"🤖 Gemini client ready ({GEMINI_MODEL})")
+    return _model
@@ -0,0 +1,229 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+from .llm_client import get_model
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+# Default end-to-end budget for one generate() call, retries included
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", 8))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", 2))
+LLM_RETRY_BASE = float(os.getenv("LLM_RETRY_BASE", 0.25))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", 5))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", 30))
+# POST prompts to this URL instead of Gemini, e.g. benchmarks/fake_llm.py
+LLM_ENDPOINT = os.getenv("LLM_ENDPOINT")
+
+# (prompt, timeout, schema) -> text; with a schema the answer must be JSON matching it
+Transport = Callable[[str, float, Optional[Dict[str, Any]]], str]
+
+
+def gemini_transport(prompt: str, timeout: float, schema: Optional[Dict[str, Any]] = None) -> str:
+    config = None
+    if schema is not None:
+        config = {"response_mime_type": "application/json", "response_schema": schema}
+    return get_model().generate_content(prompt, generation_config=config,
+                                        request_options={"timeout": timeout}).text
+
+
+def http_transport(endpoint: str) -> Transport:
+    """Transport for an HTTP LLM: POST {"prompt", "schema"} → {"text"}"""
+    def send(prompt: str, timeout: float, schema: Optional[Dict[str, Any]] = None) -> str:
+        import requests
+        response = requests.post(endpoint, json={"prompt": prompt, "schema": schema}, timeout=timeout)
+        response.raise_for_status()
+        return response.json()["text"]
+    return send
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `cooldown` seconds; then lets a single trial call through (half-open),
+    which closes it on success or re-opens it on failure. A trial that ends
+    without reaching the endpoint must hand its turn back (`release_trial`).
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self._opened_at = 0.0
+        self._trial = False
+        self._trial_owner: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state, self._trial = "half_open", False
+            if self.state == "half_open" and not self._trial:
+                self._trial, self._trial_owner = True, threading.get_ident()
+                return True
+            return False
+
+    def release_trial(self):
+        """Give back this thread's unresolved half-open trial so the next call can probe"""
+        with self._lock:
+            if self.state == "half_open" and self._trial and self._trial_owner == threading.get_ident():
+                self._trial, self._trial_owner = False, None
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.state, self.failures, self._trial = "closed", 0, False
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opened += 1
+                    logger.warning(f"🔌 LLM circuit open after {self.failures} failures; "
+                                   f"retrying in {self.cooldown:.0f}s")
+                self.state, self._opened_at, self._trial = "open", time.monotonic(), False
+
+
+class LLMGateway:
+    """
+    The one way out to the LLM. At most `max_concurrency` calls are in flight
+    (a call that overran its deadline still holds its slot until the
+    transport gives up), each generate() has a deadline covering its retries,
+    failures are retried with full-jitter backoff, and a circuit breaker
+    stops hammering a dead endpoint. Whenever no answer arrives in time the
+    caller's deterministic `fallback` is returned instead (None if not given).
+    """
+
+    def __init__(self, transport: Transport, max_concurrency: int = 8, deadline: float = 8,
+                 retries: int = 2, retry_base: float = 0.25, breaker: Optional[CircuitBreaker] = None):
+        self.transport = transport
+        self.max_concurrency = max(1, max_concurrency)
+        self.deadline = deadline
+        self.retries = max(0, retries)
+        self.retry_base = retry_base
+        self.breaker = breaker or CircuitBreaker()
+        self.stats = {"calls": 0, "ok": 0, "errors": 0, "timeouts": 0, "retries": 0,
+                      "fallbacks": 0, "short_circuited": 0, "saturated": 0}
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _done(self, _future):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def generate(self, prompt: str, deadline: Optional[float] = None,
+                 fallback: Optional[Callable[[], Any]] = None, schema: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Text of the LLM's answer, or `fallback()` if none arrives within
+        `deadline` seconds. With a `schema` the model is asked for JSON
+        constrained to it (the caller still validates what comes back).
+        """
+        self._count("calls")
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            return self._fallback(fallback, "circuit open")
+
+        try:
+            return self._attempt(prompt, deadline_at, fallback, schema)
+        finally:
+            # Gave up before the transport answered (slots busy, deadline gone)
+            self.breaker.release_trial()
+
+    def _attempt(self, prompt: str, deadline_at: float, fallback: Optional[Callable[[], Any]],
+                 schema: Optional[Dict[str, Any]]) -> Any:
+        reason = "deadline passed"
+        for attempt in range(self.retries + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self._slots.acquire(timeout=remaining):
+                self._count("saturated")
+                reason = f"all {self.max_concurrency} LLM slots busy"
+                break
+            with self._lock:
+                self._in_flight += 1
+            future = self._executor.submit(self.transport, prompt, remaining, schema)
+            future.add_done_callback(self._done)
+
+            try:
+                text = future.result(timeout=remaining)
+            except FutureTimeout:
+                self._count("timeouts")
+                self.breaker.record(False)
+                reason = "deadline passed"
+                break
+            except Exception as e:
+                self._count("errors")
+                self.breaker.record(False)
+                reason = f"{type(e).__name__}: {e}"
+                if attempt == self.retries or not self.breaker.allow():
+                    break
+                backoff = random.uniform(0, self.retry_base * 2 ** attempt)
+                if time.monotonic() + backoff >= deadline_at:
+                    break
+                self._count("retries")
+                time.sleep(backoff)
+                continue
+
+            self.breaker.record(True)
+            self._count("ok")
+            return (text or "").strip()
+
+        return self._fallback(fallback, reason)
+
+    def _fallback(self, fallback: Optional[Callable[[], Any]], reason: str) -> Any:
+        self._count("fallbacks")
+        logger.warning(f"⚠️ LLM unavailable ({reason}), using fallback")
+        return fallback() if fallback is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "in_flight": self._in_flight,
+                    "breaker": self.breaker.state, "breaker_opened": self.breaker.opened}
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide gateway; every LLM call in the app goes through it"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(
+                http_transport(LLM_ENDPOINT) if LLM_ENDPOINT else gemini_transport,
+                max_concurrency=LLM_MAX_CONCURRENCY,
+                deadline=LLM_DEADLINE,
+                retries=LLM_RETRIES,
+                retry_base=LLM_RETRY_BASE,
+                breaker=CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN),
+            )
+        return _gateway
+
+
+def generate(prompt: str, deadline: Optional[float] = None, fallback: Optional[Callable[[], Any]] = None,
+             schema: Optional[Dict[str, Any]] = None) -> Any:
+    """`get_gateway().generate(...)`"""
+    return get_gateway().generate(prompt, deadline, fallback, schema)
+
+
+def llm_stats() -> Dict[str, Any]:
+    return get_gateway().snapshot()
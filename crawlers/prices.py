@@ -0,0 +1,145 @@
+"""
+Price normalisation: portal price text ("AED 85,000 per month", "1.95M AED",
+"AED 120k/year", "Price on request") to an integer AED amount, the rent
+period, price per sqft and a confidence flag.
+
+`normalize_prices` does a whole batch with pandas string ops (on Arrow
+strings when pyarrow is installed, so the regexes run in Arrow's C++
+kernels); `normalize_price` applies the same patterns to one string. The
+patterns stick to syntax both `re` and RE2 accept: named groups, no
+lookarounds.
+"""
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Batches smaller than this are parsed one string at a time: below it the pandas overhead costs more
+# than the vectorised regexes save
+PRICE_BATCH_MIN = int(os.getenv("PRICE_BATCH_MIN", 1500))
+# A currency-marked amount outside this range (AED) is kept but not trusted
+MIN_PRICE = 1_000
+MAX_PRICE = 2_000_000_000
+
+_CURRENCY = r"(?:aed|dhs?|dirhams?)"
+_UNIT = r"k|m|mn|mio|million|thousand|bn|billion"
+UNIT_SCALE = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "mio": 1e6, "million": 1e6, "bn": 1e9, "billion": 1e9}
+# Applied to lower-cased text with the commas removed
+CURRENCY_AMOUNT = (rf"{_CURRENCY}\s*(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>{_UNIT})?\b"
+                   rf"|(?P<amount2>\d+(?:\.\d+)?)\s*(?P<unit2>{_UNIT})?\s*{_CURRENCY}\b")
+BARE_AMOUNT = rf"(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>{_UNIT})?\b"
+# Ranges and lower bounds ("AED 1.2M - 1.5M", "From AED 900k"): the first amount is kept, not trusted
+APPROXIMATE = rf"\d\s*(?:{_UNIT})?\s*(?:-|–|to)\s*(?:aed\s*)?\d|\b(?:from|starting|onwards|approx\w*)\b"
+MONTHLY = r"\b(?:per\s*month|months?|monthly|mo|mth|pm)\b|/\s*m(?:o|th|onth)?\b"
+YEARLY = r"\b(?:per\s*(?:year|annum)|years?|yearly|yr|annual|annually|annum|pa|p\.a)\b|/\s*y(?:r|ear)?\b"
+
+_CURRENCY_AMOUNT_RE = re.compile(CURRENCY_AMOUNT)
+_BARE_AMOUNT_RE = re.compile(BARE_AMOUNT)
+_APPROXIMATE_RE = re.compile(APPROXIMATE)
+_MONTHLY_RE = re.compile(MONTHLY)
+_YEARLY_RE = re.compile(YEARLY)
+
+
+def normalize_price(text: str) -> Tuple[Optional[int], Optional[str], bool]:
+    """
+    (AED amount, 'monthly' | 'yearly' | None, confident) for one price
+    string. Confident means the amount was marked with a currency, is not
+    a range or a "from" price, and is plausible. A bare number is only
+    used if it is at least MIN_PRICE (so "Call 050 123 4567" is not a price).
+    """
+    text = (text or "").lower().replace(",", "")
+    anchored = True
+    match = _CURRENCY_AMOUNT_RE.search(text)
+    if match:
+        amount, unit = (match.group("amount"), match.group("unit")) if match.group("amount") else \
+            (match.group("amount2"), match.group("unit2"))
+    else:
+        anchored = False
+        match = _BARE_AMOUNT_RE.search(text)
+        if not match:
+            return None, None, False
+        amount, unit = match.group("amount"), match.group("unit")
+    aed = round(float(amount) * UNIT_SCALE.get(unit, 1))
+    if not anchored and aed < MIN_PRICE:
+        return None, None, False
+    period = "monthly" if _MONTHLY_RE.search(text) else "yearly" if _YEARLY_RE.search(text) else None
+    confident = anchored and MIN_PRICE <= aed < MAX_PRICE and not _APPROXIMATE_RE.search(text)
+    return aed, period, confident
+
+
+def annual_price(price_aed: Optional[int], period: Optional[str]) -> Optional[int]:
+    """The amount per year for a rent quoted per month; any other price as it is"""
+    if price_aed is None:
+        return None
+    return price_aed * 12 if period == "monthly" else price_aed
+
+
+def price_per_sqft(price_aed: Optional[int], period: Optional[str], area_sqft: Optional[float]) -> Optional[float]:
+    """AED per sqft, per year for rents (monthly prices are annualised)"""
+    if price_aed is None or not area_sqft or area_sqft <= 0:
+        return None
+    return round(annual_price(price_aed, period) / area_sqft, 2)
+
+
+@lru_cache(maxsize=None)
+def _string_dtype():
+    try:
+        import pandas as pd
+        import pyarrow as pa
+        return pd.ArrowDtype(pa.string())
+    except ImportError:
+        logger.info("ℹ️ pyarrow not installed; price normalisation uses pandas object strings")
+        return object
+
+
+def normalize_prices(prices: Sequence[str], areas: Optional[Sequence[Optional[float]]] = None):
+    """
+    `normalize_price` over a whole batch at once. Returns a DataFrame, one
+    row per price in order: price_aed (nullable Int64), period ('monthly' /
+    'yearly' / None, an object column), price_per_sqft (float, NaN when unknown) and confident
+    (bool).
+    """
+    import numpy as np
+    import pandas as pd
+
+    text = pd.Series(prices, dtype=_string_dtype()).fillna("").str.lower().str.replace(",", "", regex=False)
+    # One object array per group; Arrow gives '' for a group that didn't take part, pandas NaN
+    found = {name: column.to_numpy(dtype=object, na_value="") for name, column in
+             text.str.extract(CURRENCY_AMOUNT).fillna("").items()}
+    bare = {name: column.to_numpy(dtype=object, na_value="") for name, column in
+            text.str.extract(BARE_AMOUNT).fillna("").items()}
+    anchored = (found["amount"] != "") | (found["amount2"] != "")
+    amount = np.where(found["amount"] != "", found["amount"], np.where(anchored, found["amount2"], bare["amount"]))
+    unit = np.where(found["amount"] != "", found["unit"], np.where(anchored, found["unit2"], bare["unit"]))
+
+    scale = np.ones(len(text))
+    for name, factor in UNIT_SCALE.items():
+        scale[unit == name] = factor
+    aed = np.round(np.where(amount == "", "nan", amount).astype(float) * scale)
+    valid = ~np.isnan(aed) & (anchored | (aed >= MIN_PRICE))
+    aed = np.where(valid, aed, np.nan)
+
+    monthly = text.str.contains(MONTHLY).to_numpy(dtype=bool, na_value=False)
+    yearly = text.str.contains(YEARLY).to_numpy(dtype=bool, na_value=False)
+    approximate = text.str.contains(APPROXIMATE).to_numpy(dtype=bool, na_value=False)
+    # Filled by assignment so every row shares the two period strings (np.where would copy one per row)
+    period = np.full(len(text), None, dtype=object)
+    period[valid & yearly] = "yearly"
+    period[valid & monthly] = "monthly"
+    confident = valid & anchored & (aed >= MIN_PRICE) & (aed < MAX_PRICE) & ~approximate
+
+    per_sqft = np.full(len(text), np.nan)
+    if areas is not None:
+        area = pd.to_numeric(pd.Series(areas, dtype=object), errors="coerce").to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            per_sqft = np.round(np.where(area > 0, aed * np.where(monthly, 12, 1) / area, np.nan), 2)
+    return pd.DataFrame({
+        "price_aed": pd.array(aed, dtype="Int64"),
+        # Explicitly object: pandas 3 would infer a string column and turn every None into NaN (truthy)
+        "period": pd.Series(period, dtype=object),
+        "price_per_sqft": per_sqft,
+        "confident": confident,
+    })
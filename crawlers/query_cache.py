@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.getenv("QUERY_CACHE_PATH", os.path.join(".cache", "query_cache.sqlite3"))
+
+_NUMBER_WORDS = {"one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6", "seven": "7"}
+
+# (pattern, replacement) applied in order after lower-casing and whitespace folding
+_SYNONYMS = [
+    (r"\b(one|two|three|four|five|six|seven)\b(?=\s*(?:br|bhk|bed|beds|bedroom|bedrooms)\b)",
+     lambda m: _NUMBER_WORDS[m.group(1)]),
+    (r"\b(\d+)\s*-?\s*(?:br|bhk|bed|beds|bedroom|bedrooms)\b", r"\1 bedroom"),
+    (r"\b(\d+)\s*-?\s*(?:ba|bath|baths|bathroom|bathrooms)\b", r"\1 bathroom"),
+    (r"\b(\d+(?:\.\d+)?)\s*k\b", lambda m: str(int(float(m.group(1)) * 1_000))),
+    (r"\b(\d+(?:\.\d+)?)\s*(?:m|mn|million)\b", lambda m: str(int(float(m.group(1)) * 1_000_000))),
+    (r"\b(?:apts?|apartments|flats?)\b", "apartment"),
+    (r"\bvillas\b", "villa"),
+    (r"\bstudios\b", "studio"),
+    (r"\btownhouses\b", "townhouse"),
+    (r"\bpenthouses\b", "penthouse"),
+    (r"\b(?:offices|office spaces|office space)\b", "office"),
+    (r"\b(?:to rent|for rent|rental|renting)\b", "rent"),
+    (r"\b(?:for sale|to buy|buying|purchase)\b", "buy"),
+]
+_SYNONYMS = [(re.compile(p), r) for p, r in _SYNONYMS]
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical cache key for a free-text query: case and whitespace folded,
+    punctuation dropped, and common spellings unified ("2BR" -> "2 bedroom").
+    """
+    text = (query or "").lower()
+    text = re.sub(r"(?<=\d),(?=\d{3})", "", text)
+    text = re.sub(r"[^\w\s.+-]", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    for pattern, repl in _SYNONYMS:
+        text = pattern.sub(repl, text)
+    return re.sub(r"\s+", " ", text).strip(" .")
+
+
+class QueryCache:
+    """
+    Two-tier TTL cache for query-understanding results: an in-memory LRU in
+    front of a SQLite table that survives restarts. Safe to share between
+    threads; values must be JSON-serialisable.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, ttl: float = 24 * 3600,
+                 max_size: int = 10_000, memory_size: int = 512):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.memory_size = memory_size
+        self.stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db = self._open(path)
+
+    def _open(self, path: Optional[str]) -> Optional[sqlite3.Connection]:
+        if not path:
+            return None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS query_cache_accessed ON query_cache (accessed_at)")
+            return db
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Query cache disk tier disabled ({path}): {e}")
+            return None
+
+    def _remember(self, key: str, value: Any, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, query: str) -> Optional[Any]:
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return entry[0]
+            if entry:
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, created_at FROM query_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row and now - row[1] < self.ttl:
+                        self._db.execute("UPDATE query_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        value = json.loads(row[0])
+                        self._remember(key, value, row[1])
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                        return value
+                    if row:
+                        self._db.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+                except (sqlite3.Error, ValueError) as e:
+                    logger.warning(f"⚠️ Query cache read failed: {e}")
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, query: str, value: Any):
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), now, now),
+                )
+                self._evict(now)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Query cache write failed: {e}")
+
+    def _evict(self, now: float):
+        cur = self._db.execute("DELETE FROM query_cache WHERE created_at < ?", (now - self.ttl,))
+        evicted = cur.rowcount
+        (count,) = self._db.execute("SELECT COUNT(*) FROM query_cache").fetchone()
+        if count > self.max_size:
+            cur = self._db.execute(
+                "DELETE FROM query_cache WHERE key IN ("
+                " SELECT key FROM query_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_size,),
+            )
+            evicted += cur.rowcount
+        self.stats["evictions"] += max(evicted, 0)
+
+    def get_or_compute(self, query: str, compute: Callable[[str], Any]) -> Any:
+        value = self.get(query)
+        if value is None:
+            value = compute(query)
+            if value is not None:
+                self.set(query, value)
+        return value
+
+    def seed(self, entries: Dict[str, Any]):
+        """Pre-load known answers, e.g. for the quick-search buttons"""
+        for query, value in entries.items():
+            self.set(query, value)
+
+    def prime(self, queries: Iterable[str], compute: Callable[[str], Any]):
+        """Compute and store any of `queries` not already cached"""
+        for query in queries:
+            self.get_or_compute(query, compute)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_cache")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "memory_entries": len(self._memory),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
+
+
+_default_cache: Optional[QueryCache] = None
+_default_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryCache:
+    """Process-wide cache shared by every Streamlit session and crawler"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache(
+                ttl=float(os.getenv("QUERY_CACHE_TTL", 24 * 3600)),
+                max_size=int(os.getenv("QUERY_CACHE_MAX_SIZE", 10_000)),
+            )
+        return _default_cache
@@ -0,0 +1,255 @@
+import re
+from typing import Optional, Tuple
+
+from .query_spec import QuerySpec, default_purpose
+
+# Area aliases → canonical area name (lower case). Longest alias wins.
+AREAS = {
+    'jvc': 'jumeirah village circle',
+    'jumeirah village circle': 'jumeirah village circle',
+    'jvt': 'jumeirah village triangle',
+    'jumeirah village triangle': 'jumeirah village triangle',
+    'marina': 'dubai marina',
+    'dubai marina': 'dubai marina',
+    'jbr': 'jumeirah beach residence',
+    'jumeirah beach residence': 'jumeirah beach residence',
+    'downtown': 'downtown dubai',
+    'downtown dubai': 'downtown dubai',
+    'jlt': 'jumeirah lake towers',
+    'jumeirah lake towers': 'jumeirah lake towers',
+    'business bay': 'business bay',
+    'difc': 'difc',
+    'palm jumeirah': 'palm jumeirah',
+    'the palm': 'palm jumeirah',
+    'deira': 'deira',
+    'bur dubai': 'bur dubai',
+    'jumeirah': 'jumeirah',
+    'al barsha': 'al barsha',
+    'barsha': 'al barsha',
+    'dubai hills': 'dubai hills estate',
+    'arabian ranches': 'arabian ranches',
+    'dubai investment park': 'dubai investment park',
+    'dip': 'dubai investment park',
+    'motor city': 'motor city',
+    'sports city': 'dubai sports city',
+    'silicon oasis': 'dubai silicon oasis',
+    'international city': 'international city',
+    'discovery gardens': 'discovery gardens',
+    'al nahda': 'al nahda',
+    'al reem': 'al reem island',
+    'reem island': 'al reem island',
+    'yas island': 'yas island',
+    'saadiyat': 'saadiyat island',
+    'al majaz': 'al majaz',
+    'al khan': 'al khan',
+}
+
+# Areas outside Dubai; everything else in AREAS is in Dubai
+AREA_CITY = {
+    'al reem island': 'abu dhabi',
+    'yas island': 'abu dhabi',
+    'saadiyat island': 'abu dhabi',
+    'al majaz': 'sharjah',
+    'al khan': 'sharjah',
+}
+
+CITIES = {
+    'dubai': 'dubai',
+    'abu dhabi': 'abu dhabi',
+    'abudhabi': 'abu dhabi',
+    'sharjah': 'sharjah',
+    'ajman': 'ajman',
+    'ras al khaimah': 'ras al khaimah',
+    'rak': 'ras al khaimah',
+}
+
+PROPERTY_TYPES = {
+    'apartment': 'apartment',
+    'flat': 'apartment',
+    'apt': 'apartment',
+    'duplex': 'apartment',
+    'studio': 'studio',
+    'villa': 'villa',
+    'townhouse': 'townhouse',
+    'town house': 'townhouse',
+    'penthouse': 'penthouse',
+    'office': 'office',
+}
+GENERIC_TYPES = ('property', 'properties', 'home', 'homes', 'house', 'houses', 'real estate')
+
+NUMBER_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7}
+
+RENT_WORDS = ('rent', 'rental', 'renting', 'lease', 'leasing', 'to let')
+SALE_WORDS = ('buy', 'buying', 'purchase', 'for sale', 'sale', 'invest')
+
+_AREA_RE = re.compile(r'\b(' + '|'.join(re.escape(k) for k in sorted(AREAS, key=len, reverse=True)) + r')\b')
+_CITY_RE = re.compile(r'\b(' + '|'.join(re.escape(k) for k in sorted(CITIES, key=len, reverse=True)) + r')\b')
+_TYPE_RE = re.compile(r'\b(' + '|'.join(re.escape(k) for k in sorted(PROPERTY_TYPES, key=len, reverse=True)) + r')s?\b')
+_BEDS_RE = re.compile(r'\b(\d+|one|two|three|four|five|six|seven)\s*-?\s*(?:br|bhk|beds?|bedrooms?)\b')
+_BATHS_RE = re.compile(r'\b(\d+|one|two|three|four|five|six|seven)\s*-?\s*(?:ba|baths?|bathrooms?)\b')
+_LOOSE_LOCATION_RE = re.compile(r'\b(?:in|at|near)\s+([a-z][a-z\s]+?)(?=\s+(?:under|below|over|above|with|for|max|min|between|from|budget)\b|[,.]|$)')
+
+_AMOUNT = r'(?:aed\s*)?(\d+(?:\.\d+)?)\s*(k|m|mn|million|thousand)?(?:\s*aed)?'
+_MAX_RE = re.compile(r'\b(?:under|below|max(?:imum)?|up\s+to|less\s+than|budget(?:\s+of)?|within)\s+' + _AMOUNT + r'\b')
+_MIN_RE = re.compile(r'\b(?:over|above|min(?:imum)?|from|more\s+than|at\s+least|starting)\s+' + _AMOUNT + r'\b')
+_RANGE_RE = re.compile(r'\b(?:between\s+)?' + _AMOUNT + r'\s*(?:-|to|and)\s*' + _AMOUNT + r'\b')
+# An amount with no under/over word ("villa in arabian ranches 3m"): only a budget if it has a unit or AED
+_BARE_AMOUNT_RE = re.compile(r'\b' + _AMOUNT + r'\b')
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+# "8000 per month", "5k monthly", "6000 a month", "90k/yr"
+_BUDGET_PERIOD_RE = re.compile(r'(?:\b(?:per|a|an|each)\s+|/\s*)(month|mo|year|yr|annum)\b'
+                               r'|\b(monthly|yearly|annually|annual|pm|pa)\b')
+_MONTHLY_WORDS = ('month', 'mo', 'monthly', 'pm')
+
+# A budget this large with no rent/sale word means buying
+SALE_BUDGET_MIN = 1_000_000
+
+_STOPWORDS = {
+    'a', 'an', 'the', 'i', 'me', 'my', 'we', 'want', 'need', 'looking', 'look', 'for', 'to', 'in', 'at',
+    'near', 'with', 'and', 'or', 'of', 'show', 'find', 'search', 'please', 'some', 'any', 'available',
+    'cheap', 'affordable', 'luxury', 'new', 'good', 'nice', 'spaces', 'space', 'area', 'uae', 'aed',
+    'per', 'year', 'yearly', 'month', 'monthly', 'mo', 'yr', 'annum', 'annual', 'annually', 'pm', 'pa', 'each',
+    'budget', 'under', 'below', 'over', 'above', 'max',
+    'maximum', 'min', 'minimum', 'between', 'from', 'up', 'less', 'than', 'more', 'least', 'within',
+    'starting', 'bed', 'beds', 'bedroom', 'bedrooms', 'br', 'bhk', 'bath', 'baths', 'bathroom',
+    'bathrooms', 'ba', 'k', 'm', 'mn', 'million', 'thousand', 'furnished', 'unfurnished', 'family',
+}
+
+
+def _amount(value: str, unit: Optional[str]) -> Optional[int]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if unit == 'k' or unit == 'thousand':
+        number *= 1_000
+    elif unit in ('m', 'mn', 'million'):
+        number *= 1_000_000
+    # Bare small numbers ("under 90") almost always mean thousands of AED
+    elif number < 1000:
+        number *= 1_000
+    return int(number)
+
+
+def _count(text: str) -> int:
+    return NUMBER_WORDS.get(text) or int(text)
+
+
+def _strip_bed_bath(text: str) -> str:
+    """Blank out bed/bath counts so their digits are not read as prices"""
+    return _BATHS_RE.sub(' ', _BEDS_RE.sub(' ', text))
+
+
+def parse_query(query: str) -> Tuple[QuerySpec, float]:
+    """
+    Rule-based query understanding. Returns the QuerySpec and a confidence in
+    [0, 1] reflecting how much of the query the rules recognised; callers
+    fall back to the LLM when the confidence is low.
+    """
+    text = re.sub(r'(?<=\d),(?=\d{3})', '', (query or '').lower())
+    text = re.sub(r'\s+', ' ', text).strip()
+    score = 0.0
+    consumed = []
+
+    # Purpose
+    purpose, stated = default_purpose(text), True
+    if any(re.search(rf'\b{w}\b', text) for w in SALE_WORDS):
+        purpose, score = 'sale', score + 0.2
+    elif any(re.search(rf'\b{w}\b', text) for w in RENT_WORDS):
+        purpose, score = 'rent', score + 0.2
+    else:
+        stated = purpose == 'sale'
+    consumed += ['rent', 'rental', 'renting', 'lease', 'leasing', 'let', 'buy', 'buying', 'purchase', 'sale', 'invest']
+
+    # Location: known area beats city beats a loose "in <words>"
+    location, city = '', ''
+    if m := _AREA_RE.search(text):
+        location = AREAS[m.group(1)]
+        city = AREA_CITY.get(location, 'dubai')
+        score += 0.35
+        consumed += m.group(1).split()
+    if m := _CITY_RE.search(text):
+        city = CITIES[m.group(1)]
+        if not location:
+            location = city
+            score += 0.35
+        consumed += m.group(1).split()
+    if not location and (m := _LOOSE_LOCATION_RE.search(text)):
+        location = m.group(1).strip()
+        score += 0.1
+        consumed += location.split()
+
+    # Property type
+    prop_type = ''
+    if m := _TYPE_RE.search(text):
+        prop_type = PROPERTY_TYPES[m.group(1)]
+        score += 0.25
+        consumed += m.group(1).split()
+    elif any(re.search(rf'\b{w}\b', text) for w in GENERIC_TYPES):
+        score += 0.2
+    consumed += [w for g in GENERIC_TYPES for w in g.split()]
+
+    # Bedrooms / bathrooms
+    bedrooms = bathrooms = None
+    if m := _BEDS_RE.search(text):
+        bedrooms = _count(m.group(1))
+        score += 0.1
+    elif prop_type == 'studio':
+        bedrooms = 0
+    if m := _BATHS_RE.search(text):
+        bathrooms = _count(m.group(1))
+        score += 0.05
+
+    # Price
+    min_price = max_price = None
+    priced = _strip_bed_bath(text)
+    used = []  # Spans of the amounts read as prices
+    if m := _RANGE_RE.search(priced):
+        low, high = _amount(m.group(1), m.group(2) or m.group(4)), _amount(m.group(3), m.group(4))
+        if low and high and low < high:
+            min_price, max_price = low, high
+            used.append(m.span())
+    if max_price is None and (m := _MAX_RE.search(priced)):
+        max_price = _amount(m.group(1), m.group(2))
+        used.append(m.span())
+    if min_price is None and (m := _MIN_RE.search(priced)):
+        min_price = _amount(m.group(1), m.group(2))
+        used.append(m.span())
+    if min_price is None and max_price is None:
+        m = next((m for m in _BARE_AMOUNT_RE.finditer(priced) if m.group(2) or 'aed' in m.group(0)), None)
+        if m:
+            max_price = _amount(m.group(1), m.group(2))
+            used.append(m.span())
+    if min_price or max_price:
+        score += 0.1
+    if not stated and (max_price or min_price or 0) >= SALE_BUDGET_MIN:
+        purpose = 'sale'
+    budget_period = None
+    if (min_price or max_price) and (m := _BUDGET_PERIOD_RE.search(priced)):
+        budget_period = 'monthly' if (m.group(1) or m.group(2)) in _MONTHLY_WORDS else 'yearly'
+        if not stated:
+            purpose = 'rent'  # Only rents are quoted per month or year
+
+    spec = QuerySpec(
+        purpose=purpose,
+        location=location or 'dubai',
+        city=city or 'dubai',
+        property_type=prop_type,
+        bedrooms=bedrooms,
+        bathrooms=bathrooms,
+        min_price=min_price,
+        max_price=max_price,
+        budget_period=budget_period,
+    )
+
+    # Penalise words the rules could not account for
+    words = re.findall(r'[a-z]+', text)
+    known = _STOPWORDS.union(consumed, NUMBER_WORDS)
+    unknown = [w for w in words if w not in known and not w.rstrip('s') in known]
+    coverage = 1 - len(unknown) / len(words) if words else 0.0
+    confidence = min(score, 1.0) * (0.5 + 0.5 * coverage)
+    # A number that isn't a count or a price is something the rules didn't understand
+    if any(not any(start <= n.start() < end for start, end in used) for n in _NUMBER_RE.finditer(priced)):
+        confidence *= 0.5
+    return spec, round(confidence, 3)
@@ -0,0 +1,324 @@
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from .llm_gateway import generate
+from .query_cache import get_query_cache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Rule-parser confidence at or above which Gemini is not consulted
+RULE_CONFIDENCE_THRESHOLD = float(os.getenv("QUERY_RULE_CONFIDENCE", 0.55))
+
+PROPERTY_TYPES = ("apartment", "villa", "studio", "penthouse", "townhouse", "office")
+CITIES = ("dubai", "abu dhabi", "sharjah", "ajman", "ras al khaimah")
+BUDGET_PERIODS = ("monthly", "yearly")
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """
+    Site-independent search parameters, extracted once per query and mapped
+    to each portal's URL scheme by the crawler adapters.
+    """
+    purpose: str = "rent"             # 'rent' or 'sale'
+    location: str = "dubai"           # area or city, lower case ('dubai marina')
+    city: str = "dubai"               # emirate the location belongs to
+    property_type: str = ""           # one of PROPERTY_TYPES or ''
+    bedrooms: Optional[int] = None    # 0 = studio
+    bathrooms: Optional[int] = None
+    min_price: Optional[int] = None   # AED
+    max_price: Optional[int] = None   # AED
+    budget_period: Optional[str] = None  # 'monthly' / 'yearly' as the query says; None reads as per year
+
+    @property
+    def yearly_min_price(self) -> Optional[int]:
+        """min_price per year: what listing prices (annualised) and portal rent filters compare with"""
+        return _yearly(self.min_price, self.budget_period)
+
+    @property
+    def yearly_max_price(self) -> Optional[int]:
+        return _yearly(self.max_price, self.budget_period)
+
+    @property
+    def location_slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.location.lower()).strip("-") or "dubai"
+
+    @property
+    def city_slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.city.lower()).strip("-") or "dubai"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], query: str = "") -> "QuerySpec":
+        """Coerce a loosely-typed dict (e.g. LLM output) into a QuerySpec"""
+        data = data or {}
+        purpose = str(data.get("purpose") or "").lower()
+        if purpose not in ("rent", "sale"):
+            purpose = default_purpose(query)
+
+        location = str(data.get("location") or "").strip().lower().replace("-", " ") or "dubai"
+        city = str(data.get("city") or "").strip().lower().replace("-", " ")
+        if city not in CITIES:
+            city = next((c for c in CITIES if c in location), "dubai")
+
+        prop_type = str(data.get("property_type") or "").strip().lower().rstrip("s")
+        if prop_type not in PROPERTY_TYPES:
+            prop_type = ""
+
+        return cls(
+            purpose=purpose,
+            location=location,
+            city=city,
+            property_type=prop_type,
+            bedrooms=_to_int(data.get("bedrooms")),
+            bathrooms=_to_int(data.get("bathrooms")),
+            min_price=_to_int(data.get("min_price")),
+            max_price=_to_int(data.get("max_price")),
+            budget_period=period if (period := str(data.get("budget_period") or "").lower()) in BUDGET_PERIODS
+            else None,
+        )
+
+
+class SpecError(ValueError):
+    """LLM output that isn't JSON (kind 'invalid_json') or doesn't fit QUERY_SPEC_SCHEMA ('schema_error')"""
+
+    def __init__(self, message: str, kind: str = "schema_error"):
+        super().__init__(message)
+        self.kind = kind
+
+
+# Response schema for the LLM (the OpenAPI subset Gemini's response_schema accepts)
+QUERY_SPEC_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "purpose": {"type": "string", "enum": ["rent", "sale"]},
+        "location": {"type": "string", "description": "area or city in lower case, e.g. 'dubai marina'"},
+        "city": {"type": "string", "enum": list(CITIES)},
+        "property_type": {"type": "string", "enum": list(PROPERTY_TYPES), "nullable": True},
+        "bedrooms": {"type": "integer", "nullable": True, "description": "0 for studio"},
+        "bathrooms": {"type": "integer", "nullable": True},
+        "min_price": {"type": "integer", "nullable": True, "description": "AED"},
+        "max_price": {"type": "integer", "nullable": True, "description": "AED"},
+        "budget_period": {"type": "string", "enum": list(BUDGET_PERIODS), "nullable": True,
+                          "description": "'monthly' if the budget is per month"},
+    },
+    "required": ["purpose", "location", "city", "property_type", "bedrooms", "bathrooms", "min_price", "max_price",
+                 "budget_period"],
+}
+
+
+def parse_spec_json(text: str) -> QuerySpec:
+    """
+    Strict counterpart of QuerySpec.from_dict for LLM answers: the JSON must
+    have exactly the schema's fields with allowed values, otherwise SpecError
+    lists everything that is wrong (that message drives the repair prompt).
+    """
+    text = (text or "").strip()
+    fenced = re.fullmatch(r"```(?:json)?\s*(.*?)\s*```", text, re.S)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise SpecError(f"not valid JSON ({e})", kind="invalid_json")
+    if not isinstance(data, dict):
+        raise SpecError(f"expected a JSON object, got {type(data).__name__}")
+
+    fields = QUERY_SPEC_SCHEMA["properties"]
+    problems = [f"missing '{name}'" for name in QUERY_SPEC_SCHEMA["required"] if name not in data]
+    problems += [f"unexpected field '{name}'" for name in data if name not in fields]
+    for name, value in data.items():
+        rule = fields.get(name)
+        if rule is None or (value is None and rule.get("nullable")):
+            continue
+        if rule["type"] == "integer":
+            if isinstance(value, float) and value.is_integer():
+                value = data[name] = int(value)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                allowed = "a non-negative integer or null" if rule.get("nullable") else "a non-negative integer"
+                problems.append(f"'{name}' must be {allowed}, got {value!r}")
+        elif not isinstance(value, str) or not value.strip():
+            problems.append(f"'{name}' must be a non-empty string, got {value!r}")
+        elif "enum" in rule and value.strip().lower() not in rule["enum"]:
+            problems.append(f"'{name}' must be one of {rule['enum']}, got {value!r}")
+    if not problems and None not in (data["min_price"], data["max_price"]) and data["min_price"] > data["max_price"]:
+        problems.append(f"min_price {data['min_price']} is above max_price {data['max_price']}")
+    if problems:
+        raise SpecError("; ".join(problems))
+
+    return QuerySpec(
+        purpose=data["purpose"].strip().lower(),
+        location=data["location"].strip().lower().replace("-", " "),
+        city=data["city"].strip().lower(),
+        property_type=(data["property_type"] or "").strip().lower(),
+        bedrooms=data["bedrooms"],
+        bathrooms=data["bathrooms"],
+        min_price=data["min_price"],
+        max_price=data["max_price"],
+        budget_period=(data["budget_period"] or "").strip().lower() or None,
+    )
+
+
+class ParseStats:
+    """
+    Outcomes of LLM spec extraction: ok first time, invalid_json /
+    schema_error on the first answer, then repaired or failed, plus
+    unavailable when the gateway fell back before any answer.
+    """
+
+    OUTCOMES = ("ok", "invalid_json", "schema_error", "repaired", "failed", "unavailable")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def record(self, outcome: str):
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {outcome: self._counts[outcome] for outcome in self.OUTCOMES}
+        answered = counts["ok"] + counts["invalid_json"] + counts["schema_error"]
+        rejected = counts["invalid_json"] + counts["schema_error"]
+        return {
+            **counts,
+            "answered": answered,
+            # Share of first answers that had to be thrown away or repaired
+            "parse_failure_rate": rejected / answered if answered else 0.0,
+            # Share of answered extractions that still ended on the rule-based spec
+            "unrecovered_rate": counts["failed"] / answered if answered else 0.0,
+        }
+
+
+parse_stats = ParseStats()
+
+
+def _yearly(amount: Optional[int], period: Optional[str]) -> Optional[int]:
+    return amount * 12 if amount is not None and period == "monthly" else amount
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(float(str(value).replace(",", "")))
+    except (TypeError, ValueError):
+        return None
+
+
+def default_purpose(query: str) -> str:
+    query = (query or "").lower()
+    if any(w in query for w in ("buy", "sale", "purchase")):
+        return "sale"
+    return "rent"
+
+
+def extract_query_spec(query: str, threshold: Optional[float] = None) -> QuerySpec:
+    """
+    Turn a free-text query into a QuerySpec. The rule-based parser answers
+    first; Gemini (through the query cache) is only consulted when the rules
+    are less confident than `threshold`, and the rule result is kept if the
+    LLM fails.
+    """
+    from .query_parser import parse_query
+
+    threshold = RULE_CONFIDENCE_THRESHOLD if threshold is None else threshold
+    spec, confidence = parse_query(query)
+    if confidence >= threshold:
+        logger.info(f"⚡ Rule-parsed query spec ({confidence:.2f}): {spec}")
+        return spec
+
+    data = get_query_cache().get_or_compute(query, _llm_extract)
+    if data is None:
+        logger.info(f"⚡ LLM unavailable, using rule-parsed spec ({confidence:.2f}): {spec}")
+        return spec
+    spec = QuerySpec.from_dict(data, query)
+    logger.info(f"🧠 Query spec: {spec}")
+    return spec
+
+
+def prime_query_cache(queries, threshold: Optional[float] = None) -> None:
+    """
+    Resolve ahead of time the `queries` extract_query_spec would send to the
+    LLM, so the first user to ask them skips it; ones the rules answer are left alone.
+    """
+    from .query_parser import parse_query
+
+    threshold = RULE_CONFIDENCE_THRESHOLD if threshold is None else threshold
+    get_query_cache().prime([q for q in queries if parse_query(q)[1] < threshold], _llm_extract)
+
+
+def _extract_prompt(query: str) -> str:
+    return f"""
+    Extract real estate search parameters for a UAE property search:
+    - purpose: 'rent' or 'sale'
+    - location: area or city in lower case (e.g., 'dubai marina', 'downtown dubai', 'sharjah')
+    - city: emirate of the location ('dubai', 'abu dhabi', 'sharjah', 'ajman', 'ras al khaimah')
+    - property_type: one of 'apartment', 'villa', 'studio', 'penthouse', 'townhouse', 'office' or null
+    - bedrooms: number (0 for studio) or null
+    - bathrooms: number or null
+    - min_price: AED amount or null
+    - max_price: AED amount or null
+    - budget_period: 'monthly' if the budget is per month, 'yearly' if per year, else null
+
+    Query: "{query}"
+
+    Return only JSON matching the schema, with every field present.
+    """
+
+
+def _repair_prompt(query: str, answer: str, error: "SpecError") -> str:
+    return f"""
+    Your previous answer to a property search extraction was rejected: {error}
+
+    Query: "{query}"
+    Previous answer: {answer[:1000]}
+
+    Return only the corrected JSON object matching the schema, with every field present.
+    """
+
+
+def _llm_extract(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Schema-constrained Gemini call, strictly validated. An invalid answer
+    gets one repair round-trip; returns the spec dict, or None if the LLM
+    was unavailable or still wrong.
+    """
+    text = generate(_extract_prompt(query), schema=QUERY_SPEC_SCHEMA)
+    if text is None:
+        parse_stats.record("unavailable")
+        return None  # Gateway fell back; the caller keeps the rule-based spec
+    try:
+        spec = parse_spec_json(text)
+        parse_stats.record("ok")
+        return spec.to_dict()
+    except SpecError as e:
+        error = e
+        parse_stats.record(e.kind)
+        logger.warning(f"⚠️ LLM query spec rejected ({e}); asking for a repair")
+
+    text = generate(_repair_prompt(query, text, error), schema=QUERY_SPEC_SCHEMA)
+    if text is None:
+        parse_stats.record("failed")
+        return None
+    try:
+        spec = parse_spec_json(text)
+        parse_stats.record("repaired")
+        return spec.to_dict()
+    except SpecError as e:
+        parse_stats.record("failed")
+        logger.error(f"❌ LLM query spec still invalid after repair: {e}")
+        return None
@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Injected into every document (via CDP where available): counts in-flight
+# fetch/XHR requests and records the time of the last DOM mutation, so the
+# readiness check can tell "network idle" and "DOM quiet" from Python.
+READINESS_HOOK_JS = """
+(function () {
+    if (window.__psReady) return;
+    var state = window.__psReady = {inflight: 0, lastMutation: Date.now()};
+    var origFetch = window.fetch;
+    if (origFetch) {
+        window.fetch = function () {
+            state.inflight++;
+            return origFetch.apply(this, arguments).finally(function () { state.inflight--; });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.inflight++;
+        this.addEventListener('loadend', function () { state.inflight--; }, {once: true});
+        return origSend.apply(this, arguments);
+    };
+    var observe = function () {
+        new MutationObserver(function () { state.lastMutation = Date.now(); })
+            .observe(document.documentElement, {childList: true, subtree: true});
+    };
+    if (document.documentElement) observe(); else document.addEventListener('DOMContentLoaded', observe);
+})();
+"""
+
+_PROBE_JS = READINESS_HOOK_JS + """
+var stale = arguments[1];
+var s = window.__psReady;
+return {
+    count: document.querySelectorAll(arguments[0]).length,
+    noResults: arguments[2] ? document.querySelector(arguments[2]) !== null : false,
+    readyState: document.readyState,
+    inflight: s.inflight,
+    quietMs: Date.now() - s.lastMutation,
+    staleGone: stale ? !stale.isConnected : true
+};
+"""
+
+# Per-site readiness: card selector, the site's "no results" message, minimum
+# cards, hard cap, and the fixed sleep the wait replaced (for the latency-saved metric)
+SITE_READINESS: Dict[str, Dict[str, Any]] = {
+    "property_finder": {
+        "selector": 'article[data-testid="property-card"], div[data-testid="property-card"], .property-card, .listing-item, article.card',
+        "empty_selector": '[data-testid="no-results"], [data-testid="search-no-results"], .no-results',
+        "min_count": 2, "max_wait": 10, "baseline": 5,
+    },
+    "property_finder_next": {
+        "selector": 'article[data-testid="property-card"], div[data-testid="property-card"], .property-card, .listing-item, article.card',
+        "empty_selector": '[data-testid="no-results"], [data-testid="search-no-results"], .no-results',
+        "min_count": 2, "max_wait": 8, "baseline": 3,
+    },
+    "find_properties": {
+        "selector": "div.property-card, .listing, .card",
+        "empty_selector": ".no-results, .no-properties, .empty-results",
+        "min_count": 1, "max_wait": 8, "baseline": 4,
+    },
+    "bayut": {
+        "selector": 'article, [data-testid="listing-card"], .listingCard, [data-qa="SEARCH_RESULT_ITEM"], div[data-index]',
+        "empty_selector": '[data-testid="no-results"], [aria-label="No results"], .no-results',
+        "min_count": 1, "max_wait": 15, "baseline": 10,
+    },
+}
+
+DEFAULT_STABLE_FOR = 0.3   # card count unchanged for this long
+DEFAULT_QUIET_FOR = 0.25   # no DOM mutations for this long
+SETTLED_AFTER = 1.5        # card count this stable counts as ready despite busy network/DOM
+EMPTY_AFTER = 1.0          # loaded, network idle and DOM quiet this long with no cards: no results
+POLL_INTERVAL = 0.1
+
+# A probe failing like this means the driver is gone (quit, aborted or crashed),
+# not that the document is mid-navigation: polling again can't help
+_DEAD_DRIVER_ERRORS = ("InvalidSessionIdException", "NoSuchWindowException", "MaxRetryError",
+                       "NewConnectionError", "ProtocolError")
+_DEAD_DRIVER_MESSAGES = ("invalid session id", "disconnected", "not reachable", "no such window",
+                         "connection refused", "session deleted")
+
+
+def _driver_gone(error: Exception) -> bool:
+    if isinstance(error, ConnectionError) or type(error).__name__ in _DEAD_DRIVER_ERRORS:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _DEAD_DRIVER_MESSAGES)
+
+
+def install_hooks(driver) -> bool:
+    """Register the readiness hook for every future document of `driver`"""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": READINESS_HOOK_JS})
+        return True
+    except Exception as e:
+        logger.debug(f"Readiness hook not installed via CDP: {e}")
+        return False
+
+
+class ReadinessTimings:
+    """Thread-safe per-site record of readiness waits and the time they saved"""
+
+    def __init__(self, keep: int = 500):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[tuple]] = {}
+
+    def record(self, site: str, elapsed: float, ready: bool, baseline: float):
+        with self._lock:
+            samples = self._samples.setdefault(site, [])
+            samples.append((elapsed, ready, baseline - elapsed))
+            del samples[:-self.keep]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            snapshot = {site: list(samples) for site, samples in self._samples.items()}
+        result = {}
+        for site, samples in snapshot.items():
+            waits = sorted(s[0] for s in samples)
+            result[site] = {
+                "waits": len(samples),
+                "p50_s": waits[len(waits) // 2],
+                "p95_s": waits[min(len(waits) - 1, int(len(waits) * 0.95))],
+                "timeouts": sum(1 for s in samples if not s[1]),
+                "saved_s": sum(s[2] for s in samples),
+            }
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+timings = ReadinessTimings()
+
+
+def wait_until_ready(driver, selector: str, max_wait: float = 10, min_count: int = 1,
+                     stable_for: float = DEFAULT_STABLE_FOR, quiet_for: float = DEFAULT_QUIET_FOR,
+                     stale=None, empty_selector: str = None,
+                     cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """
+    Poll the page until it looks finished: `stale` (an element from the
+    previous page) is detached, at least `min_count` nodes match `selector`
+    and that count has held for `stable_for`, no fetch/XHR is in flight and
+    the DOM has been quiet for `quiet_for` (or the count has simply held for
+    SETTLED_AFTER). Gives up after `max_wait`, or as soon as the page shows
+    `empty_selector` or has finished loading with no cards (EMPTY_AFTER).
+    Returns the last probe plus `ready`, `empty` and `elapsed`; `aborted`
+    is set when `cancel` fired or the driver died, which also ends the wait.
+    """
+    start = time.monotonic()
+    deadline = start + max_wait
+    last_count, count_since = -1, start
+    probe: Dict[str, Any] = {}
+
+    while True:
+        now = time.monotonic()
+        if cancel is not None and cancel.is_set():
+            probe.update(ready=False, empty=False, aborted=True, elapsed=now - start)
+            return probe
+        try:
+            probe = driver.execute_script(_PROBE_JS, selector, stale, empty_selector) or {}
+        except Exception as e:
+            if (cancel is not None and cancel.is_set()) or _driver_gone(e):
+                logger.debug(f"Readiness wait aborted: {e}")
+                return {"ready": False, "empty": False, "aborted": True, "elapsed": now - start}
+            if stale is not None:
+                # Selenium refuses to marshal a detached element: the old page is gone
+                stale = None
+                continue
+            # Mid-navigation the document can vanish under us; try again
+            logger.debug(f"Readiness probe failed: {e}")
+            probe = {}
+
+        count = probe.get("count", 0)
+        if count != last_count:
+            last_count, count_since = count, now
+
+        stable = now - count_since
+        ready = (
+            probe.get("staleGone", False)
+            and probe.get("readyState") in ("interactive", "complete")
+            and count >= min_count
+            and stable >= stable_for
+            # Analytics beacons and carousels can keep a page "busy" forever
+            and ((probe.get("inflight", 0) <= 0 and probe.get("quietMs", 0) >= quiet_for * 1000)
+                 or stable >= SETTLED_AFTER)
+        )
+        empty = not ready and probe.get("staleGone", False) and count == 0 and (
+            probe.get("noResults", False)
+            or (probe.get("readyState") == "complete" and probe.get("inflight", 0) <= 0
+                and probe.get("quietMs", 0) >= EMPTY_AFTER * 1000)
+        )
+        if ready or empty or now >= deadline:
+            probe.update(ready=bool(ready), empty=bool(empty), elapsed=now - start)
+            return probe
+        if cancel is not None:
+            cancel.wait(POLL_INTERVAL)
+        else:
+            time.sleep(POLL_INTERVAL)
+
+
+def wait_for_listings(driver, site: str, stale=None, cancel: Optional[threading.Event] = None,
+                      **overrides) -> bool:
+    """
+    Site-aware readiness wait used in place of fixed sleeps. Records the
+    wait in `timings` and returns True if the page became ready before the
+    site's cap; returns False straight away once `cancel` is set.
+    """
+    config = {**SITE_READINESS[site], **overrides}
+    baseline = config.pop("baseline", 0)
+    result = wait_until_ready(driver, stale=stale, cancel=cancel, **config)
+    if result.get("aborted"):
+        # Cut short by the caller or a dead driver: not a page timing
+        logger.info(f"⏹️ {site}: readiness wait aborted after {result['elapsed']:.2f}s")
+        return False
+    # An empty result page is finished, not a timeout
+    timings.record(site, result["elapsed"], result["ready"] or result["empty"], baseline)
+    state = "ready" if result["ready"] else "no results" if result["empty"] else "not ready"
+    level = logging.WARNING if state == "not ready" else logging.INFO
+    logger.log(level, f"⏱️ {site}: {state} after "
+                      f"{result['elapsed']:.2f}s ({result.get('count', 0)} cards, fixed sleep was {baseline}s)")
+    return result["ready"]
+
+
+def first_match(driver, site: str):
+    """An element from the current page to pass as `stale` before navigating away"""
+    try:
+        from selenium.webdriver.common.by import By
+        found = driver.find_elements(By.CSS_SELECTOR, SITE_READINESS[site]["selector"])
+        return found[0] if found else None
+    except Exception:
+        return None
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .listing import Listing
+from .query_spec import QuerySpec
+
+logger = logging.getLogger(__name__)
+
+ResultsBySource = Dict[str, List[Listing]]
+
+
+def spec_key(spec: QuerySpec) -> str:
+    """Cache key for a search: the normalized QuerySpec, not the raw query text"""
+    return json.dumps(spec.to_dict(), sort_keys=True)
+
+
+class _Entry:
+    __slots__ = ("sources", "expected", "created_at")
+
+    def __init__(self, sources: ResultsBySource, created_at: float):
+        self.sources = sources
+        self.expected = set(sources)
+        self.created_at = created_at
+
+
+class ResultCache:
+    """
+    Stale-while-revalidate cache of crawl results, per source. Entries are
+    fresh for `fresh_ttl`, then served as stale for up to `stale_ttl` while
+    one background refresh runs; after that they are gone. Invalidating a
+    source drops its results everywhere, which makes the affected entries
+    stale so the next hit refreshes them. LRU-bounded to `max_size` searches.
+    """
+
+    def __init__(self, fresh_ttl: float = 300, stale_ttl: float = 3600, max_size: int = 256):
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = max(stale_ttl, fresh_ttl)
+        self.max_size = max_size
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "revalidations": 0,
+                      "revalidation_failures": 0, "evictions": 0, "invalidations": 0}
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refreshing = set()
+        self._served_age_total = 0.0
+        self._last_served_age: Optional[float] = None
+
+    def lookup(self, key: str) -> Tuple[Optional[ResultsBySource], str]:
+        """(results by source, "fresh" | "stale" | "miss")"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry.created_at >= self.stale_ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None, "miss"
+
+            self._entries.move_to_end(key)
+            age = now - entry.created_at
+            self._served_age_total += age
+            self._last_served_age = age
+            complete = entry.expected <= set(entry.sources)
+            state = "fresh" if age < self.fresh_ttl and complete else "stale"
+            self.stats[f"{state}_hits"] += 1
+            return dict(entry.sources), state
+
+    def store(self, key: str, results: ResultsBySource):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = _Entry(dict(results), now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, source: Optional[str] = None, key: Optional[str] = None) -> int:
+        """Drop one source's results (or whole entries when source is None); returns entries touched"""
+        touched = 0
+        with self._lock:
+            keys = [key] if key is not None else list(self._entries)
+            for k in keys:
+                entry = self._entries.get(k)
+                if entry is None:
+                    continue
+                if source is None:
+                    del self._entries[k]
+                elif entry.sources.pop(source, None) is not None:
+                    if not entry.sources:
+                        del self._entries[k]
+                else:
+                    continue
+                touched += 1
+            self.stats["invalidations"] += touched
+        return touched
+
+    def get_or_refresh(self, key: str, compute: Callable[[], ResultsBySource]) -> Tuple[ResultsBySource, str]:
+        """
+        Fresh hit: cached results. Stale hit: cached results straight away,
+        plus a background `compute` to replace them. Miss: `compute` inline.
+        Empty crawls are never stored, so an outage doesn't wipe good data.
+        """
+        results, state = self.lookup(key)
+        if state == "fresh":
+            return results, state
+        if state == "stale":
+            self.revalidate(key, compute)
+            return results, state
+
+        results = compute()
+        if any(results.values()):
+            self.store(key, results)
+        return results, state
+
+    def revalidate(self, key: str, compute: Callable[[], ResultsBySource]):
+        """Refresh `key` on a background thread, unless a refresh is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                results = compute()
+                if any(results.values()):
+                    self.store(key, results)
+                    with self._lock:
+                        self.stats["revalidations"] += 1
+                else:
+                    with self._lock:
+                        self.stats["revalidation_failures"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh failed: {e}")
+                with self._lock:
+                    self.stats["revalidation_failures"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="result-cache-refresh", daemon=True).start()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            hits = self.stats["fresh_hits"] + self.stats["stale_hits"]
+            lookups = hits + self.stats["misses"]
+            ages = [now - e.created_at for e in self._entries.values()]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "refreshing": len(self._refreshing),
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "avg_served_age": self._served_age_total / hits if hits else 0.0,
+                "last_served_age": self._last_served_age,
+                "oldest_entry_age": max(ages) if ages else 0.0,
+            }
+
+
+_default_cache: Optional[ResultCache] = None
+_default_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache shared by every Streamlit session"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(
+                fresh_ttl=float(os.getenv("RESULT_CACHE_FRESH_TTL", 300)),
+                stale_ttl=float(os.getenv("RESULT_CACHE_STALE_TTL", 3600)),
+                max_size=int(os.getenv("RESULT_CACHE_MAX_SIZE", 256)),
+            )
+        return _default_cache
@@ -0,0 +1,149 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .speculative import LinkedEvent
+
+logger = logging.getLogger(__name__)
+
+
+# fn(cancel, emit): does the work; `emit(item)` hands partial results to every waiter as they appear
+FlightFn = Callable[[threading.Event, Callable[[Any], None]], Any]
+
+
+class _Flight:
+    __slots__ = ("done", "cancel", "result", "error", "waiters", "items", "changed")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.cancel = LinkedEvent()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.items: List[Any] = []   # Everything emitted so far, replayed to late subscribers
+        self.changed = threading.Condition()
+
+    def emit(self, item: Any):
+        with self.changed:
+            self.items.append(item)
+            self.changed.notify_all()
+
+
+class Subscription:
+    """One caller's view of a flight: every item it emitted, then its result"""
+
+    def __init__(self, flights: "SingleFlight", key: str, flight: _Flight):
+        self._flights = flights
+        self._key = key
+        self._flight = flight
+        self._seen = 0
+        self._closed = False
+
+    def poll(self, timeout: Optional[float] = None) -> Tuple[List[Any], bool]:
+        """(items not seen yet, finished); waits up to `timeout` for something new"""
+        flight = self._flight
+        with flight.changed:
+            if self._seen == len(flight.items) and not flight.done.is_set():
+                flight.changed.wait(timeout)
+            items = flight.items[self._seen:]
+            self._seen += len(items)
+            return items, flight.done.is_set()
+
+    def result(self) -> Any:
+        """The flight's return value once finished; re-raises whatever it raised"""
+        if self._flight.error is not None:
+            raise self._flight.error
+        return self._flight.result
+
+    def close(self):
+        """Leave the flight; the last caller to leave an unfinished flight cancels it"""
+        if not self._closed:
+            self._closed = True
+            self._flights._leave(self._key, self._flight)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key onto one execution. The work
+    runs on its own thread so any caller may give up (timeout, Streamlit
+    rerun) without taking the result away from the others; the shared
+    cancel event is set only once the last waiter has left.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "cancelled": 0}
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def do(self, key: str, fn: FlightFn, timeout: Optional[float] = None) -> Any:
+        """
+        Run `fn(cancel_event, emit)` for `key`, or wait for the run already in
+        flight. Raises TimeoutError if this caller's `timeout` expires first,
+        and re-raises whatever `fn` raised.
+        """
+        flight = self._join(key, fn)
+        try:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"{self.name}: gave up waiting for {key!r} after {timeout}s")
+        finally:
+            self._leave(key, flight)
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def subscribe(self, key: str, fn: FlightFn) -> Subscription:
+        """
+        Like `do`, but without blocking: the Subscription replays everything
+        the flight for `key` has emitted and follows it as it goes on. Close
+        it when done with it.
+        """
+        return Subscription(self, key, self._join(key, fn))
+
+    def _join(self, key: str, fn: FlightFn) -> _Flight:
+        with self._lock:
+            self.stats["calls"] += 1
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.stats["executions"] += 1
+                threading.Thread(target=self._run, args=(key, flight, fn),
+                                 name=f"{self.name}-{len(self._flights)}", daemon=True).start()
+            else:
+                self.stats["coalesced"] += 1
+            flight.waiters += 1
+        return flight
+
+    def _run(self, key: str, flight: _Flight, fn: FlightFn):
+        try:
+            flight.result = fn(flight.cancel, flight.emit)
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            with flight.changed:
+                flight.done.set()
+                flight.changed.notify_all()
+
+    def _leave(self, key: str, flight: _Flight):
+        with self._lock:
+            flight.waiters -= 1
+            if flight.waiters > 0 or flight.done.is_set():
+                return
+            # Nobody is waiting any more: stop the work and let the next caller start afresh
+            flight.cancel.set()
+            self.stats["cancelled"] += 1
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        logger.info(f"🛑 {self.name}: last waiter left, cancelling {key!r}")
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._flights)}
@@ -0,0 +1,208 @@
+import concurrent.futures
+import logging
+import os
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+from .listing import Listing
+
+logger = logging.getLogger(__name__)
+
+# How many candidate URLs to load at once; 1 keeps the old one-by-one walk
+SPECULATIVE_FANOUT = int(os.getenv("SPECULATIVE_FANOUT", 2))
+
+OnPage = Callable[[List[Listing]], None]
+Fetch = Callable[[str, threading.Event, OnPage], List[Listing]]
+
+
+def is_well_formed(results) -> bool:
+    """A usable result set: a non-empty list of listings that each have a title and a link"""
+    return bool(results) and all(
+        isinstance(r, Listing) and r.title and r.link for r in results
+    )
+
+
+class LinkedEvent(threading.Event):
+    """
+    An Event that also reads as set once its parent is set (a caller-wide
+    cancel). Callbacks registered with `on_set` run when it is set with
+    interrupt=True (the default), including through a LinkedEvent parent, so
+    blocked work such as a page load can be killed instead of waiting for its
+    next checkpoint. `set(interrupt=False)` only asks work to stop at the next
+    checkpoint, e.g. a race loser that should hand its browser back intact.
+    `close()` unhooks a child from its parent once nothing uses it any more.
+    """
+
+    def __init__(self, parent: Optional[threading.Event] = None):
+        super().__init__()
+        self._parent = parent
+        self._interrupted = False
+        self._callbacks: List[Callable[[], None]] = []
+        self._callbacks_lock = threading.Lock()
+        self._unlink: Callable[[], None] = lambda: None
+        if isinstance(parent, LinkedEvent):
+            self._unlink = parent.on_set(self.set)
+
+    def is_set(self) -> bool:
+        return super().is_set() or (self._parent is not None and self._parent.is_set())
+
+    def set(self, interrupt: bool = True):
+        with self._callbacks_lock:
+            super().set()
+            if not interrupt or self._interrupted:
+                return
+            self._interrupted = True
+            callbacks, self._callbacks = self._callbacks, []
+        self.close()  # Nothing left for the parent's interrupt to do
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"⚠️ Cancel callback failed: {e}")
+
+    def close(self):
+        """
+        Drop the parent's reference to this event, so per-batch children of a
+        long-lived cancel don't pile up in its callbacks. `is_set` still
+        follows the parent; only interrupts stop reaching this event's callbacks.
+        """
+        unlink, self._unlink = self._unlink, lambda: None
+        unlink()
+
+    def on_set(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run `callback` once this is interrupted (now, if it already is); returns an unregister function"""
+        with self._callbacks_lock:
+            if not self._interrupted:
+                self._callbacks.append(callback)
+
+                def remove():
+                    with self._callbacks_lock:
+                        if callback in self._callbacks:
+                            self._callbacks.remove(callback)
+                return remove
+        callback()
+        return lambda: None
+
+
+def on_cancel(cancel: Optional[threading.Event], callback: Callable[[], None]) -> Callable[[], None]:
+    """`cancel.on_set(callback)` for LinkedEvents; plain Events can only be polled"""
+    if isinstance(cancel, LinkedEvent):
+        return cancel.on_set(callback)
+    return lambda: None
+
+
+class WinStats:
+    """Which candidate index wins, per site, so the URL ordering can be tuned"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wins: Dict[str, Counter] = {}
+
+    def record(self, site: str, index: Optional[int]):
+        with self._lock:
+            self._wins.setdefault(site, Counter())["none" if index is None else index] += 1
+
+    def summary(self) -> Dict[str, Dict[Any, int]]:
+        with self._lock:
+            return {site: dict(counter) for site, counter in self._wins.items()}
+
+
+win_stats = WinStats()
+
+
+class _Claim:
+    """One batch of a race: the first candidate to report a good page claims it, and only its pages go on"""
+
+    def __init__(self, cancel: LinkedEvent, is_good: Callable[[Any], bool], on_page: Optional[OnPage],
+                 fetches: int):
+        self.cancel = cancel
+        self.is_good = is_good
+        self.on_page = on_page
+        self.index: Optional[int] = None
+        self.pages: List[Listing] = []
+        self._running = fetches
+        self._lock = threading.Lock()
+
+    def finished(self, _future):
+        """Done callback of each fetch: once the last one (losers too) is over, unhook the batch's cancel"""
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            self.cancel.close()
+
+    def take(self, index: int, results) -> bool:
+        """Claim for `index` if nobody has and `results` are good; True if `index` holds the claim"""
+        with self._lock:
+            if self.index is None and self.is_good(results):
+                self.index = index
+                self.cancel.set(interrupt=False)  # The others stop at their next checkpoint
+            return self.index == index
+
+    def gate(self, index: int) -> OnPage:
+        def page(results):
+            if not self.take(index, results):
+                return  # A losing candidate's page
+            with self._lock:
+                self.pages.extend(results)
+            if self.on_page:
+                self.on_page(results)
+        return page
+
+
+def race_urls(site: str, urls: List[str], fetch: Fetch, fanout: Optional[int] = None,
+              is_good: Callable[[Any], bool] = is_well_formed,
+              cancel: Optional[threading.Event] = None,
+              on_page: Optional[OnPage] = None) -> List[Listing]:
+    """
+    Try candidate URLs best-first, `fanout` at a time. Within a batch all
+    URLs load concurrently; the first well-formed result set wins and the
+    shared cancel event tells the others to stop at their next checkpoint.
+    Falls through to the next batch only if the whole batch comes back empty.
+    Setting the caller's `cancel` interrupts every candidate: drivers leased
+    with it are killed mid-load, and whatever a candidate already parsed is
+    returned as a partial result.
+
+    `fetch(url, cancel, page)` reports each parsed page through `page`. The
+    first candidate to report a well-formed page claims the race: only its
+    pages reach `on_page` and its result is the one returned, so pages from
+    losing URLs never leave the race.
+    """
+    fanout = max(1, SPECULATIVE_FANOUT if fanout is None else fanout)
+    parent = cancel
+
+    for offset in range(0, len(urls), fanout):
+        if parent is not None and parent.is_set():
+            logger.info(f"🛑 {site}: search cancelled")
+            return []
+        batch = urls[offset:offset + fanout]
+        cancel = LinkedEvent(parent)
+        claim = _Claim(cancel, is_good, on_page, len(batch))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(batch))
+        try:
+            futures = {executor.submit(fetch, url, cancel, claim.gate(offset + i)): offset + i
+                       for i, url in enumerate(batch)}
+            for future in futures:
+                # Not in the finally: losers still running must keep hearing the caller's interrupt
+                future.add_done_callback(claim.finished)
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ {site}: candidate #{index} failed: {e}")
+                    results = None
+                if claim.take(index, results):
+                    if not is_good(results):
+                        results = list(claim.pages)  # Failed after streaming: what the caller has seen
+                    win_stats.record(site, index)
+                    logger.info(f"🏁 {site}: candidate #{index} won with {len(results)} results")
+                    return results
+        finally:
+            cancel.set(interrupt=False)
+            # Don't wait for losers; they notice `cancel` and release their drivers intact
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    win_stats.record(site, None)
+    return []
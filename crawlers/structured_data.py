@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional
+
+from .listing import Listing
+
+logger = logging.getLogger(__name__)
+
+SOURCES = {
+    "property_finder": {"source": "Property Finder", "base": "https://www.propertyfinder.ae"},
+    "find_properties": {"source": "Find Properties", "base": "https://findproperties.ae"},
+    "bayut": {"source": "Bayut", "base": "https://www.bayut.com"},
+}
+
+# Try a plain HTTP GET before leasing Chrome; pages that ship their listings
+# as JSON never need a browser
+HTTP_FIRST = os.getenv("HTTP_FIRST", "1") not in ("0", "false", "no")
+
+_NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+_JSON_LD_RE = re.compile(r'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+_STATE_RE = re.compile(r'window\.(?:__INITIAL_STATE__|__PRELOADED_STATE__|__NUXT__|state)\s*=\s*')
+
+# Keys that identify a listing-shaped dict in arbitrary site JSON
+_TITLE_KEYS = ("title", "name", "headline")
+_PRICE_KEYS = ("price", "offers", "priceValue", "amount")
+_LISTING_TYPES = {"Apartment", "House", "SingleFamilyResidence", "Residence", "Accommodation",
+                  "RealEstateListing", "Product", "Offer", "Place"}
+
+
+def find_next_data(html: str) -> Optional[Any]:
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def find_json_ld(html: str) -> List[Any]:
+    blobs = []
+    for match in _JSON_LD_RE.finditer(html):
+        try:
+            blobs.append(json.loads(match.group(1)))
+        except ValueError:
+            continue
+    return blobs
+
+
+def find_inline_state(html: str) -> List[Any]:
+    """Decode `window.<state> = {...}` assignments without a JS engine"""
+    decoder = json.JSONDecoder()
+    blobs = []
+    for match in _STATE_RE.finditer(html):
+        try:
+            blob, _ = decoder.raw_decode(html, match.end())
+            blobs.append(blob)
+        except ValueError:
+            continue
+    return blobs
+
+
+def _looks_like_listing(item: Any) -> bool:
+    if not isinstance(item, dict):
+        return False
+    if item.get("@type") in _LISTING_TYPES:
+        return True
+    return any(k in item for k in _TITLE_KEYS) and any(k in item for k in _PRICE_KEYS)
+
+
+def iter_listing_arrays(blob: Any, depth: int = 0) -> Iterator[List[dict]]:
+    """Yield every list in `blob` whose items are mostly listing-shaped dicts"""
+    if depth > 12:
+        return
+    if isinstance(blob, list):
+        dicts = [x for x in blob if isinstance(x, dict)]
+        # Listings are often wrapped: [{"property": {...}}] or ItemList elements
+        unwrapped = [x.get("property") or x.get("item") or x for x in dicts]
+        if unwrapped and sum(map(_looks_like_listing, unwrapped)) >= max(1, len(unwrapped) // 2):
+            yield unwrapped
+            return
+        for x in blob:
+            yield from iter_listing_arrays(x, depth + 1)
+    elif isinstance(blob, dict):
+        for value in blob.values():
+            if isinstance(value, (dict, list)):
+                yield from iter_listing_arrays(value, depth + 1)
+
+
+@lru_cache(maxsize=None)
+def _keys(path: str):
+    return tuple(path.split("."))
+
+
+def _first(item: dict, *paths, default=None):
+    """First non-empty value among dotted `paths` in `item`; lists step into their first element"""
+    for path in paths:
+        value = item
+        for key in _keys(path):
+            if type(value) is list:
+                value = value[0] if value else None
+            if type(value) is not dict:
+                value = None
+                break
+            value = value.get(key)
+        if value or value == 0:
+            return value
+    return default
+
+
+def _price_text(item: dict) -> str:
+    value = _first(item, "price.value", "price.amount", "offers.price", "offers.priceSpecification.price",
+                   "price", "priceValue", "amount")
+    if isinstance(value, dict):
+        value = None
+    period = _first(item, "price.period", "rentFrequency", "offers.priceSpecification.unitText",
+                    "price_period", "period")
+    if value in (None, ""):
+        return "Price on request"
+    try:
+        text = f"AED {int(float(str(value).replace(',', ''))):,}"
+    except ValueError:
+        text = str(value)
+    if isinstance(period, str) and period:
+        text += f" per {period.lower().replace('ly', '') if period.lower() in ('yearly', 'monthly') else period.lower()}"
+    return text
+
+
+def _location_text(item: dict) -> str:
+    location = item.get("location")
+    if isinstance(location, list):
+        names = [l.get("name") for l in location if isinstance(l, dict) and l.get("name")]
+        if names:
+            # Bayut-style hierarchy: UAE > Dubai > Area > Building; most specific last
+            return ", ".join(reversed(names[-3:]))
+    return str(_first(item, "location.full_name", "location.name", "address.addressLocality",
+                      "address.streetAddress", "location", "community", "city", default="UAE"))
+
+
+def _link(item: dict, base: str, source_url: str) -> str:
+    link = _first(item, "share_url", "url", "details_path", "link", "href", "offers.url", default="")
+    if not link and item.get("externalID"):
+        link = f"/property/details-{item['externalID']}.html"
+    if not isinstance(link, str) or not link:
+        return source_url
+    return link if link.startswith("http") else base + (link if link.startswith("/") else "/" + link)
+
+
+def to_listing(item: dict, source_key: str, source_url: str) -> Listing:
+    """Map a site JSON listing onto a Listing (the JSON stays as its raw text)"""
+    config = SOURCES[source_key]
+    title = _first(item, "title", "name", "headline", default="Property Available")
+    beds = _first(item, "bedrooms", "rooms", "numberOfRooms.value", "numberOfRooms", "numberOfBedrooms")
+    baths = _first(item, "bathrooms", "baths", "numberOfBathroomsTotal")
+    area = _first(item, "size.value", "area", "floorSize.value", "size")
+    if isinstance(area, dict):
+        area = None
+    image = _first(item, "image", "images", "coverPhoto.url", "photo")
+    if isinstance(image, list):
+        image = image[0]
+
+    details = []
+    if beds not in (None, ""):
+        details.append(f"{beds} Bed")
+    if baths not in (None, ""):
+        details.append(f"{baths} Bath")
+    if area not in (None, ""):
+        details.append(f"{area} sqft")
+    description = _first(item, "description", default="")
+    if isinstance(description, str):
+        description = description[:120]
+    else:
+        description = ""
+
+    return Listing.parse(
+        title=str(title),
+        price=_price_text(item),
+        location=_location_text(item),
+        description=" | ".join(details) or description or str(title),
+        link=_link(item, config["base"], source_url),
+        source=config["source"],
+        bedrooms=beds,
+        bathrooms=baths,
+        area=area,
+        image=image,
+        raw=item,
+    )
+
+
+def extract_structured(html: str, source_key: str, source_url: str) -> List[Listing]:
+    """
+    Listings from the page's embedded JSON (Next.js __NEXT_DATA__, inline
+    window state, JSON-LD), tried in that order. Returns [] when the page
+    carries no recognisable listing data so callers can fall back to the DOM.
+    """
+    blobs = []
+    next_data = find_next_data(html)
+    if next_data is not None:
+        blobs.append(next_data)
+    blobs += find_inline_state(html)
+    blobs += find_json_ld(html)
+
+    for blob in blobs:
+        for items in iter_listing_arrays(blob):
+            listings = []
+            for item in items:
+                try:
+                    listings.append(to_listing(item, source_key, source_url))
+                except Exception as e:
+                    logger.debug(f"Skipping malformed {source_key} JSON listing: {e}")
+            if listings:
+                return listings
+    return []
+
+
+def fetch_structured(url: str, source_key: str, timeout: float = 10) -> List[Listing]:
+    """
+    Browser-free fetch: one HTTP GET plus embedded-JSON extraction. Returns
+    [] on any failure (blocked, no JSON, network) so callers can fall back
+    to a leased Chrome.
+    """
+    import requests
+    from .driver_pool import DEFAULT_USER_AGENT
+
+    try:
+        response = requests.get(url, timeout=timeout, headers={
+            "User-Agent": DEFAULT_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        if response.status_code != 200:
+            logger.info(f"🌐 {source_key}: HTTP {response.status_code} for {url}, falling back to browser")
+            return []
+        return extract_structured(response.text, source_key, url)
+    except Exception as e:
+        logger.info(f"🌐 {source_key}: HTTP fetch failed ({e}), falling back to browser")
+        return []
@@ -4,40 +4,23 @@ import os
 import re
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-import google.generativeai as genai
 
-load_dotenv()
+from crawlers.query_spec import extract_query_spec
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-gemini_model = genai.GenerativeModel("gemini-2.0-flash")
+load_dotenv()
 
 def extract_query_params(query):
-    """Use Gemini to extract search parameters"""
-    prompt = f"""
-    Extract: location (e.g., Dubai, Sharjah), property_type (apartment, villa, studio), bedrooms, max_price, purpose (rent/sale)
-    Query: "{query}"
-    Respond in JSON: {{ "location": "", "property_type": "", "bedrooms": null, "max_price": null, "purpose": "rent|sale" }}
-    """
-    try:
-        response = gemini_model.generate_content(prompt)
-        text = response.text.strip()
-        if "```json" in text: text = text.split("```json")[1].split("```")[0]
-        elif "```" in text: text = text.split("```")[1].split("```")[0]
-
-        import json
-        params = json.loads(text)
-
-        params["purpose"] = "to-rent" if params.get("purpose") == "rent" else "for-sale"
-        p_type = params.get("property_type", "").lower()
-        if "apartment" in p_type: params["property_type"] = "apartment"
-        elif "villa" in p_type: params["property_type"] = "villa"
-        else: params["property_type"] = "apartment"
-
-        print("🧠 Gemini Params:", params)
-        return params
-    except Exception as e:
-        print(f"❌ Gemini error: {e}")
-        return {}
+    """Search parameters via the shared schema-validated QuerySpec extraction"""
+    spec = extract_query_spec(query)
+    params = {
+        "location": spec.location,
+        "property_type": spec.property_type if spec.property_type in ("apartment", "villa") else "apartment",
+        "bedrooms": spec.bedrooms,
+        "max_price": spec.yearly_max_price,
+        "purpose": "to-rent" if spec.purpose == "rent" else "for-sale",
+    }
+    print("🧠 Query Params:", params)
+    return params
 
 def build_url(params):
     """Build Bayut.com search URL"""
@@ -9,6 +9,11 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import selenium_stealth 
 
+from crawlers.batch_extract import BATCH_EXTRACT, extract_cards
+from crawlers.driver_binary import chrome_service
+from crawlers.driver_pool import lease_driver
+from crawlers.lean import apply_lean_profile
+
 def setup_driver():
     """Setup Chrome driver with stealth and anti-detection"""
     options = Options()
@@ -24,7 +29,7 @@ def setup_driver():
     options.add_argument('--disable-features=VizDisplayCompositor')
     options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     options.add_argument('--headless')
-    driver = webdriver.Chrome(options=options)
+    driver = webdriver.Chrome(service=chrome_service(), options=options)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined});")
     driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});")
     driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});")
@@ -113,7 +118,11 @@ def extract_location(element):
 
 def extract_details(element):
     """Extract bed, bath, sqft"""
-    text = element.text.lower()
+    return details_from_text(element.text)
+
+
+def details_from_text(text):
+    text = text.lower()
     parts = []
     if m := re.search(r'(\d+)\s*bed', text): parts.append(f"{m.group(1)} bed")
     if m := re.search(r'(\d+)\s*bath', text): parts.append(f"{m.group(1)} bath")
@@ -133,9 +142,74 @@ def extract_url(element):
     return "N/A"
 
 
+LISTING_SELECTORS = [
+    'article[data-testid="listing-card"]',
+    'div[aria-label="Listing"]',
+    '.listingCard',
+    'div[data-qa="SEARCH_RESULT_ITEM"]',
+    'div[data-dec-qa="SearchResult"]',
+    'div[data-index]:not([data-index=""])',
+    'article.grid',
+    'article',
+    '.card, .property-item, .unit-card'
+]
+
+DETAILS_LINK = 'xpath:.//a[contains(@href, "/property/details")]'
+PRICE_RE = re.compile(r'AED\s*[\d,]+(?:\.\d{2})?', re.IGNORECASE)
+
+# extract_title / extract_full_price / extract_location / extract_url as one batched field spec
+BAYUT_CARD_FIELDS = {
+    "title": {"try": [[DETAILS_LINK, "title"], [DETAILS_LINK, None], ["xpath:.//h2 | .//h3 | .//h4", None]]},
+    "price": {"try": [[sel, None] for sel in ['.property-price', '[data-testid="price"]', '.amount', '.currency',
+                                              'div[aria-label*="price"]', 'span[aria-label*="price"]']]},
+    "location": {"try": [[sel, None] for sel in ['.location', '.address', '.title-line-2', '[aria-label*="Location"]',
+                                                 '.property-location',
+                                                 'xpath:.//span[contains(translate(text(), "LOCATION", "location"), "location")]']],
+                 "min_len": 2},
+    "url": {"try": [[DETAILS_LINK, "href"]]},
+}
+
+
+def extract_card(element):
+    """All fields of one card via per-element WebDriver calls; None for empty cards"""
+    if len(element.text.strip()) < 20:
+        return None
+    return {
+        'title': extract_title(element),
+        'price': extract_full_price(element),
+        'location': extract_location(element),
+        'details': extract_details(element),
+        'url': extract_url(element),
+    }
+
+
+def card_from_row(row):
+    """Same result as extract_card, from one row of a batched extract_cards call"""
+    text = row["_text"]
+    if len(text) < 20:
+        return None
+    price = next((m for m in (PRICE_RE.search(row["price"]), PRICE_RE.search(text)) if m), None)
+    url = row["url"]
+    return {
+        'title': row["title"] or "N/A",
+        'price': price.group(0).strip() if price else "N/A",
+        'location': row["location"] or "N/A",
+        'details': details_from_text(text),
+        'url': (url if url.startswith('http') else 'https://www.bayut.com' + url) if url else "N/A",
+    }
+
+
 def scrape_bayut_properties(url, max_properties=50):
     """Scrape top property listings from any Bayut URL"""
-    driver = setup_driver()
+    with lease_driver("bayut", setup_driver) as driver:
+        if not driver:
+            print(" Could not start Chrome.")
+            return []
+        apply_lean_profile(driver, "bayut")
+        return _scrape_with_driver(driver, url, max_properties)
+
+
+def _scrape_with_driver(driver, url, max_properties):
     properties = []
 
     try:
@@ -161,30 +235,27 @@ def scrape_bayut_properties(url, max_properties=50):
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             random_delay(2, 5)
 
-        listing_selectors = [
-            'article[data-testid="listing-card"]',
-            'div[aria-label="Listing"]',
-            '.listingCard',
-            'div[data-qa="SEARCH_RESULT_ITEM"]',
-            'div[data-dec-qa="SearchResult"]',
-            'div[data-index]:not([data-index=""])',
-            'article.grid',
-            'article',
-            '.card, .property-item, .unit-card'
-        ]
-
-        elements = []
-        for selector in listing_selectors:
-            try:
-                print(f" Trying selector: {selector}")
-                elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
-                if len(elements) >= 5:
-                    print(f" Found {len(elements)} listings with: {selector}")
-                    break
-            except TimeoutException:
-                continue
+        if BATCH_EXTRACT:
+            selector, rows = extract_cards(driver, LISTING_SELECTORS, BAYUT_CARD_FIELDS, min_cards=5)
+            if rows:
+                print(f" Found {len(rows)} listings with: {selector}")
+            cards = [card_from_row(row) for row in rows]
+            found = len(rows)
+        else:
+            elements = []
+            for selector in LISTING_SELECTORS:
+                try:
+                    print(f" Trying selector: {selector}")
+                    elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
+                    if len(elements) >= 5:
+                        print(f" Found {len(elements)} listings with: {selector}")
+                        break
+                except TimeoutException:
+                    continue
+            cards = (extract_card(elem) for elem in elements)
+            found = len(elements)
 
-        if not elements:
+        if not found:
             print(" No property listings found.")
             return properties
 
@@ -193,18 +264,15 @@ def scrape_bayut_properties(url, max_properties=50):
         print("=" * 60)
 
         processed = 0
-        for elem in elements:
+        for card in cards:
             if processed >= max_properties:
                 break
-            if len(elem.text.strip()) < 20:
-                continue
 
             try:
-                title = extract_title(elem)
-                price = extract_full_price(elem)
-                location = extract_location(elem)
-                details = extract_details(elem)
-                url_link = extract_url(elem)
+                if card is None:
+                    continue
+                title, price, location = card['title'], card['price'], card['location']
+                details, url_link = card['details'], card['url']
 
                 if price == "N/A" and title == "N/A":
                     continue
@@ -234,11 +302,6 @@ def scrape_bayut_properties(url, max_properties=50):
 
     except Exception as e:
         print(f" Critical error: {e}")
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
 
     return properties
 
@@ -1,10 +1,10 @@
 import streamlit as st
 import time
 from datetime import datetime
-import pandas as pd
 import json
 
 from backend import search_all_properties
+from crawlers.listing import listings_csv
 
 st.set_page_config(page_title="Property Seek", page_icon="🏠", layout="wide")
 
@@ -296,8 +296,7 @@ if 'current_query' in st.session_state:
                 st.markdown('</div>', unsafe_allow_html=True)
 
             if results:
-                df = pd.DataFrame(results)
-                csv_data = df.to_csv(index=False)
+                csv_data = listings_csv(results)
                 st.download_button(
                     "📋 Download Results as CSV",
                     csv_data,
@@ -387,8 +386,7 @@ if search_clicked and query:
 
             # Export option
             if results:
-                df = pd.DataFrame(results)
-                csv_data = df.to_csv(index=False)
+                csv_data = listings_csv(results)
                 st.download_button(
                     "📋 Download Results as CSV",
                     csv_data,
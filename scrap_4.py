@@ -1,18 +1,20 @@
 from re import search
 
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.action_chains import ActionChains
 import pandas as pd
 import json
 import time
 import random
 
+from crawlers.batch_extract import BATCH_EXTRACT, extract_cards
+from crawlers.driver_binary import chrome_service
+from crawlers.readiness import first_match, install_hooks, wait_for_listings
+
 
 # --- Configuration ---
 URL = "https://www.bayut.com/to-rent/property/dubai/"
@@ -73,15 +75,15 @@ def close_view_stories():
 
 # Initialize Chrome driver
 chrome_options = get_chrome_options()
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
+driver = webdriver.Chrome(service=chrome_service(), options=chrome_options)
+install_hooks(driver)
 
 driver.get(URL)
 close_view_stories()
 wait = WebDriverWait(driver, 10)
 
 # Page clearing and setup
-time.sleep(3)
+wait_for_listings(driver, "bayut", baseline=3)
 
 try:
     close_btn = WebDriverWait(driver, 10).until(
@@ -102,6 +104,8 @@ try:
 except:
     pass
 
+unfiltered = first_match(driver, "bayut")
+
 # Purpose filter
 try:
     if PURPOSE.lower() == "buy":
@@ -284,10 +288,39 @@ if min_price.strip() or max_price.strip():
 
 # Wait for page to load after filters
 print("⏳ Waiting for filtered results to load...")
-time.sleep(10)  # Increased wait time
+wait_for_listings(driver, "bayut", stale=unfiltered)
+
+# Same selector lists as scrape_property_data, read in one execute_script round-trip
+LISTING_FIELDS = {
+    "Name": {"try": [[sel, None] for sel in ['h2[aria-label*="Title"]', 'h2', 'h3', '[data-testid="property-title"]', '.title']]},
+    "Price": {"try": [[sel, None] for sel in ['span[aria-label*="Price"]', 'span[data-testid="property-price"]', '.price']]},
+    "Location": {"try": [[sel, None] for sel in ['div[data-testid="property-location"]', '.location', 'h3', '[aria-label*="location"]']]},
+    "Link": {"try": [["self", "href"], ["a", "href"]]},
+}
+
+def scrape_property_data_batched():
+    selectors = ['article[data-testid]', 'article', 'div[data-testid*="property"]', 'div[aria-label*="property"]',
+                 '.property-card', '[data-testid="property-card"]', 'a[href*="/property/"]']
+    selector, rows = extract_cards(driver, selectors, LISTING_FIELDS, limit=20)
+    if not rows:
+        print("❌ No property listings found with any selector")
+        return []
+    print(f"✅ Found {len(rows)} listings with selector: {selector}")
+    return [{
+        "PropertyNo": idx + 1,
+        "Name": row["Name"] or "N/A",
+        "Price": row["Price"] or "N/A",
+        "Location": row["Location"] or search_location,
+        "Link": row["Link"] or "N/A",
+        "Type": property_type,
+        "Beds": beds if beds else "N/A",
+        "Baths": baths if baths else "N/A",
+    } for idx, row in enumerate(rows)]
 
 # Enhanced scraping logic
 def scrape_property_data():
+    if BATCH_EXTRACT:
+        return scrape_property_data_batched()
     data = []
     
     # Try multiple approaches to find property listings
@@ -0,0 +1,17 @@
+import pytest
+
+from crawlers.html_parser import Node, available_backends, parse_html
+
+CARD = '<div class="card"><h2>2 Bed</h2><p class="price">AED 85,000</p><span>Marina</span><p>Call AED agent</p></div>'
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_contains_selectors_agree_across_backends(backend):
+    card = parse_html(CARD, backend).select_one("div.card")
+    assert [n.text() for n in card.select('*:contains("AED"), span')] == ["AED 85,000", "Marina", "Call AED agent"]
+    assert card.select_one('*:contains("AED")').attr("class") == "price"
+
+
+def test_node_is_abstract():
+    with pytest.raises(TypeError):
+        Node(None)
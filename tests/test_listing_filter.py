@@ -0,0 +1,78 @@
+from crawlers import listing as listing_module
+from crawlers.listing import Listing, normalize_listings
+from crawlers.listing_filter import ListingFilter, filter_listings
+from crawlers.query_parser import parse_query
+from crawlers.query_spec import QuerySpec
+
+
+def listings(*cards):
+    return normalize_listings([Listing.parse(title, price, location) for title, price, location in cards])
+
+
+def titles(kept):
+    return [listing.title for listing in kept]
+
+
+def test_monthly_rents_are_annualised_against_the_budget():
+    spec = QuerySpec(location="dubai marina", max_price=100_000)
+    kept = filter_listings(listings(("2 Bed Apartment", "AED 9,000 per month", "Dubai Marina"),
+                                    ("1 Bed Apartment", "AED 7,500 per month", "Dubai Marina"),
+                                    ("Studio", "AED 95,000 per year", "Dubai Marina"),
+                                    ("3 Bed Apartment", "AED 120,000", "Dubai Marina")), spec)
+    assert titles(kept) == ["1 Bed Apartment", "Studio"]
+
+
+def test_min_budget_uses_the_annual_amount():
+    spec = QuerySpec(min_price=80_000)
+    kept = filter_listings(listings(("Villa", "AED 8,000/month", "Dubai"), ("Flat", "AED 60,000/year", "Dubai")), spec)
+    assert titles(kept) == ["Villa"]
+
+
+def test_monthly_budget_is_compared_per_year():
+    spec, _ = parse_query("2 bed apartment in dubai marina under 8000 per month")
+    kept = filter_listings(listings(("2 Bed Apartment", "AED 7,000 per month", "Dubai Marina"),
+                                    ("2 Bed Flat", "AED 90,000 per year", "Dubai Marina"),
+                                    ("2 Bed Penthouse", "AED 9,000 per month", "Dubai Marina"),
+                                    ("2 Bed Loft", "AED 120,000 per year", "Dubai Marina")), spec)
+    assert titles(kept) == ["2 Bed Apartment", "2 Bed Flat"]
+
+
+def test_other_areas_are_dropped_unknown_ones_kept():
+    spec = QuerySpec(location="dubai marina")
+    kept = filter_listings(listings(("Marina Gate apartment", "AED 1", "Marina Gate, Dubai Marina, Dubai"),
+                                    ("JVC apartment", "AED 1", "JVC, Dubai"),
+                                    ("Apartment", "AED 1", "Dubai"),
+                                    ("Apartment", "AED 1", "")), spec)
+    assert titles(kept) == ["Marina Gate apartment", "Apartment", "Apartment"]
+
+
+def test_other_cities_are_dropped():
+    spec = QuerySpec(location="sharjah", city="sharjah")
+    kept = filter_listings(listings(("Al Nahda flat", "AED 1", "Sharjah"), ("Marina flat", "AED 1", "Dubai Marina")),
+                           spec)
+    assert titles(kept) == ["Al Nahda flat"]
+
+
+def test_unrecognised_area_filters_nothing():
+    spec = QuerySpec(location="somewhere new")
+    assert ListingFilter.from_spec(spec).community == ""
+    assert len(filter_listings(listings(("Flat", "AED 1", "Dubai Marina")), spec)) == 1
+
+
+def test_missing_details_never_count_against_a_listing():
+    spec = QuerySpec(bedrooms=2, bathrooms=2, max_price=100_000, property_type="villa")
+    kept = filter_listings(listings(("Spacious home", "Price on request", "Dubai")), spec)
+    assert titles(kept) == ["Spacious home"]
+
+
+def test_normalised_batches_are_filtered_without_reading_text_again(monkeypatch):
+    batch = listings(("2 Bed Villa", "AED 200,000", "Arabian Ranches, Dubai"),
+                     ("2 Bed Apartment", "AED 90,000", "Dubai Marina"))
+
+    def unread(*text):
+        raise AssertionError(f"read {text} again")
+
+    monkeypatch.setattr(listing_module, "read_place", unread)
+    monkeypatch.setattr(listing_module, "read_type", unread)
+    spec = QuerySpec(location="dubai marina", city="dubai", property_type="apartment", bedrooms=2, max_price=100_000)
+    assert titles(filter_listings(batch, spec)) == ["2 Bed Apartment"]
@@ -0,0 +1,83 @@
+from crawlers.listing import Listing, normalize_listings
+from crawlers.listing_filter import filter_listings
+from crawlers.listing_store import ListingStore, normalize_listing
+from crawlers.query_parser import parse_query
+from crawlers.query_spec import QuerySpec
+
+MARINA_RENT = QuerySpec(purpose="rent", location="dubai marina", city="dubai", property_type="apartment",
+                        bedrooms=2)
+
+
+def card(title, price="AED 120,000/year", location="Dubai Marina, Dubai", link=None, **extra):
+    link = link or "https://www.propertyfinder.ae/en/plp/rent/" + title.lower().replace(" ", "-")
+    listing = Listing.parse(title=title, price=price, location=location, link=link, source="Property Finder", **extra)
+    return normalize_listings([listing])[0]
+
+
+def marina_cards(count):
+    return [card(f"2 Bed Apartment in Marina Gate #{i}", price=f"AED {100_000 + i * 1_000:,}/year")
+            for i in range(count)]
+
+
+def test_upsert_then_search_by_spec():
+    store = ListingStore(None)
+    assert store.upsert(marina_cards(3) + [card("Villa in Arabian Ranches", location="Arabian Ranches")],
+                        MARINA_RENT) == 4
+    found = store.search(MARINA_RENT)
+    assert len(found) == 3 and all("Marina Gate" in listing.title for listing in found)
+    assert store.search(QuerySpec(purpose="rent", location="dubai marina", city="dubai",
+                                  bedrooms=2, max_price=101_000))[0].price_aed == 101_000
+
+
+def test_upserting_again_refreshes_instead_of_duplicating():
+    store = ListingStore(None)
+    store.upsert(marina_cards(2), MARINA_RENT, now=1_000)
+    store.upsert(marina_cards(2), MARINA_RENT)
+    assert store.count() == 2
+
+
+def test_answer_needs_enough_fresh_matches():
+    store = ListingStore(None)
+    store.upsert(marina_cards(3), MARINA_RENT)
+    assert store.answer(MARINA_RENT, min_results=5) is None
+    answered = store.answer(MARINA_RENT, min_results=3)
+    assert list(answered) == ["Property Finder"] and len(answered["Property Finder"]) == 3
+
+
+def test_rows_only_record_what_the_card_says():
+    # A fallback page: a card that names no area, and a sale listing on a rent search
+    vague = normalize_listing(card("Spacious unit", location="UAE", link="#"), MARINA_RENT, now=0)
+    assert (vague["community"], vague["property_type"]) == ("", "")
+    sale = normalize_listing(card("Villa", price="AED 3,500,000", location="Arabian Ranches",
+                                  link="https://www.propertyfinder.ae/en/plp/buy/villa-1.html"), MARINA_RENT, now=0)
+    assert (sale["purpose"], sale["period"], sale["community"], sale["property_type"]) == \
+        ("sale", None, "arabian ranches", "villa")
+
+
+def test_store_keeps_what_the_crawl_filter_keeps():
+    cards = [card(title, description="Sea view, balcony") for title in
+             ("2 Bed Apartment in Marina Gate", "2 Bed Penthouse in Marina Gate", "2 Bed Unit in Marina Gate",
+              "Apartment in Marina Gate", "2 Bed Villa in Marina Gate", "3 Bed Apartment in Marina Gate")]
+    cards.append(card("2 Bed Apartment on request", price="Price on request", description="Sea view"))
+    spec = QuerySpec(purpose="rent", location="dubai marina", city="dubai", property_type="apartment",
+                     bedrooms=2, bathrooms=1, max_price=150_000)
+    expected = {listing.title for listing in filter_listings(cards, spec)}
+    assert expected == {"2 Bed Apartment in Marina Gate", "2 Bed Penthouse in Marina Gate",
+                        "2 Bed Unit in Marina Gate", "Apartment in Marina Gate", "2 Bed Apartment on request"}
+
+    store = ListingStore(None)
+    store.upsert(cards, spec)
+    assert {listing.title for listing in store.search(spec)} == expected
+    assert {listing.title for listing in store.text_search("sea view", spec)} == expected
+
+
+def test_monthly_budget_searches_per_year():
+    spec, _ = parse_query("2 bed apartment in dubai marina under 8000 per month")
+    cards = [card("2 Bed Apartment in Marina Gate", price="AED 7,000/month"),
+             card("2 Bed Apartment in Marina Pinnacle", price="AED 90,000/year"),
+             card("2 Bed Apartment in Marina Crown", price="AED 9,000/month")]
+    store = ListingStore(None)
+    store.upsert(cards, spec)
+    assert {listing.title for listing in store.search(spec)} == \
+        {listing.title for listing in filter_listings(cards, spec)} == \
+        {"2 Bed Apartment in Marina Gate", "2 Bed Apartment in Marina Pinnacle"}
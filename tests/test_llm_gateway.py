@@ -0,0 +1,45 @@
+import time
+
+from crawlers.llm_gateway import CircuitBreaker, LLMGateway
+
+
+def opened_breaker(cooldown=0.05):
+    breaker = CircuitBreaker(threshold=1, cooldown=cooldown)
+    breaker.record(False)
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(cooldown)
+    return breaker
+
+
+def test_half_open_trial_success_closes_the_breaker():
+    breaker = opened_breaker()
+    assert breaker.allow()
+    assert not breaker.allow(), "only one trial at a time"
+    breaker.record(True)
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_half_open_trial_failure_reopens_the_breaker():
+    breaker = opened_breaker()
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open" and not breaker.allow()
+    assert breaker.opened == 2
+
+
+def test_trial_that_never_reaches_the_endpoint_is_given_back():
+    calls = []
+
+    def transport(prompt, timeout, schema=None):
+        calls.append(prompt)
+        return "ok"
+
+    gateway = LLMGateway(transport, max_concurrency=1, retries=0, breaker=opened_breaker())
+    gateway._slots.acquire()  # Another call holds the only slot
+    assert gateway.generate("probe", deadline=0.1, fallback=lambda: "fallback") == "fallback"
+    gateway._slots.release()
+    assert gateway.generate("probe", deadline=0, fallback=lambda: "fallback") == "fallback"
+    assert calls == [] and gateway.breaker.state == "half_open"
+
+    assert gateway.generate("probe") == "ok"
+    assert gateway.breaker.state == "closed"
@@ -0,0 +1,75 @@
+import json
+import os
+import random
+import re
+
+import pytest
+
+from crawlers import listing as listing_module
+from crawlers.listing import Listing, normalize_listings
+from crawlers.prices import normalize_price, price_per_sqft
+
+pytest.importorskip("pandas")
+from crawlers.prices import normalize_prices  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "price_corpus.jsonl")
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def scalar(prices, areas):
+    rows = []
+    for price, area in zip(prices, areas):
+        aed, period, confident = normalize_price(price)
+        rows.append((aed, period, confident, price_per_sqft(aed, period, area)))
+    return rows
+
+
+def vectorised(prices, areas):
+    frame = normalize_prices(prices, areas)
+    return [(None if aed is None else int(aed), period, confident, None if per_sqft != per_sqft else per_sqft)
+            for aed, period, confident, per_sqft in zip(frame["price_aed"].to_numpy(dtype=object, na_value=None),
+                                                        frame["period"], frame["confident"].tolist(),
+                                                        frame["price_per_sqft"].tolist())]
+
+
+def test_scalar_reads_the_labelled_corpus():
+    for row in load_corpus():
+        aed, period, confident, per_sqft = scalar([row["price"]], [row.get("area_sqft")])[0]
+        got = {"price_aed": aed, "period": period, "confident": confident, "price_per_sqft": per_sqft}
+        assert {k: got[k] for k in row["expected"]} == row["expected"], row["price"]
+
+
+def test_vectorised_agrees_with_scalar_on_the_corpus():
+    corpus = load_corpus()
+    prices, areas = [row["price"] for row in corpus], [row.get("area_sqft") for row in corpus]
+    assert vectorised(prices, areas) == scalar(prices, areas)
+
+
+def test_vectorised_agrees_with_scalar_on_varied_amounts():
+    rng = random.Random(7)
+    corpus = load_corpus()
+    prices = [re.sub(r"\d", lambda _: str(rng.randrange(10)), rng.choice(corpus)["price"]) for _ in range(500)]
+    prices += ["", None, "Price on request", "Call 050 123 4567"]
+    areas = [rng.choice([None, 0, 850, 1_200.5]) for _ in prices]
+    assert vectorised(prices, areas) == scalar(prices, areas)
+
+
+def test_batched_listings_match_one_at_a_time(monkeypatch):
+    prices = [row["price"] for row in load_corpus()]
+    one_by_one = normalize_listings([Listing(p, p, "Dubai") for p in prices])
+    monkeypatch.setattr(listing_module, "PRICE_BATCH_MIN", 1)
+    batched = normalize_listings([Listing(p, p, "Dubai") for p in prices])
+    assert [(x.price_aed, x.period, x.price_confident) for x in batched] == \
+        [(x.price_aed, x.period, x.price_confident) for x in one_by_one]
+
+
+def test_missing_periods_are_none_not_nan(monkeypatch):
+    frame = normalize_prices(["AED 1,950,000", "Price on request", "AED 7,000 per month"])
+    assert frame["period"].tolist() == [None, None, "monthly"]
+    monkeypatch.setattr(listing_module, "PRICE_BATCH_MIN", 1)
+    sale = normalize_listings([Listing("Villa", "AED 1,950,000", "Dubai"), Listing("Flat", "AED 7,000/month", "Dubai")])
+    assert [listing.period for listing in sale] == [None, "monthly"]
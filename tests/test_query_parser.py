@@ -0,0 +1,74 @@
+import pytest
+
+from crawlers.query_parser import parse_query
+from crawlers.query_spec import RULE_CONFIDENCE_THRESHOLD
+
+
+def test_bare_budget_with_unit_is_max_price():
+    spec, confidence = parse_query("3br villa for sale in arabian ranches 3m")
+    assert (spec.purpose, spec.bedrooms, spec.max_price) == ("sale", 3, 3_000_000)
+    assert confidence >= RULE_CONFIDENCE_THRESHOLD
+
+
+def test_sale_sized_budget_without_purpose_word_means_sale():
+    spec, _ = parse_query("villa 5 bedrooms palm jumeirah 10 million")
+    assert (spec.purpose, spec.location, spec.max_price) == ("sale", "palm jumeirah", 10_000_000)
+
+
+def test_rent_word_beats_sale_sized_budget():
+    spec, _ = parse_query("villa for rent in palm jumeirah 1.2m")
+    assert (spec.purpose, spec.max_price) == ("rent", 1_200_000)
+
+
+def test_aed_marked_amount_is_a_budget():
+    spec, _ = parse_query("studio in jvc aed 45000")
+    assert (spec.bedrooms, spec.max_price) == (0, 45_000)
+
+
+def test_keyword_budgets_and_ranges():
+    assert parse_query("2 bed apartment jlt under 150k")[0].max_price == 150_000
+    spec, _ = parse_query("2 bed 2 bath apartment between 80k and 150k")
+    assert (spec.bedrooms, spec.bathrooms, spec.min_price, spec.max_price) == (2, 2, 80_000, 150_000)
+
+
+def test_unused_number_goes_to_the_llm():
+    spec, confidence = parse_query("1 bed in jlt 85000")
+    assert spec.max_price is None
+    assert confidence < RULE_CONFIDENCE_THRESHOLD
+
+
+def test_bed_counts_are_not_prices():
+    spec, confidence = parse_query("2 bedroom apartment in dubai marina")
+    assert (spec.bedrooms, spec.min_price, spec.max_price) == (2, None, None)
+    assert confidence >= RULE_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("query, location, budget", [
+    ("2 bed apartment in dubai marina under 8000 per month", "dubai marina", 8_000),
+    ("studio in jvc max 5k monthly", "jumeirah village circle", 5_000),
+    ("apartment for rent in jlt budget 6000 a month", "jumeirah lake towers", 6_000),
+])
+def test_per_month_budgets_are_marked_monthly(query, location, budget):
+    spec, confidence = parse_query(query)
+    assert (spec.purpose, spec.location, spec.max_price, spec.budget_period) == ("rent", location, budget, "monthly")
+    assert spec.yearly_max_price == budget * 12
+    assert confidence >= RULE_CONFIDENCE_THRESHOLD
+
+
+def test_bare_and_yearly_budgets_are_not_monthly():
+    assert parse_query("2 bed apartment jlt under 150k")[0].budget_period is None
+    assert parse_query("2 bed apartment jlt under 90k/yr")[0].budget_period == "yearly"
+
+
+def test_prime_skips_queries_the_rules_answer(monkeypatch):
+    from crawlers import query_spec
+
+    primed = []
+
+    class Cache:
+        def prime(self, queries, compute):
+            primed.extend(queries)
+
+    monkeypatch.setattr(query_spec, "get_query_cache", Cache)
+    query_spec.prime_query_cache(["apartments for rent in dubai", "office spaces for rent"])
+    assert primed == ["office spaces for rent"]
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from crawlers.query_spec import QuerySpec, SpecError, parse_spec_json
+
+VALID = {"purpose": "rent", "location": "dubai marina", "city": "dubai", "property_type": "apartment",
+         "bedrooms": 2, "bathrooms": None, "min_price": None, "max_price": 150000,
+         "budget_period": None}
+
+
+def answer(**changes):
+    return json.dumps({**VALID, **changes})
+
+
+def rejection(text):
+    with pytest.raises(SpecError) as raised:
+        parse_spec_json(text)
+    return raised.value
+
+
+def test_valid_answer_parses():
+    spec = parse_spec_json(answer(location="Dubai-Marina", bedrooms=2.0))
+    assert spec == QuerySpec(purpose="rent", location="dubai marina", city="dubai", property_type="apartment",
+                             bedrooms=2, max_price=150000)
+
+
+def test_fenced_answer_parses():
+    assert parse_spec_json(f"```json\n{answer()}\n```").max_price == 150000
+
+
+def test_not_json():
+    assert rejection("purpose: rent").kind == "invalid_json"
+
+
+def test_not_an_object():
+    error = rejection("[1, 2]")
+    assert error.kind == "schema_error" and "JSON object" in str(error)
+
+
+def test_missing_and_unexpected_fields():
+    data = {**VALID, "furnished": True}
+    del data["city"]
+    message = str(rejection(json.dumps(data)))
+    assert "missing 'city'" in message and "unexpected field 'furnished'" in message
+
+
+@pytest.mark.parametrize("changes, problem", [
+    ({"bedrooms": -1}, "'bedrooms' must be a non-negative integer"),
+    ({"bedrooms": True}, "'bedrooms' must be a non-negative integer"),
+    ({"max_price": "150k"}, "'max_price' must be a non-negative integer"),
+    ({"purpose": "lease"}, "'purpose' must be one of"),
+    ({"city": "london"}, "'city' must be one of"),
+    ({"location": " "}, "'location' must be a non-empty string"),
+    ({"purpose": None}, "'purpose' must be a non-empty string"),
+    ({"min_price": 200000}, "min_price 200000 is above max_price 150000"),
+    ({"budget_period": "weekly"}, "'budget_period' must be one of"),
+])
+def test_schema_violations(changes, problem):
+    error = rejection(answer(**changes))
+    assert error.kind == "schema_error" and problem in str(error)
+
+
+def test_monthly_budget_period_is_kept():
+    spec = parse_spec_json(answer(max_price=8000, budget_period="Monthly"))
+    assert (spec.budget_period, spec.max_price, spec.yearly_max_price) == ("monthly", 8000, 96000)
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from crawlers import readiness
+
+
+class FakeDriver:
+    """Answers the readiness probe from a function of the seconds since the wait started"""
+
+    def __init__(self, probe):
+        self.probe = probe
+        self.start = time.monotonic()
+
+    def execute_script(self, script, *args):
+        return self.probe(time.monotonic() - self.start)
+
+
+def loaded(count=0, **extra):
+    return {"count": count, "readyState": "complete", "inflight": 0, "quietMs": 5_000, "staleGone": True,
+            "noResults": False, **extra}
+
+
+def test_cards_make_the_page_ready():
+    result = readiness.wait_until_ready(FakeDriver(lambda t: loaded(count=3)), "article", max_wait=5)
+    assert result["ready"] and not result["empty"]
+    assert result["elapsed"] < 1
+
+
+def test_no_results_message_ends_the_wait():
+    driver = FakeDriver(lambda t: {**loaded(), "quietMs": 0, "inflight": 1, "noResults": True})
+    result = readiness.wait_until_ready(driver, "article", max_wait=5, empty_selector=".no-results")
+    assert result["empty"] and not result["ready"]
+    assert result["elapsed"] < 1
+
+
+def test_idle_page_without_cards_ends_the_wait():
+    result = readiness.wait_until_ready(FakeDriver(lambda t: loaded()), "article", max_wait=5)
+    assert result["empty"]
+    assert result["elapsed"] < 1
+
+
+def test_busy_page_without_cards_waits_for_them():
+    driver = FakeDriver(lambda t: loaded(count=2) if t > 0.3 else {**loaded(), "inflight": 1})
+    result = readiness.wait_until_ready(driver, "article", max_wait=5)
+    assert result["ready"]
+
+
+def test_cancel_ends_the_wait():
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    result = readiness.wait_until_ready(FakeDriver(lambda t: {**loaded(), "inflight": 1}), "article",
+                                        max_wait=5, cancel=cancel)
+    assert result["aborted"] and not result["ready"]
+    assert result["elapsed"] < 1
+
+
+def test_dead_driver_ends_the_wait():
+    class InvalidSessionIdException(Exception):
+        pass
+
+    def probe(t):
+        raise InvalidSessionIdException("invalid session id")
+
+    result = readiness.wait_until_ready(FakeDriver(probe), "article", max_wait=5)
+    assert result["aborted"] and result["elapsed"] < 1
+
+
+def test_navigation_errors_are_retried():
+    def probe(t):
+        if t < 0.2:
+            raise RuntimeError("javascript error: document unloaded")
+        return loaded(count=3)
+
+    assert readiness.wait_until_ready(FakeDriver(probe), "article", max_wait=5)["ready"]
+
+
+def test_aborted_waits_are_not_recorded(monkeypatch):
+    monkeypatch.setattr(readiness, "timings", readiness.ReadinessTimings())
+    cancel = threading.Event()
+    cancel.set()
+    assert not readiness.wait_for_listings(FakeDriver(lambda t: loaded(count=3)), "bayut", cancel=cancel)
+    assert readiness.timings.summary() == {}
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import pytest
+
+from crawlers import result_cache
+from crawlers.listing import Listing
+from crawlers.result_cache import ResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "time", clock.time)
+    return clock
+
+
+def results(title):
+    return {"Bayut": [Listing(title, "AED 90,000", "Dubai Marina")]}
+
+
+def refresh_to(title):
+    done = threading.Event()
+
+    def compute():
+        try:
+            return results(title)
+        finally:
+            done.set()
+
+    return compute, done
+
+
+def test_miss_computes_and_stores(clock):
+    cache = ResultCache(fresh_ttl=10, stale_ttl=100)
+    got, state = cache.get_or_refresh("k", lambda: results("new"))
+    assert state == "miss" and got["Bayut"][0].title == "new"
+    assert cache.lookup("k")[1] == "fresh"
+
+
+def test_stale_hit_serves_cached_results_and_refreshes_in_the_background(clock):
+    cache = ResultCache(fresh_ttl=10, stale_ttl=100)
+    cache.store("k", results("old"))
+    clock.now += 20
+    compute, done = refresh_to("new")
+    got, state = cache.get_or_refresh("k", compute)
+    assert state == "stale" and got["Bayut"][0].title == "old"
+    assert done.wait(1)
+    for _ in range(100):
+        if not cache.snapshot()["refreshing"]:
+            break
+        time.sleep(0.01)
+    got, state = cache.lookup("k")
+    assert state == "fresh" and got["Bayut"][0].title == "new"
+    assert cache.snapshot()["revalidations"] == 1
+
+
+def test_entries_past_stale_ttl_are_misses(clock):
+    cache = ResultCache(fresh_ttl=10, stale_ttl=100)
+    cache.store("k", results("old"))
+    clock.now += 100
+    assert cache.lookup("k") == (None, "miss")
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_empty_crawls_are_not_stored(clock):
+    cache = ResultCache(fresh_ttl=10, stale_ttl=100)
+    cache.get_or_refresh("k", lambda: {"Bayut": []})
+    assert cache.lookup("k") == (None, "miss")
+
+
+def test_invalidated_source_makes_the_entry_stale(clock):
+    cache = ResultCache(fresh_ttl=10, stale_ttl=100)
+    cache.store("k", {**results("old"), "Dubizzle": [Listing("d", "AED 1", "Dubai")]})
+    assert cache.invalidate(source="Dubizzle") == 1
+    got, state = cache.lookup("k")
+    assert state == "stale" and set(got) == {"Bayut"}
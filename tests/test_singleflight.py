@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from crawlers.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights, runs = SingleFlight("test"), []
+    gate = threading.Event()
+
+    def work(cancel, emit):
+        runs.append(1)
+        gate.wait(2)
+        return "done"
+
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(flights.do("k", work, timeout=5))) for _ in range(5)]
+    for t in callers:
+        t.start()
+    time.sleep(0.1)
+    gate.set()
+    for t in callers:
+        t.join()
+    assert results == ["done"] * 5 and len(runs) == 1
+    assert flights.snapshot()["coalesced"] == 4 and flights.in_flight() == 0
+
+
+def test_errors_reach_every_caller():
+    def fail(cancel, emit):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        SingleFlight("test").do("k", fail)
+
+
+def test_last_waiter_leaving_cancels_the_work():
+    flights, cancelled = SingleFlight("test"), threading.Event()
+
+    def work(cancel, emit):
+        cancel.wait(2)
+        cancelled.set()
+
+    with pytest.raises(TimeoutError):
+        flights.do("k", work, timeout=0.05)
+    assert cancelled.wait(1)
+    assert flights.snapshot()["cancelled"] == 1
+
+
+def test_subscribers_get_every_item_including_those_before_they_joined():
+    flights = SingleFlight("test")
+    second_page = threading.Event()
+
+    def work(cancel, emit):
+        emit("page 1")
+        second_page.wait(2)
+        emit("page 2")
+        return "all"
+
+    def drain(subscription):
+        items = []
+        while True:
+            new, finished = subscription.poll(1)
+            items += new
+            if finished:
+                return items, subscription.result()
+
+    first = flights.subscribe("k", work)
+    assert first.poll(1) == (["page 1"], False)
+    late = flights.subscribe("k", work)
+    second_page.set()
+    assert drain(late) == (["page 1", "page 2"], "all")
+    assert drain(first) == (["page 2"], "all")
+    first.close()
+    late.close()
+    assert flights.snapshot()["executions"] == 1
+
+
+def test_blocking_caller_joins_a_streamed_flight():
+    flights, release = SingleFlight("test"), threading.Event()
+
+    def work(cancel, emit):
+        emit("page")
+        release.wait(2)
+        return "all"
+
+    subscription = flights.subscribe("k", work)
+    threading.Timer(0.1, release.set).start()
+    assert flights.do("k", work, timeout=5) == "all"
+    subscription.close()
+    assert flights.snapshot()["executions"] == 1
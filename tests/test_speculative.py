@@ -0,0 +1,100 @@
+import time
+
+from crawlers.listing import Listing
+from crawlers.speculative import LinkedEvent, race_urls
+
+
+def listings(url, count=2):
+    return [Listing(f"{url} #{i}", "AED 1,000", "Dubai", link=f"{url}/{i}") for i in range(count)]
+
+
+def test_only_the_winning_candidates_pages_are_streamed():
+    def fetch(url, cancel, page):
+        if url == "slow":
+            time.sleep(0.2)
+        results = listings(url)
+        page(results)
+        if url == "fast":
+            time.sleep(0.1)  # Still loading its next page when the slow one reports
+            more = listings(url + "-2")
+            page(more)
+            results += more
+        return results
+
+    streamed = []
+    results = race_urls("test", ["slow", "fast"], fetch, fanout=2, on_page=streamed.extend)
+    assert {listing.title for listing in results} == {listing.title for listing in streamed}
+    assert all(listing.title.startswith("fast") for listing in streamed)
+    assert len(streamed) == 4
+
+
+def test_losers_are_told_to_stop():
+    stopped = []
+
+    def fetch(url, cancel, page):
+        if url == "loser":
+            for _ in range(50):
+                if cancel.is_set():
+                    stopped.append(url)
+                    return listings(url)
+                time.sleep(0.01)
+            return []
+        time.sleep(0.05)
+        page(listings(url))
+        return listings(url)
+
+    assert race_urls("test", ["winner", "loser"], fetch, fanout=2)[0].title.startswith("winner")
+    time.sleep(0.1)
+    assert stopped == ["loser"]
+
+
+def test_claimer_failing_after_streaming_returns_what_was_streamed():
+    def fetch(url, cancel, page):
+        page(listings(url))
+        raise RuntimeError("driver died")
+
+    streamed = []
+    results = race_urls("test", ["only"], fetch, on_page=streamed.extend)
+    assert results == streamed and len(results) == 2
+
+
+def test_falls_through_to_the_next_batch():
+    def fetch(url, cancel, page):
+        results = listings(url) if url == "third" else []
+        page(results)
+        return results
+
+    assert race_urls("test", ["first", "second", "third"], fetch, fanout=2)[0].title.startswith("third")
+
+
+def test_finished_batches_unhook_from_the_callers_cancel():
+    search = LinkedEvent()
+
+    def fetch(url, cancel, page):
+        if url == "slow":
+            time.sleep(0.1)
+        results = listings(url) if url != "empty" else []
+        page(results)
+        return results
+
+    for _ in range(5):
+        race_urls("test", ["empty", "fast", "slow"], fetch, fanout=2, cancel=search)
+    time.sleep(0.3)
+    assert search._callbacks == []
+
+
+def test_losers_still_running_hear_the_callers_interrupt():
+    search, killed = LinkedEvent(), []
+
+    def fetch(url, cancel, page):
+        if url == "loser":
+            cancel.on_set(lambda: killed.append(url))  # What a leased driver registers
+            time.sleep(0.3)
+            return []
+        time.sleep(0.05)
+        page(listings(url))
+        return listings(url)
+
+    race_urls("test", ["winner", "loser"], fetch, fanout=2, cancel=search)
+    search.set()
+    assert killed == ["loser"]